@@ -5,28 +5,93 @@ import os
 from flask import Flask
 from markupsafe import Markup
 from .config import Config
-from .extensions import db, login_manager, limiter, csrf, migrate
-from .blueprints.public import public_bp
-from .blueprints.auth import auth_bp
-from .blueprints.admin import admin_bp
-from .blueprints.errors import errors_bp
-from .cli import register_cli
+from .extensions import db, login_manager, limiter, csrf
+from .utils.db_routing import init_replica
+from .utils.health import HealthProber
+from .utils.perf_log import init_perf_log
+from .utils.profiler import init_profiler
+from .utils.query_counter import init_query_counter
+from .utils.sqlite_mode import configure_sqlite
+from .utils.stripe_events import StripeEventProcessor
+from .utils.template_timing import init_template_timing
+
+
+def bootstrap_admin(app: Flask) -> None:
+    """Create (or promote) the admin from ADMIN_EMAIL + ADMIN_PASSWORD if set.
+
+    Runs once from create_app() and from `flask bootstrap-admin`. Failures
+    (e.g. tables not migrated yet) are logged, never raised.
+    """
+    admin_email = app.config.get("ADMIN_EMAIL", "").strip().lower()
+    admin_password = app.config.get("ADMIN_PASSWORD", "").strip()
+    if not admin_email or not admin_password:
+        return
+
+    from .models import User
+    from .utils.user_cache import invalidate_user
+
+    try:
+        existing = User.query.filter_by(email=admin_email).first()
+        if existing:
+            if not existing.is_admin:
+                existing.is_admin = True
+                existing.email_confirmed = True
+                db.session.commit()
+                invalidate_user(existing.id)
+                app.logger.info(f"Promoted {admin_email} to admin via env vars.")
+            return
+        user = User(
+            name="Admin",
+            email=admin_email,
+            username=admin_email.split("@")[0],
+            email_confirmed=True,
+        )
+        user.set_password(admin_password)
+        user.is_admin = True
+        db.session.add(user)
+        db.session.commit()
+        app.logger.info(f"Auto-created admin user: {admin_email}")
+    except Exception as e:
+        db.session.rollback()
+        app.logger.warning(f"Admin bootstrap skipped: {e}")
+
 
 def create_app() -> Flask:
+    # Blueprints (and the models they pull in) load here rather than at
+    # package import, so `import app` stays cheap for scripts and tools.
+    from .blueprints.public import public_bp
+    from .blueprints.auth import auth_bp
+    from .blueprints.admin import admin_bp
+    from .blueprints.errors import errors_bp
+    from .cli import register_cli
+
     app = Flask(__name__)
     app.config.from_object(Config())
     app.url_map.strict_slashes = False
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    for warning in app.config["DB_POOL_TOPOLOGY"]["warnings"]:
+        app.logger.warning(warning)
+    configure_sqlite(app)
+    init_replica(app)
+    init_query_counter(app)
+    init_profiler(app)
+    init_perf_log(app)
+    app.extensions["health_prober"] = HealthProber(app)
+    app.extensions["stripe_events"] = StripeEventProcessor(app)
+    # Flask-Migrate imports all of Alembic (~0.2s); only the `flask` CLI
+    # (`flask db upgrade` etc.) needs it, never a gunicorn worker.
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+        from flask_migrate import Migrate
+        Migrate(app, db)
     login_manager.init_app(app)
 
-    from .models import User
+    from .utils.user_cache import load_user_snapshot
 
     @login_manager.user_loader
     def _load_user(user_id: str):  # pragma: no cover
         try:
-            return db.session.get(User, int(user_id))
+            return load_user_snapshot(int(user_id))
         except Exception:
             return None
 
@@ -43,6 +108,9 @@ def create_app() -> Flask:
 
     register_cli(app)
 
+    # Health endpoints are matched exactly: a prefix would also catch a page like /healthcare
+    health_endpoints = {"public.health", "public.health_live"}
+
     # ── Activity logging middleware ──────────────────────────
     @app.after_request
     def _log_activity(response):
@@ -50,7 +118,9 @@ def create_app() -> Flask:
         from flask import request as req
         # Skip static files, health checks, and API endpoints
         path = req.path or ""
-        if any(path.startswith(p) for p in ("/static/", "/favicon", "/robots", "/health", "/manifest", "/sitemap")):
+        if req.endpoint in health_endpoints:
+            return response
+        if any(path.startswith(p) for p in ("/static/", "/favicon", "/robots", "/manifest", "/sitemap")):
             return response
         # Skip AJAX/API and redirects (to avoid double-logging)
         if req.is_json or response.status_code in (301, 302, 304):
@@ -73,6 +143,9 @@ def create_app() -> Flask:
     # ── Security headers ─────────────────────────────────────
     @app.after_request
     def _security_headers(response):
+        from flask import request as req
+        if req.endpoint in health_endpoints:
+            return response
         response.headers["X-Content-Type-Options"] = "nosniff"
         response.headers["X-Frame-Options"] = "SAMEORIGIN"
         response.headers["X-XSS-Protection"] = "1; mode=block"
@@ -108,41 +181,12 @@ def create_app() -> Flask:
             .replace("\n", "<br>")
         )
 
-    # ── Auto-bootstrap admin from env vars on first request ──
-    _admin_bootstrapped = {"done": False}
+    # Template/fragment render timing; after the filters above so they can be counted
+    init_template_timing(app)
 
-    @app.before_request
-    def _auto_bootstrap_admin():
-        """Create admin user from ADMIN_EMAIL + ADMIN_PASSWORD env vars if no admin exists yet."""
-        if _admin_bootstrapped["done"]:
-            return
-        _admin_bootstrapped["done"] = True
-
-        admin_email = app.config.get("ADMIN_EMAIL", "").strip().lower()
-        admin_password = app.config.get("ADMIN_PASSWORD", "").strip()
-        if not admin_email or not admin_password:
-            return
-        try:
-            existing = User.query.filter_by(email=admin_email).first()
-            if existing:
-                if not existing.is_admin:
-                    existing.is_admin = True
-                    existing.email_confirmed = True
-                    db.session.commit()
-                    app.logger.info(f"Promoted {admin_email} to admin via env vars.")
-                return
-            user = User(
-                name="Admin",
-                email=admin_email,
-                username=admin_email.split("@")[0],
-                email_confirmed=True,
-            )
-            user.set_password(admin_password)
-            user.is_admin = True
-            db.session.add(user)
-            db.session.commit()
-            app.logger.info(f"Auto-created admin user: {admin_email}")
-        except Exception as e:
-            app.logger.warning(f"Admin bootstrap skipped: {e}")
+    # ── Auto-bootstrap admin from env vars, once per process ──
+    if app.config.get("ADMIN_EMAIL") and app.config.get("ADMIN_PASSWORD"):
+        with app.app_context():
+            bootstrap_admin(app)
 
     return app
@@ -8,40 +8,111 @@ import json
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for, Response, current_app, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
 from werkzeug.utils import secure_filename
 
 from ..extensions import db
 from ..models import Application, ContactMessage, Story, User, PageLayout, Opening, TourRequest, InterestSignup, DepositPayment, ActivityLog
-from ..utils import admin_required, log_activity
+from ..utils import admin_required, log_activity, log_activity_bulk
+from ..utils.dashboard_stats import get_dashboard_counts, invalidate_dashboard_counts
+from ..utils.db_routing import read_only
+from ..utils.export import CsvExporter, stream_download
+from ..utils.listview import ListView
 from ..seed import _default_home_layout_json  # uses same defaults
 from ..forms import OpeningForm
-from ..utils import slugify
+from ..utils import slugify, save_with_unique_slug
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
+BULK_MAX_IDS = 1000
+
+# ── List views (filters, facets, keyset pages; see utils/listview.py) ──
+MESSAGES_VIEW = ListView(ContactMessage, ["name", "email", "subject", "message"], search=("name", "email", "subject"))
+USERS_VIEW = ListView(User, ["name", "username", "email", "email_confirmed", "is_admin"],
+                      search=("name", "username", "email"), filters=("is_admin", "email_confirmed"))
+TOURS_VIEW = ListView(TourRequest, ["name", "email", "phone", "preferred_time"], search=("name", "email", "phone"))
+INTEREST_VIEW = ListView(InterestSignup, ["email"], search=("email",))
+DEPOSITS_VIEW = ListView(DepositPayment, ["full_name", "email", "phone", "amount_cents", "status"],
+                         search=("full_name", "email"), facet="status")
+
+
+# ── CSV exports (streamed, filterable; see utils/export.py) ──
+EXPORTS = {
+    "applications": CsvExporter(Application, {
+        "created_at": "created_at", "full_name": "full_name", "email": "email",
+        "phone": "phone", "status": "status", "message": "message",
+    }, filters=("status",)),
+    "messages": CsvExporter(ContactMessage, {
+        "created_at": "created_at", "name": "name", "email": "email", "subject": "subject", "message": "message",
+    }),
+    "tours": CsvExporter(TourRequest, {
+        "created_at": "created_at", "name": "name", "email": "email", "phone": "phone",
+        "preferred_time": "preferred_time", "notes": "notes",
+    }),
+    "interest": CsvExporter(InterestSignup, {"created_at": "created_at", "email": "email"}),
+    "deposits": CsvExporter(DepositPayment, {
+        "created_at": "created_at", "full_name": "full_name", "email": "email", "phone": "phone",
+        "amount_cents": "amount_cents", "status": "status", "stripe_session_id": "stripe_session_id",
+    }, filters=("status",)),
+    "activity-log": CsvExporter(ActivityLog, {
+        "timestamp": "created_at", "action": "action", "category": "category", "level": "level",
+        "user_id": "user_id", "ip_address": "ip_address", "path": "path", "method": "method",
+        "details": "details", "user_agent": "user_agent",
+    }, filters=("category", "level")),
+}
+
+
+def _list_response(view: ListView, template: str, rows_name: str, **context):
+    """Render one page of a list view, or its JSON variant for ?format=json."""
+    page = view.page()
+    if request.args.get("format") == "json":
+        return jsonify(page.to_json())
+    return render_template(template, page=page, **{rows_name: page.rows}, **context)
+
+
+def _bulk_ids() -> list[int] | None:
+    """Row ids ticked in a list view's bulk form, de-duplicated.
+
+    None (with an error flashed) when more than BULK_MAX_IDS are selected: the
+    caller changes nothing rather than silently acting on part of the selection.
+    """
+    ids = {int(v) for v in request.form.getlist("ids") if v.isdigit()}
+    if len(ids) > BULK_MAX_IDS:
+        flash(f"Too many rows selected ({len(ids)}); bulk actions take at most {BULK_MAX_IDS}. Nothing was changed.",
+              "error")
+        return None
+    return sorted(ids)
+
+
+def _bulk_apply(model, ids: list[int], action: str, resource_type: str, values: dict | None = None, where=()) -> int:
+    """One UPDATE (or DELETE when ``values`` is None) over the selected rows,
+    audited with one bulk insert. Returns the number of rows changed."""
+    if not ids:
+        return 0
+    affected = [row_id for (row_id,) in model.query.filter(model.id.in_(ids), *where).with_entities(model.id)]
+    if not affected:
+        return 0
+    q = model.query.filter(model.id.in_(affected), *where)
+    if values is None:
+        q.delete(synchronize_session=False)
+    else:
+        q.update(values, synchronize_session=False)
+    db.session.commit()
+    invalidate_dashboard_counts()
+    log_activity_bulk([
+        {"action": action, "details": f"{resource_type} #{row_id} (bulk)", "resource_type": resource_type, "resource_id": row_id}
+        for row_id in affected
+    ])
+    return len(affected)
+
+
 @admin_bp.route("/")
 @login_required
 @admin_required
+@read_only
 def dashboard():
-    # real counts (no placeholders)
-    new_count = Application.query.filter_by(status="new").count()
-    total_count = Application.query.count()
-    pending_stories = Story.query.filter_by(status="pending").count()
-    msg_count = ContactMessage.query.count()
-    try:
-        tour_count = TourRequest.query.count()
-    except Exception:
-        tour_count = 0
-    try:
-        interest_count = InterestSignup.query.count()
-    except Exception:
-        interest_count = 0
-    try:
-        deposit_count = DepositPayment.query.filter_by(status="paid").count()
-        deposit_pending = DepositPayment.query.filter_by(status="pending").count()
-    except Exception:
-        deposit_count = 0
-        deposit_pending = 0
+    # real counts (no placeholders) — one round-trip, briefly cached
+    counts = get_dashboard_counts()
 
     # Activity stats
     try:
@@ -77,16 +148,7 @@ def dashboard():
     return render_template(
         "admin/dashboard.html",
         title="Admin dashboard",
-        counts={
-            "new": new_count,
-            "total": total_count,
-            "pending_stories": pending_stories,
-            "messages": msg_count,
-            "tours": tour_count,
-            "interest": interest_count,
-            "deposits_paid": deposit_count,
-            "deposits_pending": deposit_pending,
-        },
+        counts=counts,
         activity={
             "total_logs": total_logs,
             "today_views": today_views,
@@ -101,6 +163,7 @@ def dashboard():
 @admin_bp.route("/applications")
 @login_required
 @admin_required
+@read_only
 def applications():
     items = Application.query.order_by(Application.created_at.desc()).limit(200).all()
     return render_template("admin/applications.html", applications=items, active="applications", title="Applications")
@@ -116,6 +179,7 @@ def update_application(app_id: int):
         return redirect(url_for("admin.applications"))
     row.status = status
     db.session.commit()
+    invalidate_dashboard_counts()
 
     # Activity log
     try:
@@ -129,54 +193,81 @@ def update_application(app_id: int):
     flash("Application status updated.", "success")
     return redirect(url_for("admin.applications"))
 
+@admin_bp.post("/applications/bulk")
+@login_required
+@admin_required
+def applications_bulk():
+    status = (request.form.get("status") or "").strip().lower()
+    if status not in {"new", "reviewed", "approved", "rejected"}:
+        flash("Invalid status.", "error")
+        return redirect(url_for("admin.applications"))
+    ids = _bulk_ids()
+    if ids is None:
+        return redirect(url_for("admin.applications"))
+    n = _bulk_apply(Application, ids, f"application_status_changed:{status}", "application", {"status": status})
+    flash(f"{n} application(s) marked {status}.", "success")
+    return redirect(url_for("admin.applications"))
+
 @admin_bp.get("/applications/export.csv")
 @login_required
 @admin_required
+@read_only
 def export_applications():
-    items = Application.query.order_by(Application.created_at.desc()).limit(5000).all()
-
-    def esc(v: str) -> str:
-        v = (v or "")
-        # Prevent CSV formula injection (=, +, -, @, tab, CR)
-        if v and v[0] in ("=", "+", "-", "@", "\t", "\r"):
-            v = "'" + v
-        v = v.replace('"', '""')
-        return f'"{v}"'
-
-    lines = ["created_at,full_name,email,phone,status,message"]
-    for a in items:
-        lines.append(",".join([
-            esc(a.created_at.isoformat() if a.created_at else ""),
-            esc(a.full_name),
-            esc(a.email),
-            esc(a.phone or ""),
-            esc(a.status or ""),
-            esc(a.message or ""),
-        ]))
-
-    return Response(
-        "\n".join(lines),
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=applications.csv"},
-    )
+    return EXPORTS["applications"].response(request.args, "applications")
+
+@admin_bp.get("/export/<kind>.csv", defaults={"compressed": False})
+@admin_bp.get("/export/<kind>.csv.gz", defaults={"compressed": True})
+@login_required
+@admin_required
+@read_only
+def export(kind: str, compressed: bool):
+    """Stream any list as CSV (or gzip CSV), honouring status/date-range filters."""
+    exporter = EXPORTS.get(kind)
+    if exporter is None:
+        return Response("Unknown export.", status=404, mimetype="text/plain")
+    log_activity(action=f"exported:{kind}", category="admin_action",
+                 details=f"Filters: {dict(request.args) or 'none'}")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+    return exporter.response(request.args, f"{kind.replace('-', '_')}_{stamp}", compressed=compressed)
+
+@admin_bp.get("/feed/<kind>.ndjson", defaults={"compressed": False})
+@admin_bp.get("/feed/<kind>.ndjson.gz", defaults={"compressed": True})
+@login_required
+@admin_required
+@read_only
+def change_feed(kind: str, compressed: bool):
+    """Rows created or changed after ``after`` (a record's _cursor) or ``since``
+    (ISO timestamp), oldest change first, as NDJSON; see utils/changefeed.py."""
+    from ..utils.changefeed import DEFAULT_LIMIT, FEEDS, MAX_LIMIT, parse_watermark
+
+    feed = FEEDS.get(kind)
+    if feed is None:
+        return Response("Unknown feed.", status=404, mimetype="text/plain")
+    try:
+        cursor = parse_watermark(request.args.get("after"), request.args.get("since"))
+    except ValueError as e:
+        return Response(f"{e.args[0].capitalize()}.", status=400, mimetype="text/plain")
+    limit = min(max(request.args.get("limit", DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    return stream_download(feed.iter_ndjson(cursor, limit), f"{kind}.ndjson", "application/x-ndjson", compressed)
 
 @admin_bp.route("/messages")
 @login_required
 @admin_required
+@read_only
 def messages():
-    items = ContactMessage.query.order_by(ContactMessage.created_at.desc()).limit(300).all()
-    return render_template("admin/messages.html", messages=items, active="messages", title="Messages")
+    return _list_response(MESSAGES_VIEW, "admin/messages.html", "messages", active="messages", title="Messages")
 
 @admin_bp.route("/users")
 @login_required
 @admin_required
+@read_only
 def users():
-    items = User.query.order_by(User.created_at.desc()).limit(300).all()
-    return render_template("admin/users.html", users=items, active="users", title="Users")
+    return _list_response(USERS_VIEW, "admin/users.html", "users", active="users", title="Users")
 
 @admin_bp.route("/stories")
 @login_required
 @admin_required
+@read_only
 def stories():
     status = request.args.get("status", "pending")
     q = Story.query
@@ -194,6 +285,7 @@ def approve_story(story_id: int):
     story.reviewed_at = datetime.now(timezone.utc)
     story.reviewed_by = current_user.id
     db.session.commit()
+    invalidate_dashboard_counts()
     flash("Story approved.", "success")
     return redirect(url_for("admin.stories", status="pending"))
 
@@ -206,6 +298,7 @@ def reject_story(story_id: int):
     story.reviewed_at = datetime.now(timezone.utc)
     story.reviewed_by = current_user.id
     db.session.commit()
+    invalidate_dashboard_counts()
     flash("Story rejected.", "info")
     return redirect(url_for("admin.stories", status="pending"))
 
@@ -216,9 +309,31 @@ def delete_story(story_id: int):
     story = Story.query.get_or_404(story_id)
     db.session.delete(story)
     db.session.commit()
+    invalidate_dashboard_counts()
     flash("Story deleted.", "info")
     return redirect(url_for("admin.stories", status="pending"))
 
+@admin_bp.post("/stories/bulk")
+@login_required
+@admin_required
+def stories_bulk():
+    action = request.form.get("action", "")
+    back = redirect(url_for("admin.stories", status=request.form.get("return_status") or "pending"))
+    ids = _bulk_ids()
+    if ids is None:
+        return back
+    if action in {"approve", "reject"}:
+        status = "approved" if action == "approve" else "rejected"
+        values = {"status": status, "reviewed_at": datetime.now(timezone.utc), "reviewed_by": current_user.id}
+        n = _bulk_apply(Story, ids, f"story_{status}", "story", values)
+        flash(f"{n} story(ies) {status}.", "success")
+    elif action == "delete":
+        n = _bulk_apply(Story, ids, "story_deleted", "story")
+        flash(f"{n} story(ies) deleted.", "info")
+    else:
+        flash("Unknown action.", "error")
+    return back
+
 @admin_bp.route("/page-builder", methods=["GET", "POST"])
 @login_required
 @admin_required
@@ -286,6 +401,7 @@ def _photos_to_textarea(json_val: str | None) -> str:
 @admin_bp.get("/openings")
 @login_required
 @admin_required
+@read_only
 def openings():
     items = Opening.query.order_by(Opening.created_at.desc()).limit(300).all()
     return render_template("admin/openings_list.html", openings=items, active="openings", title="Openings")
@@ -308,17 +424,8 @@ def openings_new():
         flash("Please fix the form errors and try again.", "error")
         return render_template("admin/opening_form.html", form=form, active="openings", title="New opening"), 400
 
-    # ensure slug uniqueness
-    slug = slugify(form.slug.data)
-    base = slug
-    i = 2
-    while Opening.query.filter_by(slug=slug).first() is not None:
-        slug = f"{base}-{i}"
-        i += 1
-
     row = Opening(
         title=form.title.data.strip(),
-        slug=slug,
         city=(form.city.data or "").strip() or None,
         state=(form.state.data or "").strip() or None,
         beds_available=form.beds_available.data or 1,
@@ -336,8 +443,8 @@ def openings_new():
         photos_json=_photos_to_json(form.photos.data),
         status=form.status.data,
     )
-    db.session.add(row)
-    db.session.commit()
+    # ensure slug uniqueness
+    save_with_unique_slug(row, slugify(form.slug.data))
     flash("Opening created.", "success")
     return redirect(url_for("admin.openings"))
 
@@ -357,16 +464,6 @@ def openings_edit(opening_id: int):
         flash("Please fix the form errors and try again.", "error")
         return render_template("admin/opening_form.html", form=form, opening=row, active="openings", title="Edit opening"), 400
 
-    # slug uniqueness (allow unchanged)
-    new_slug = slugify(form.slug.data)
-    if new_slug != row.slug:
-        base = new_slug
-        i = 2
-        while Opening.query.filter(Opening.slug == new_slug, Opening.id != row.id).first() is not None:
-            new_slug = f"{base}-{i}"
-            i += 1
-        row.slug = new_slug
-
     row.title = form.title.data.strip()
     row.city = (form.city.data or "").strip() or None
     row.state = (form.state.data or "").strip() or None
@@ -385,7 +482,8 @@ def openings_edit(opening_id: int):
     row.photos_json = _photos_to_json(form.photos.data)
     row.status = form.status.data
 
-    db.session.commit()
+    # slug uniqueness (unchanged slug is kept unless another row took it)
+    save_with_unique_slug(row, slugify(form.slug.data))
     flash("Opening updated.", "success")
     return redirect(url_for("admin.openings"))
 
@@ -444,12 +542,24 @@ def upload_photo():
 @admin_bp.get("/tour-requests")
 @login_required
 @admin_required
+@read_only
 def tour_requests():
-    try:
-        items = TourRequest.query.order_by(TourRequest.created_at.desc()).limit(300).all()
-    except Exception:
-        items = []
-    return render_template("admin/tour_requests.html", tours=items, active="tours", title="Tour Requests")
+    return _list_response(TOURS_VIEW, "admin/tour_requests.html", "tours", active="tours", title="Tour Requests")
+
+
+@admin_bp.post("/tour-requests/bulk")
+@login_required
+@admin_required
+def tour_requests_bulk():
+    if request.form.get("action") != "delete":
+        flash("Unknown action.", "error")
+        return redirect(url_for("admin.tour_requests"))
+    ids = _bulk_ids()
+    if ids is None:
+        return redirect(url_for("admin.tour_requests"))
+    n = _bulk_apply(TourRequest, ids, "tour_request_deleted", "tour_request")
+    flash(f"{n} tour request(s) deleted.", "info")
+    return redirect(url_for("admin.tour_requests"))
 
 
 # ── Interest List (Admin) ────────────────────────────────────
@@ -457,12 +567,9 @@ def tour_requests():
 @admin_bp.get("/interest-list")
 @login_required
 @admin_required
+@read_only
 def interest_list():
-    try:
-        items = InterestSignup.query.order_by(InterestSignup.created_at.desc()).limit(300).all()
-    except Exception:
-        items = []
-    return render_template("admin/interest_list.html", signups=items, active="interest", title="Interest List")
+    return _list_response(INTEREST_VIEW, "admin/interest_list.html", "signups", active="interest", title="Interest List")
 
 
 # ── Deposit Payments (Admin) ─────────────────────────────────
@@ -470,12 +577,172 @@ def interest_list():
 @admin_bp.get("/deposits")
 @login_required
 @admin_required
+@read_only
 def deposits():
+    return _list_response(DEPOSITS_VIEW, "admin/deposits.html", "deposits", active="deposits", title="Deposit Payments")
+
+
+@admin_bp.post("/deposits/bulk")
+@login_required
+@admin_required
+def deposits_bulk():
+    """Clean up abandoned checkouts.
+
+    Only expired and failed rows can be deleted: a pending row may still have a live
+    Checkout Session (a later payment must find it), and paid/refunded rows are money records.
+    """
+    action = request.form.get("action", "")
+    ids = _bulk_ids()
+    if ids is None:
+        return redirect(url_for("admin.deposits"))
+    if action == "expire":
+        n = _bulk_apply(DepositPayment, ids, "deposit_expired", "deposit", {"status": "expired"},
+                        where=(DepositPayment.status == "pending",))
+        flash(f"{n} pending deposit(s) marked expired.", "info")
+    elif action == "delete":
+        n = _bulk_apply(DepositPayment, ids, "deposit_deleted", "deposit",
+                        where=(DepositPayment.status.in_(("expired", "failed")),))
+        flash(f"{n} expired/failed deposit(s) deleted.", "info")
+    else:
+        flash("Unknown action.", "error")
+    return redirect(url_for("admin.deposits"))
+
+
+# ── Runtime metrics (Admin) ──────────────────────────────────
+
+@admin_bp.get("/metrics.json")
+@login_required
+@admin_required
+def metrics_json():
+    """Per-worker latency histograms, counters and DB pool gauges."""
+    from ..utils import metrics
+    from ..utils.pool_stats import pool_status
+
+    payload = metrics.snapshot()
+    payload["pid"] = os.getpid()
+    payload["db_pools"] = {str(key or "default"): pool_status(engine) for key, engine in db.engines.items()}
+    replica = current_app.extensions.get("db_replica")
+    if replica is not None:
+        payload["db_pools"]["replica"] = pool_status(replica.engine)
+    payload["db_topology"] = current_app.config.get("DB_POOL_TOPOLOGY", {})
+    return jsonify(payload)
+
+
+# ── Slow-query / slow-request log (Admin) ────────────────────
+
+@admin_bp.get("/perf")
+@login_required
+@admin_required
+@read_only
+def perf_log():
+    """Slow statements and requests for one day, filterable, with a top-N summary."""
+    from datetime import timedelta
+
+    from ..models import PerfEvent
+    from ..utils.perf_log import daily_summary
+
+    kind = request.args.get("kind", "")
+    endpoint = request.args.get("endpoint", "").strip()
+    min_ms = request.args.get("min_ms", 0, type=float)
+    page = request.args.get("page", 1, type=int)
     try:
-        items = DepositPayment.query.order_by(DepositPayment.created_at.desc()).limit(300).all()
-    except Exception:
-        items = []
-    return render_template("admin/deposits.html", deposits=items, active="deposits", title="Deposit Payments")
+        day = datetime.strptime(request.args.get("day", ""), "%Y-%m-%d")
+    except ValueError:
+        day = datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+
+    q = PerfEvent.query.filter(PerfEvent.created_at >= day, PerfEvent.created_at < day + timedelta(days=1))
+    if kind in ("query", "request"):
+        q = q.filter(PerfEvent.kind == kind)
+    if endpoint:
+        q = q.filter(PerfEvent.endpoint.ilike(f"%{endpoint}%"))
+    if min_ms:
+        q = q.filter(PerfEvent.duration_ms >= min_ms)
+    pagination = q.order_by(PerfEvent.created_at.desc()).paginate(page=page, per_page=100, error_out=False)
+
+    return render_template(
+        "admin/perf.html",
+        events=pagination.items,
+        pagination=pagination,
+        summary=daily_summary(day, top=current_app.config.get("PERF_TOP_N", 20), kind=kind or None),
+        day=day,
+        current_kind=kind,
+        current_endpoint=endpoint,
+        current_min_ms=min_ms,
+        thresholds={"query": current_app.config.get("PERF_SLOW_QUERY_MS"),
+                    "request": current_app.config.get("PERF_SLOW_REQUEST_MS")},
+        active="perf",
+        title="Slow Queries & Requests",
+    )
+
+
+# ── Request profiler (Admin) ─────────────────────────────────
+
+@admin_bp.get("/profiles")
+@login_required
+@admin_required
+def profiles():
+    """Switch sampling on for chosen endpoints and list captured profiles."""
+    profiler = current_app.extensions["profiler"]
+    endpoints = sorted({
+        rule.endpoint for rule in current_app.url_map.iter_rules()
+        if rule.endpoint != "static" and not rule.endpoint.startswith("admin.profile")
+    })
+    state = profiler.state()
+    return render_template(
+        "admin/profiles.html",
+        state=state,
+        until=datetime.fromtimestamp(state["until"], timezone.utc) if state else None,
+        endpoints=endpoints,
+        profiles=profiler.profiles(),
+        active="profiles",
+        title="Profiler",
+    )
+
+
+@admin_bp.post("/profiles/start")
+@login_required
+@admin_required
+def profile_start():
+    profiler = current_app.extensions["profiler"]
+    endpoints = request.form.getlist("endpoints")
+    rate = request.form.get("rate", 10, type=float)
+    minutes = request.form.get("minutes", 15, type=float)
+    if not (0 < rate <= 100 and 0 < minutes <= 240):
+        flash("Sample rate must be 1–100% and duration 1–240 minutes.", "error")
+        return redirect(url_for("admin.profiles"))
+    profiler.enable(endpoints, rate / 100, minutes, by=current_user.email)
+    log_activity(action="profiler_started", category="admin_action",
+                 details=f"{rate:g}% of {', '.join(endpoints) or 'all endpoints'} for {minutes:g} min")
+    flash("Profiling started.", "success")
+    return redirect(url_for("admin.profiles"))
+
+
+@admin_bp.post("/profiles/stop")
+@login_required
+@admin_required
+def profile_stop():
+    current_app.extensions["profiler"].disable()
+    log_activity(action="profiler_stopped", category="admin_action")
+    flash("Profiling stopped.", "success")
+    return redirect(url_for("admin.profiles"))
+
+
+@admin_bp.get("/profiles/<name>")
+@login_required
+@admin_required
+def profile_download(name: str):
+    """The collapsed stacks as stored, or ``?format=speedscope`` for speedscope JSON."""
+    from ..utils.profiler import to_speedscope
+
+    profiler = current_app.extensions["profiler"]
+    text = profiler.read(name)
+    if text is None:
+        return Response("Unknown profile.", status=404, mimetype="text/plain")
+    if request.args.get("format") == "speedscope":
+        payload = to_speedscope(text, name, current_app.config.get("PROFILE_INTERVAL_MS", 5))
+        return Response(json.dumps(payload), mimetype="application/json", headers={
+            "Content-Disposition": f'attachment; filename="{name.rsplit(".", 1)[0]}.speedscope.json"'})
+    return Response(text, mimetype="text/plain", headers={"Content-Disposition": f'attachment; filename="{name}"'})
 
 
 # ── Activity Logs (Admin) ────────────────────────────────────
@@ -483,6 +750,7 @@ def deposits():
 @admin_bp.get("/activity-log")
 @login_required
 @admin_required
+@read_only
 def activity_log():
     """View activity logs with filtering."""
     page = request.args.get("page", 1, type=int)
@@ -513,7 +781,8 @@ def activity_log():
                 )
             )
 
-        pagination = q.order_by(ActivityLog.created_at.desc()).paginate(
+        # The template shows log.user on every row: load users in the same query, not one per row
+        pagination = q.options(joinedload(ActivityLog.user)).order_by(ActivityLog.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
         items = pagination.items
@@ -551,40 +820,10 @@ def activity_log():
 @admin_bp.get("/activity-log/export.csv")
 @login_required
 @admin_required
+@read_only
 def export_activity_log():
     """Export activity logs as CSV."""
-    try:
-        items = ActivityLog.query.order_by(ActivityLog.created_at.desc()).limit(10000).all()
-    except Exception:
-        items = []
-
-    def esc(v: str) -> str:
-        v = (v or "")
-        if v and v[0] in ("=", "+", "-", "@", "\t", "\r"):
-            v = "'" + v
-        v = v.replace('"', '""')
-        return f'"{v}"'
-
-    lines = ["timestamp,action,category,level,user_id,ip_address,path,method,details,user_agent"]
-    for log in items:
-        lines.append(",".join([
-            esc(log.created_at.isoformat() if log.created_at else ""),
-            esc(log.action or ""),
-            esc(log.category or ""),
-            esc(log.level or ""),
-            esc(str(log.user_id) if log.user_id else ""),
-            esc(log.ip_address or ""),
-            esc(log.path or ""),
-            esc(log.method or ""),
-            esc(log.details or ""),
-            esc(log.user_agent or ""),
-        ]))
-
     log_activity(action="activity_log_exported", category="admin_action",
-                 details=f"Exported {len(items)} log entries")
-
-    return Response(
-        "\n".join(lines),
-        mimetype="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=activity_log_{datetime.now(timezone.utc).strftime('%Y%m%d')}.csv"},
-    )
+                 details=f"Filters: {dict(request.args) or 'none'}")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+    return EXPORTS["activity-log"].response(request.args, f"activity_log_{stamp}")
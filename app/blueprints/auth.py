@@ -10,6 +10,7 @@ from ..extensions import db, limiter
 from ..forms import SignupForm, LoginForm, ProfileForm, PasswordChangeForm
 from ..models import User
 from ..utils.mailer import send_email
+from ..utils.user_cache import invalidate_user
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -185,6 +186,7 @@ def confirm_email(token: str):
     user.email_confirmed = True
     user.confirm_token = None  # Single-use token
     db.session.commit()
+    invalidate_user(user.id)
 
     # Log them in if not already
     if not current_user.is_authenticated:
@@ -244,6 +246,7 @@ def account():
         current_user.name = profile_form.name.data.strip()
         current_user.phone = (profile_form.phone.data or "").strip() or None
         db.session.commit()
+        invalidate_user(current_user.id)
         flash("Profile updated.", "success")
         return redirect(url_for("auth.account"))
 
@@ -1,15 +1,18 @@
 
 from __future__ import annotations
 
+import functools
 import json
-from sqlalchemy import text
+import os
 from flask import Blueprint, flash, redirect, render_template, url_for, send_from_directory, current_app, request, Response, jsonify
 from flask_login import current_user
 
 from ..extensions import db, limiter, csrf
-from ..utils import slugify
+from ..utils import slugify, save_with_unique_slug
 from ..utils.mailer import send_email
-from ..forms import ApplyForm, ContactForm, StorySubmitForm, TourRequestForm, InterestForm
+from ..utils.db_routing import read_only
+from ..utils.dashboard_stats import invalidate_dashboard_counts
+from ..forms import ApplyForm, ContactForm, StorySubmitForm, TourRequestForm, InterestForm, consume_recaptcha
 from ..models import Application, ContactMessage, Story, PageLayout, Opening, TourRequest, InterestSignup, DepositPayment
 
 public_bp = Blueprint("public", __name__)
@@ -33,76 +36,98 @@ def robots():
     return Response(body, mimetype="text/plain")
 
 
-@public_bp.get("/health")
-def health():
-    try:
-        db.session.execute(text("SELECT 1"))
-        db_ok = True
-    except Exception:
-        db_ok = False
-    status = 200 if db_ok else 503
-    return Response(
-        json.dumps({"status": "ok" if db_ok else "degraded", "db": db_ok}),
-        status=status,
-        mimetype="application/json",
-    )
+# Health probes do no work of their own: /health/live answers from memory,
+# /health/ready (and the legacy /health) return the background prober's
+# cached verdict. Both skip the rate limiter, activity log and security headers.
 
+@public_bp.get("/health/live")
+@limiter.exempt
+def health_live():
+    return jsonify(status="ok")
 
-@public_bp.get("/sitemap.xml")
-def sitemap():
-    pages = [
-        ("/", "daily", "1.0"),
-        ("/guide", "monthly", "0.9"),
-        ("/what-we-do", "monthly", "0.8"),
-        ("/standards", "monthly", "0.8"),
-        ("/faq", "monthly", "0.8"),
-        ("/openings", "weekly", "0.8"),
-        ("/apply", "weekly", "0.8"),
-        ("/donate", "monthly", "0.8"),
-        ("/resources", "weekly", "0.7"),
-        ("/veterans", "monthly", "0.7"),
-        ("/referrals", "monthly", "0.7"),
-        ("/families", "monthly", "0.7"),
-        ("/contact", "weekly", "0.7"),
-        ("/tour", "weekly", "0.7"),
-        ("/policies", "monthly", "0.6"),
-        ("/operator-resources", "monthly", "0.6"),
-        ("/impact", "monthly", "0.6"),
-        ("/stories", "weekly", "0.6"),
-        ("/programs", "monthly", "0.5"),
-        ("/careers", "monthly", "0.5"),
-        ("/classes", "monthly", "0.5"),
-        ("/partnerships", "monthly", "0.5"),
-        ("/kids-support", "monthly", "0.5"),
-        ("/shop", "monthly", "0.5"),
-        ("/privacy", "yearly", "0.3"),
-        ("/terms", "yearly", "0.3"),
-        ("/deposit", "weekly", "0.7"),
-        ("/sober-living-grover-beach", "monthly", "0.8"),
-        ("/sober-living-central-coast", "monthly", "0.8"),
-        ("/sober-living-san-luis-obispo", "monthly", "0.8"),
-    ]
-    base = request.url_root.rstrip("/")
+
+@public_bp.get("/health")
+@public_bp.get("/health/ready")
+@limiter.exempt
+def health():
+    result = current_app.extensions["health_prober"].current()
+    return jsonify(result), 503 if result["status"] == "down" else 200
+
+
+SITEMAP_PAGES = [
+    ("/", "daily", "1.0"),
+    ("/guide", "monthly", "0.9"),
+    ("/what-we-do", "monthly", "0.8"),
+    ("/standards", "monthly", "0.8"),
+    ("/faq", "monthly", "0.8"),
+    ("/openings", "weekly", "0.8"),
+    ("/apply", "weekly", "0.8"),
+    ("/donate", "monthly", "0.8"),
+    ("/resources", "weekly", "0.7"),
+    ("/veterans", "monthly", "0.7"),
+    ("/referrals", "monthly", "0.7"),
+    ("/families", "monthly", "0.7"),
+    ("/contact", "weekly", "0.7"),
+    ("/tour", "weekly", "0.7"),
+    ("/policies", "monthly", "0.6"),
+    ("/operator-resources", "monthly", "0.6"),
+    ("/impact", "monthly", "0.6"),
+    ("/stories", "weekly", "0.6"),
+    ("/programs", "monthly", "0.5"),
+    ("/careers", "monthly", "0.5"),
+    ("/classes", "monthly", "0.5"),
+    ("/partnerships", "monthly", "0.5"),
+    ("/kids-support", "monthly", "0.5"),
+    ("/shop", "monthly", "0.5"),
+    ("/privacy", "yearly", "0.3"),
+    ("/terms", "yearly", "0.3"),
+    ("/deposit", "weekly", "0.7"),
+    ("/sober-living-grover-beach", "monthly", "0.8"),
+    ("/sober-living-central-coast", "monthly", "0.8"),
+    ("/sober-living-san-luis-obispo", "monthly", "0.8"),
+]
+
+
+# Static for the life of the process; built once for SITE_URL (in the gunicorn
+# master when preloading, see utils/prefork.py). Without SITE_URL it is keyed on
+# the request host, so arbitrary Host headers can only churn this small cache.
+@functools.lru_cache(maxsize=8)
+def sitemap_xml(base: str) -> str:
     xml = ['<?xml version="1.0" encoding="UTF-8"?>',
            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
-    for loc, freq, pr in pages:
+    for loc, freq, pr in SITEMAP_PAGES:
         xml.append("<url>")
         xml.append(f"  <loc>{base}{loc}</loc>")
         xml.append(f"  <changefreq>{freq}</changefreq>")
         xml.append(f"  <priority>{pr}</priority>")
         xml.append("</url>")
     xml.append("</urlset>")
-    return Response("\n".join(xml), mimetype="application/xml")
+    return "\n".join(xml)
+
+
+@functools.lru_cache(maxsize=1)
+def manifest_bytes(static_folder: str) -> bytes:
+    with open(os.path.join(static_folder, "manifest.json"), "rb") as f:
+        return f.read()
+
+
+@public_bp.get("/sitemap.xml")
+def sitemap():
+    base = current_app.config.get("SITE_URL") or request.url_root.rstrip("/")
+    return Response(sitemap_xml(base), mimetype="application/xml")
 
 
 @public_bp.get("/manifest.json")
 def manifest():
-    return send_from_directory(current_app.static_folder, "manifest.json")
+    resp = Response(manifest_bytes(current_app.static_folder), mimetype="application/json")
+    resp.headers["Cache-Control"] = "public, max-age=86400"
+    return resp
 
 
 # ── Homepage ─────────────────────────────────────────────────
 
 @public_bp.get("/")
+@read_only
 def index():
     layout = None
     blocks = None
@@ -249,6 +274,8 @@ def contact_post():
     )
     db.session.add(msg)
     db.session.commit()
+    consume_recaptcha(form)
+    invalidate_dashboard_counts()
 
     # Activity log
     try:
@@ -310,6 +337,8 @@ def tour_post():
     )
     db.session.add(req)
     db.session.commit()
+    consume_recaptcha(form)
+    invalidate_dashboard_counts()
 
     # Activity log
     try:
@@ -374,6 +403,8 @@ def apply_post():
     )
     db.session.add(app_row)
     db.session.commit()
+    consume_recaptcha(form)
+    invalidate_dashboard_counts()
 
     # Activity log
     try:
@@ -432,6 +463,7 @@ def interest_post():
             try:
                 db.session.add(signup)
                 db.session.commit()
+                invalidate_dashboard_counts()
                 flash("You're on the list! We'll email you when a spot opens.", "success")
             except Exception:
                 db.session.rollback()
@@ -444,6 +476,7 @@ def interest_post():
 # ── Openings ─────────────────────────────────────────────────
 
 @public_bp.get("/openings")
+@read_only
 def openings():
     interest_form = InterestForm()
     try:
@@ -459,6 +492,7 @@ def openings():
 
 
 @public_bp.get("/openings/<slug>")
+@read_only
 def opening_detail(slug: str):
     row = Opening.query.filter_by(slug=slug, status="published").first_or_404()
     return render_template("opening_detail.html", opening=row, title=row.title)
@@ -467,6 +501,7 @@ def opening_detail(slug: str):
 # ── Stories ──────────────────────────────────────────────────
 
 @public_bp.get("/stories")
+@read_only
 def stories():
     try:
         items = Story.query.filter_by(status="approved").order_by(Story.created_at.desc()).limit(50).all()
@@ -476,6 +511,7 @@ def stories():
 
 
 @public_bp.get("/stories/<slug>")
+@read_only
 def story_detail(slug: str):
     story = Story.query.filter_by(slug=slug, status="approved").first_or_404()
     return render_template("story_detail.html", story=story, title=story.title)
@@ -487,24 +523,18 @@ def story_submit():
     form = StorySubmitForm()
     if form.validate_on_submit():
         title = form.title.data.strip()
-        slug = slugify(title)
-        base = slug
-        i = 2
-        while Story.query.filter_by(slug=slug).first() is not None:
-            slug = f"{base}-{i}"
-            i += 1
 
         story = Story(
             title=title,
-            slug=slug,
             summary=(form.summary.data or "").strip() or None,
             body=form.body.data.strip(),
             image_url=(form.image_url.data or "").strip() or None,
             author_name=(form.author_name.data or "").strip() or None,
             status="pending",
         )
-        db.session.add(story)
-        db.session.commit()
+        save_with_unique_slug(story, slugify(title))
+        consume_recaptcha(form)
+        invalidate_dashboard_counts()
 
         admin_email = current_app.config.get("NOTIFY_EMAIL")
         if admin_email:
@@ -576,14 +606,13 @@ def deposit():
 @public_bp.post("/deposit/create-checkout")
 @limiter.limit("5 per hour")
 def deposit_create_checkout():
-    """Create a Stripe Checkout session for deposit payment."""
+    """Send the payer to a Stripe Checkout session, reusing their open one if any."""
     sk = current_app.config.get("STRIPE_SECRET_KEY", "")
     if not sk:
         flash("Online payments are not configured yet. Please contact us directly.", "error")
         return redirect(url_for("public.deposit"))
 
-    import stripe
-    stripe.api_key = sk
+    from ..utils.checkout import get_or_create_checkout
 
     name = (request.form.get("full_name", "") or "").strip()
     email = (request.form.get("email", "") or "").strip()
@@ -596,52 +625,29 @@ def deposit_create_checkout():
     amount = current_app.config.get("DEPOSIT_AMOUNT_CENTS", 100000)
 
     try:
-        session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            customer_email=email,
-            line_items=[{
-                "price_data": {
-                    "currency": "usd",
-                    "product_data": {
-                        "name": "Overcomers — Deposit to Secure Your Spot",
-                        "description": f"Refundable deposit for sober living housing. We will contact {name} to schedule move-in.",
-                    },
-                    "unit_amount": amount,
-                },
-                "quantity": 1,
-            }],
-            mode="payment",
+        payment, created = get_or_create_checkout(
+            name, email, phone, amount,
             success_url=url_for("public.deposit_success", _external=True) + "?session_id={CHECKOUT_SESSION_ID}",
             cancel_url=url_for("public.deposit_cancel", _external=True),
-            metadata={"full_name": name, "phone": phone},
         )
     except Exception as e:
         current_app.logger.error(f"Stripe error: {e}")
         flash("Something went wrong with the payment system. Please try again or contact us.", "error")
         return redirect(url_for("public.deposit"))
 
-    # Save pending record
-    payment = DepositPayment(
-        full_name=name,
-        email=email,
-        phone=phone or None,
-        stripe_session_id=session.id,
-        amount_cents=amount,
-        status="pending",
-    )
-    db.session.add(payment)
-    db.session.commit()
+    if created:
+        invalidate_dashboard_counts()
 
-    # Activity log
-    try:
-        from ..utils import log_activity
-        log_activity(action="deposit_initiated", category="payment",
-                     details=f"Name: {name}, Email: {email}, Amount: ${amount/100:.2f}",
-                     resource_type="deposit", resource_id=payment.id)
-    except Exception:
-        pass
+        # Activity log
+        try:
+            from ..utils import log_activity
+            log_activity(action="deposit_initiated", category="payment",
+                         details=f"Name: {name}, Email: {email}, Amount: ${amount/100:.2f}",
+                         resource_type="deposit", resource_id=payment.id)
+        except Exception:
+            pass
 
-    return redirect(session.url, code=303)
+    return redirect(payment.checkout_url, code=303)
 
 
 @public_bp.get("/deposit/success")
@@ -653,6 +659,7 @@ def deposit_success():
         if payment and payment.status == "pending":
             payment.status = "paid"
             db.session.commit()
+            invalidate_dashboard_counts()
 
             # Activity log
             try:
@@ -663,42 +670,9 @@ def deposit_success():
             except Exception:
                 pass
 
-            # Notify admin
-            try:
-                send_email(
-                    to_email=current_app.config.get("NOTIFY_EMAIL"),
-                    subject="[Overcomers] New deposit payment!",
-                    body=(
-                        f"Deposit received!\n\n"
-                        f"Name: {payment.full_name}\n"
-                        f"Email: {payment.email}\n"
-                        f"Phone: {payment.phone or 'not provided'}\n"
-                        f"Amount: ${payment.amount_cents / 100:.2f}\n\n"
-                        f"Contact them to schedule move-in.\n"
-                    ),
-                )
-            except Exception:
-                pass
-
-            # Confirmation to payer
-            try:
-                send_email(
-                    to_email=payment.email,
-                    subject="Deposit received — Overcomers",
-                    body=(
-                        f"Hi {payment.full_name.split()[0]},\n\n"
-                        f"We received your deposit of ${payment.amount_cents / 100:.2f}. Thank you!\n\n"
-                        f"Next steps:\n"
-                        f"  1. We'll call or text you within 24 hours to confirm details\n"
-                        f"  2. We'll schedule your move-in date\n"
-                        f"  3. You'll receive a welcome packet with house guidelines\n\n"
-                        f"If you have questions, reply to this email or call (805) 202-8473.\n\n"
-                        f"— The Overcomers Team\n"
-                        f"support@overcomersrc.com\n"
-                    ),
-                )
-            except Exception:
-                pass
+            # Notify admin and payer
+            from ..utils.checkout import send_deposit_paid_emails
+            send_deposit_paid_emails(payment)
 
     return render_template("deposit_success.html", title="Deposit Received", payment=payment)
 
@@ -711,15 +685,16 @@ def deposit_cancel():
 @public_bp.post("/stripe/webhook")
 @csrf.exempt
 def stripe_webhook():
-    """Handle Stripe webhook events."""
+    """Verify and store a Stripe event; it is applied in the background (utils/stripe_events.py)."""
     import stripe
 
+    from ..utils.stripe_events import record_event
+
     sk = current_app.config.get("STRIPE_SECRET_KEY", "")
     wh_secret = current_app.config.get("STRIPE_WEBHOOK_SECRET", "")
     if not sk or not wh_secret:
         return jsonify({"error": "not configured"}), 400
 
-    stripe.api_key = sk
     payload = request.get_data(as_text=True)
     sig = request.headers.get("Stripe-Signature", "")
 
@@ -728,14 +703,9 @@ def stripe_webhook():
     except Exception:
         return jsonify({"error": "invalid signature"}), 400
 
-    if event["type"] == "checkout.session.completed":
-        session = event["data"]["object"]
-        payment = DepositPayment.query.filter_by(stripe_session_id=session["id"]).first()
-        if payment:
-            payment.status = "paid"
-            payment.stripe_payment_intent = session.get("payment_intent", "")
-            db.session.commit()
-
+    if not record_event(event, payload):
+        return jsonify({"status": "duplicate"}), 200
+    current_app.extensions["stripe_events"].notify()
     return jsonify({"status": "ok"}), 200
 
 
@@ -2,27 +2,202 @@
 from __future__ import annotations
 
 import click
-from flask import Flask
+from flask import Flask, current_app
 from .extensions import db
-from .models import User
-from .seed import seed_content
+from .utils.user_cache import invalidate_user
 
 @click.command("make-admin")
 @click.argument("email")
 def make_admin(email: str) -> None:
+    from .models import User
+
     user = User.query.filter_by(email=email.lower().strip()).first()
     if not user:
         raise click.ClickException("No user found with that email. Create the account first, then rerun.")
     user.is_admin = True
     db.session.commit()
+    invalidate_user(user.id)
     click.echo(f"✅ {user.email} is now an admin")
 
 @click.command("bootstrap-db")
 def bootstrap_db() -> None:
+    from .seed import seed_content
+
     db.create_all()
     seed_content()
     click.echo("✅ Database bootstrapped (tables created + defaults seeded).")
 
+@click.command("bootstrap-admin")
+def bootstrap_admin_cmd() -> None:
+    """Create/promote the admin from ADMIN_EMAIL + ADMIN_PASSWORD."""
+    from . import bootstrap_admin
+
+    if not (current_app.config.get("ADMIN_EMAIL") and current_app.config.get("ADMIN_PASSWORD")):
+        raise click.ClickException("Set ADMIN_EMAIL and ADMIN_PASSWORD first.")
+    bootstrap_admin(current_app)
+    click.echo("✅ Admin bootstrap complete.")
+
+@click.command("change-feed")
+@click.argument("kind", type=click.Choice(["applications", "messages", "tours", "deposits"]))
+@click.option("--state-file", default=".change-feed.json", show_default=True,
+              help="JSON file holding the last synced cursor per feed.")
+@click.option("--out", "out_path", default="-", show_default=True, help="NDJSON output file ('-' for stdout).")
+@click.option("--gzip", "compressed", is_flag=True, help="Append gzip-compressed NDJSON to --out.")
+@click.option("--batch", default=10_000, show_default=True, help="Rows per query.")
+def change_feed_cmd(kind: str, state_file: str, out_path: str, compressed: bool, batch: int) -> None:
+    """Write records changed since the last run as NDJSON and advance the watermark."""
+    import gzip
+    import json
+    import os
+    import sys
+
+    from .utils.changefeed import FEEDS, parse_watermark
+
+    state = {}
+    if os.path.exists(state_file):
+        with open(state_file) as f:
+            state = json.load(f)
+    cursor_token = state.get(kind)
+    try:
+        parse_watermark(cursor_token)
+    except ValueError as e:
+        # Starting over would re-send every row; make the operator decide.
+        raise click.ClickException(
+            f"{state_file} holds an {e} for {kind}; fix it, or remove the entry to resync everything."
+        ) from None
+    feed = FEEDS[kind]
+
+    if out_path == "-":
+        out = sys.stdout.buffer if compressed else sys.stdout
+        if compressed:
+            out = gzip.GzipFile(fileobj=out, mode="wb")
+    else:
+        out = gzip.open(out_path, "ab") if compressed else open(out_path, "a", encoding="utf-8")
+
+    total = 0
+    try:
+        while True:
+            n = 0
+            for record in feed.records(parse_watermark(cursor_token), batch):
+                line = json.dumps(record, separators=(",", ":")) + "\n"
+                out.write(line.encode("utf-8") if compressed else line)
+                cursor_token = record["_cursor"]
+                n += 1
+            total += n
+            # Persist after each batch so an interrupted sync resumes where it stopped.
+            state[kind] = cursor_token
+            tmp = f"{state_file}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, state_file)
+            if n < batch:
+                break
+    finally:
+        if out_path != "-" or compressed:
+            out.close()
+    click.echo(f"✅ {total} {kind} record(s) synced.", err=True)
+
+@click.command("stripe-replay")
+@click.argument("event_ids", nargs=-1)
+@click.option("--type", "event_type", default=None, help="Only events of this type, e.g. charge.refunded.")
+@click.option("--since", default=None, help="Only events received on or after this date (YYYY-MM-DD).")
+@click.option("--all", "replay_all", is_flag=True, help="Include events already processed or ignored.")
+def stripe_replay_cmd(event_ids: tuple[str, ...], event_type: str | None, since: str | None, replay_all: bool) -> None:
+    """Re-apply stored Stripe events in order.
+
+    By default re-queues events that never finished (pending or failed);
+    claims stuck in processing past STRIPE_EVENT_CLAIM_TIMEOUT are released
+    by the processor itself. Events another worker is applying right now
+    are never touched. Transitions only move forward, so replaying events
+    that were already applied changes nothing.
+    """
+    from sqlalchemy import update
+
+    from .models import StripeEvent
+    from .utils.listview import parse_day
+
+    stmt = update(StripeEvent).where(StripeEvent.status != "processing").values(status="pending", attempts=0, error=None)
+    if event_ids:
+        stmt = stmt.where(StripeEvent.event_id.in_(event_ids))
+    elif not replay_all:
+        stmt = stmt.where(StripeEvent.status.in_(("pending", "failed")))
+    if event_type:
+        stmt = stmt.where(StripeEvent.type == event_type)
+    if since:
+        day = parse_day(since)
+        if day is None:
+            raise click.BadParameter("expected YYYY-MM-DD", param_hint="--since")
+        stmt = stmt.where(StripeEvent.received_at >= day)
+    queued = db.session.execute(stmt).rowcount
+    db.session.commit()
+
+    counts = current_app.extensions["stripe_events"].process_pending()
+    summary = ", ".join(f"{n} {outcome}" for outcome, n in sorted(counts.items())) or "nothing to do"
+    click.echo(f"✅ {queued} event(s) replayed: {summary}.")
+
+@click.command("reconcile-deposits")
+@click.option("--older-than", default=30, show_default=True, help="Only deposits pending for at least this many minutes.")
+@click.option("--batch", default=100, show_default=True, help="Pending rows per page.")
+@click.option("--concurrency", default=4, show_default=True, help="Parallel Stripe lookups.")
+@click.option("--report", "report_path", default=None, help="Write the full JSON report here.")
+def reconcile_deposits_cmd(older_than: int, batch: int, concurrency: int, report_path: str | None) -> None:
+    """Settle pending deposits whose webhook and success redirect were both missed."""
+    import json
+    from datetime import timedelta
+
+    from .utils.reconcile import DepositReconciler
+    from .utils.stripe_client import get_client
+
+    client = get_client()
+    if client is None:
+        raise click.ClickException("STRIPE_SECRET_KEY is not set.")
+    report = DepositReconciler(client, batch=batch, concurrency=concurrency,
+                               older_than=timedelta(minutes=older_than)).run()
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+    click.echo(
+        f"✅ {report['checked']} pending deposit(s) checked: {report['paid']} paid, {report['expired']} expired, "
+        f"{report['still_pending']} still open, {len(report['errors'])} error(s) in {report['elapsed_s']}s."
+    )
+    if report["errors"]:
+        raise SystemExit(1)
+
+@click.command("seed-synthetic")
+@click.option("--seed", default=42, show_default=True, help="Same seed + end date => identical rows.")
+@click.option("--end", "end_date", default=None, help="Last day of generated history (YYYY-MM-DD, default today).")
+@click.option("--days", default=365, show_default=True, help="Days of history before --end.")
+@click.option("--batch", default=10_000, show_default=True, help="Rows per INSERT/COPY batch.")
+@click.option("--scale", default=1.0, show_default=True, help="Multiply every default volume (0.01 for a quick run).")
+@click.option("--set", "overrides", multiple=True, metavar="TABLE=N",
+              help="Override one volume, e.g. --set activity=5000000 (tables: users, activity, applications, "
+                   "messages, tours, interest, deposits, openings, stories).")
+def seed_synthetic_cmd(seed: int, end_date: str | None, days: int, batch: int, scale: float,
+                       overrides: tuple[str, ...]) -> None:
+    """Fill the database with deterministic production-sized data for benchmarks."""
+    from datetime import date
+
+    from .utils.synthetic import DEFAULT_VOLUMES, generate
+
+    volumes = {name: int(n * scale) for name, n in DEFAULT_VOLUMES.items()}
+    for item in overrides:
+        name, _, n = item.partition("=")
+        if name not in volumes or not n.isdigit():
+            raise click.BadParameter(f"expected TABLE=N with TABLE in {', '.join(volumes)}", param_hint="--set")
+        volumes[name] = int(n)
+
+    def progress(name: str, rows: int, seconds: float) -> None:
+        click.echo(f"  {name:<13} {rows:>10,} rows  {seconds:7.1f}s  {rows / max(seconds, 1e-9):>10,.0f} rows/s")
+
+    counts = generate(volumes, seed=seed, end=date.fromisoformat(end_date) if end_date else None,
+                      days=days, batch=batch, progress=progress)
+    click.echo(f"✅ {sum(counts.values()):,} synthetic rows inserted (seed {seed}).")
+
 def register_cli(app: Flask) -> None:
     app.cli.add_command(make_admin)
     app.cli.add_command(bootstrap_db)
+    app.cli.add_command(bootstrap_admin_cmd)
+    app.cli.add_command(change_feed_cmd)
+    app.cli.add_command(stripe_replay_cmd)
+    app.cli.add_command(reconcile_deposits_cmd)
+    app.cli.add_command(seed_synthetic_cmd)
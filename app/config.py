@@ -12,6 +12,44 @@ def _normalize_database_url(url: str | None) -> str:
         url = url.replace("postgresql://", "postgresql+psycopg://", 1)
     return url
 
+def _pool_topology(env=os.environ) -> dict:
+    """Size the Postgres pool from the gunicorn topology and a connection budget.
+
+    Each worker gets an equal share of DB_MAX_CONNECTIONS: one pooled
+    connection per thread, plus up to as many again as overflow for
+    background threads and bursts, never more than the share.
+    DB_POOL_SIZE / DB_MAX_OVERFLOW override the derived values.
+    """
+    workers = max(1, int(env.get("WEB_CONCURRENCY", "2")))
+    threads = max(1, int(env.get("GUNICORN_THREADS", "2")))
+    budget = max(1, int(env.get("DB_MAX_CONNECTIONS", "20")))
+
+    share = max(1, budget // workers)
+    pool_size = int(env.get("DB_POOL_SIZE") or min(threads, share))
+    max_overflow = int(env.get("DB_MAX_OVERFLOW") or max(0, min(threads, share - pool_size)))
+
+    warnings = []
+    peak = workers * (pool_size + max_overflow)
+    if peak > budget:
+        warnings.append(
+            f"DB pool topology can open {peak} connections "
+            f"({workers} workers x (pool_size {pool_size} + max_overflow {max_overflow})) "
+            f"but DB_MAX_CONNECTIONS is {budget}."
+        )
+    if threads > pool_size + max_overflow:
+        warnings.append(
+            f"{threads} threads per worker share {pool_size + max_overflow} DB connections; "
+            "requests will queue for connections (pool_timeout stalls)."
+        )
+    return {
+        "workers": workers,
+        "threads": threads,
+        "budget": budget,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "warnings": warnings,
+    }
+
 class Config:
     def __init__(self) -> None:
         # Core
@@ -19,16 +57,40 @@ class Config:
         self.SQLALCHEMY_DATABASE_URI = _normalize_database_url(os.environ.get("DATABASE_URL"))
         self.SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-        # Connection pooling for PostgreSQL (high-traffic resilience)
+        # Connection pooling for PostgreSQL, sized from workers x threads
+        # against DB_MAX_CONNECTIONS (see _pool_topology)
+        self.DB_POOL_TOPOLOGY = _pool_topology()
         if self.SQLALCHEMY_DATABASE_URI.startswith("postgresql"):
+            from .utils.pool_stats import InstrumentedQueuePool
+
             self.SQLALCHEMY_ENGINE_OPTIONS = {
-                "pool_size": 5,
-                "max_overflow": 10,
-                "pool_timeout": 30,
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": self.DB_POOL_TOPOLOGY["pool_size"],
+                "max_overflow": self.DB_POOL_TOPOLOGY["max_overflow"],
+                "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", "30")),
                 "pool_recycle": 1800,
                 "pool_pre_ping": True,
             }
 
+        # Optional Postgres read replica for read-only views (see utils/db_routing.py)
+        self.DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL", "")
+        self.DATABASE_REPLICA_MAX_LAG = float(os.environ.get("DATABASE_REPLICA_MAX_LAG", "5"))
+        self.DATABASE_REPLICA_CHECK_INTERVAL = float(os.environ.get("DATABASE_REPLICA_CHECK_INTERVAL", "5"))
+        self.DATABASE_REPLICA_STICKY_SECONDS = float(os.environ.get("DATABASE_REPLICA_STICKY_SECONDS", "10"))
+
+        # SQLite production mode (single-node deployments without DATABASE_URL):
+        # WAL + tuned pragmas on every connection, activity-log writes funneled
+        # through one writer thread per worker.
+        self.SQLITE_TUNED = os.environ.get("SQLITE_TUNED", "1") == "1"
+        self.SQLITE_PRAGMAS = {
+            "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+            "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+            "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+            "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+            "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", "-20000")),  # negative = KiB (~20 MB)
+        }
+        self.SQLITE_WRITE_QUEUE = os.environ.get("SQLITE_WRITE_QUEUE", "1") == "1"
+
         # Safety: crash loudly if deployed with default secret
         if os.environ.get("RENDER") and self.SECRET_KEY == "dev-not-secure-change-me":
             raise RuntimeError(
@@ -38,6 +100,10 @@ class Config:
         # HTTPS
         self.PREFERRED_URL_SCHEME = "https" if os.environ.get("RENDER") else "http"
 
+        # Canonical public base URL (e.g. https://example.org) for absolute links such as the
+        # sitemap; unset, the request's own host is used
+        self.SITE_URL = os.environ.get("SITE_URL", "").strip().rstrip("/")
+
         # Cookies
         self.SESSION_COOKIE_SECURE = os.environ.get("SESSION_COOKIE_SECURE", "0") == "1"
         self.SESSION_COOKIE_HTTPONLY = True
@@ -55,6 +121,14 @@ class Config:
         # Optional reCAPTCHA (v2 checkbox)
         self.RECAPTCHA_SITE_KEY = os.environ.get("RECAPTCHA_SITE_KEY", "")
         self.RECAPTCHA_SECRET_KEY = os.environ.get("RECAPTCHA_SECRET_KEY", "")
+        # Verifier client (see utils/recaptcha.py): timeouts in seconds, breaker after N straight failures
+        self.RECAPTCHA_VERIFY_URL = os.environ.get("RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify")
+        self.RECAPTCHA_CONNECT_TIMEOUT = float(os.environ.get("RECAPTCHA_CONNECT_TIMEOUT", "2"))
+        self.RECAPTCHA_READ_TIMEOUT = float(os.environ.get("RECAPTCHA_READ_TIMEOUT", "3"))
+        self.RECAPTCHA_CACHE_TTL = float(os.environ.get("RECAPTCHA_CACHE_TTL", "120"))
+        self.RECAPTCHA_BREAKER_FAILURES = int(os.environ.get("RECAPTCHA_BREAKER_FAILURES", "3"))
+        self.RECAPTCHA_BREAKER_COOLDOWN = float(os.environ.get("RECAPTCHA_BREAKER_COOLDOWN", "30"))
+        self.RECAPTCHA_FAIL_OPEN = os.environ.get("RECAPTCHA_FAIL_OPEN", "0") == "1"
 
         # Analytics (set to your domain, e.g. "overcomersrc.com")
         self.PLAUSIBLE_DOMAIN = os.environ.get("PLAUSIBLE_DOMAIN", "")
@@ -67,11 +141,74 @@ class Config:
         self.STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY", "")
         self.STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "")
         self.DEPOSIT_AMOUNT_CENTS = int(os.environ.get("DEPOSIT_AMOUNT_CENTS", "100000"))  # $1000 default
+        # Per-worker API client (see utils/stripe_client.py); STRIPE_API_BASE can point at a local stub
+        self.STRIPE_API_BASE = os.environ.get("STRIPE_API_BASE", "https://api.stripe.com")
+        self.STRIPE_CONNECT_TIMEOUT = float(os.environ.get("STRIPE_CONNECT_TIMEOUT", "3"))
+        self.STRIPE_READ_TIMEOUT = float(os.environ.get("STRIPE_READ_TIMEOUT", "15"))
+        self.STRIPE_MAX_RETRIES = int(os.environ.get("STRIPE_MAX_RETRIES", "2"))
+        self.STRIPE_POOL_SIZE = int(os.environ.get("STRIPE_POOL_SIZE", "8"))
+        # Repeat checkout clicks within this many seconds share one Stripe idempotency key
+        self.STRIPE_CHECKOUT_IDEMPOTENCY_WINDOW = int(os.environ.get("STRIPE_CHECKOUT_IDEMPOTENCY_WINDOW", "600"))
+        # Webhook events are stored, then applied by a background thread (see utils/stripe_events.py)
+        self.STRIPE_EVENTS_BACKGROUND = os.environ.get("STRIPE_EVENTS_BACKGROUND", "1") == "1"
+        self.STRIPE_EVENTS_POLL_INTERVAL = float(os.environ.get("STRIPE_EVENTS_POLL_INTERVAL", "30"))
+        self.STRIPE_EVENT_MAX_ATTEMPTS = int(os.environ.get("STRIPE_EVENT_MAX_ATTEMPTS", "5"))
+        # A "processing" claim older than this is from a dead worker and is released
+        self.STRIPE_EVENT_CLAIM_TIMEOUT = float(os.environ.get("STRIPE_EVENT_CLAIM_TIMEOUT", "300"))
 
         # Auto-bootstrap admin from env (optional)
         self.ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "")
         self.ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "")
 
+        # Admin dashboard counts cache (seconds)
+        self.DASHBOARD_STATS_TTL = int(os.environ.get("DASHBOARD_STATS_TTL", "30"))
+
+        # Per-worker cache of the logged-in user's snapshot (seconds)
+        self.USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", "60"))
+
+        # Rate-limit counters shared by all workers on the host (see utils/ratelimit_storage.py);
+        # set to "memory://" for per-process counters or "redis://..." for multi-host.
+        self.RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI") or "sqlite:///" + os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "instance", "ratelimit.db"
+        )
+        # Off only for load tests (tools/loadtest.py), where every POST comes from one IP
+        self.RATELIMIT_ENABLED = os.environ.get("RATELIMIT_ENABLED", "1") == "1"
+
+        # Readiness prober behind /health/ready (see utils/health.py)
+        self.HEALTH_PROBE_INTERVAL = float(os.environ.get("HEALTH_PROBE_INTERVAL", "15"))
+        self.HEALTH_PROBE_BACKGROUND = os.environ.get("HEALTH_PROBE_BACKGROUND", "1") == "1"
+        self.HEALTH_MAX_QUEUE_DEPTH = int(os.environ.get("HEALTH_MAX_QUEUE_DEPTH", "1000"))
+        self.HEALTH_MIN_FREE_MB = int(os.environ.get("HEALTH_MIN_FREE_MB", "100"))
+
+        # Per-request SQL counting: X-Query-Count header and N+1 warnings (see utils/query_counter.py)
+        self.QUERY_COUNTER = os.environ.get("QUERY_COUNTER", "0") == "1"
+        self.QUERY_N1_THRESHOLD = int(os.environ.get("QUERY_N1_THRESHOLD", "5"))
+
+        # Slow-query / slow-request log (perf_events, /admin/perf; see utils/perf_log.py)
+        self.PERF_LOG_ENABLED = os.environ.get("PERF_LOG_ENABLED", "1") == "1"
+        self.PERF_SLOW_QUERY_MS = float(os.environ.get("PERF_SLOW_QUERY_MS", "100"))
+        self.PERF_SLOW_REQUEST_MS = float(os.environ.get("PERF_SLOW_REQUEST_MS", "1000"))
+        self.PERF_LOG_BACKGROUND = os.environ.get("PERF_LOG_BACKGROUND", "1") == "1"
+        self.PERF_LOG_FLUSH_INTERVAL = float(os.environ.get("PERF_LOG_FLUSH_INTERVAL", "2"))
+        self.PERF_LOG_RETENTION_DAYS = float(os.environ.get("PERF_LOG_RETENTION_DAYS", "14"))
+        self.PERF_TOP_N = int(os.environ.get("PERF_TOP_N", "20"))
+
+        # Template render timing into the metrics histograms (see utils/template_timing.py)
+        self.TEMPLATE_TIMING = os.environ.get("TEMPLATE_TIMING", "1") == "1"
+        self.TEMPLATE_COUNTED_FILTERS = [
+            f.strip() for f in os.environ.get("TEMPLATE_COUNTED_FILTERS", "nl2br,tojson,format").split(",") if f.strip()
+        ]
+
+        # On-demand request profiler (/admin/profiles, see utils/profiler.py)
+        self.PROFILE_DIR = os.environ.get("PROFILE_DIR") or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "instance", "profiles"
+        )
+        self.PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+        self.PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "200"))
+
+        # Change feed (/admin/feed/<kind>.ndjson): hold back rows changed this recently
+        self.CHANGE_FEED_SETTLE_SECONDS = float(os.environ.get("CHANGE_FEED_SETTLE_SECONDS", "2"))
+
         # File uploads
         self.MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max upload
         self.UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "static", "uploads")
@@ -4,19 +4,19 @@ from __future__ import annotations
 from flask_login import LoginManager
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import CSRFProtect
 
-db = SQLAlchemy()
+from .utils.db_routing import RoutingSession
+from .utils import ratelimit_storage  # noqa: F401  (registers the sqlite:// limiter storage)
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 login_manager = LoginManager()
 csrf = CSRFProtect()
-migrate = Migrate()
 
 
-# Rate limiting (global + per-route)
+# Rate limiting (global + per-route); storage comes from RATELIMIT_STORAGE_URI
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["120 per minute", "2000 per hour"],
-    storage_uri="memory://",
 )
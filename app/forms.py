@@ -1,11 +1,10 @@
 
 from __future__ import annotations
 
-from flask import current_app
+from flask import current_app, session
 from flask_wtf import FlaskForm
 from wtforms import BooleanField, DateField, HiddenField, IntegerField, PasswordField, SelectField, StringField, SubmitField, TextAreaField
 from wtforms.validators import DataRequired, Email, Length, Optional, Regexp, URL, EqualTo, ValidationError
-import requests
 
 username_re = Regexp(
     r"^[a-zA-Z0-9_]{3,32}$",
@@ -16,22 +15,25 @@ def _recaptcha_enabled() -> bool:
     cfg = current_app.config
     return bool(cfg.get("RECAPTCHA_SITE_KEY")) and bool(cfg.get("RECAPTCHA_SECRET_KEY"))
 
-def validate_recaptcha(response_token: str) -> bool:
-    cfg = current_app.config
+def _recaptcha_scope(form) -> str:
+    """A verified token is only reusable by the same browser session on the same form."""
+    return f"{session.get(current_app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token'), '')}:{type(form).__name__}"
+
+def validate_recaptcha(response_token: str, scope: str = "") -> bool:
     if not _recaptcha_enabled():
         return True
     if not response_token:
         return False
-    try:
-        r = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data={"secret": cfg["RECAPTCHA_SECRET_KEY"], "response": response_token},
-            timeout=8,
-        )
-        data = r.json()
-        return bool(data.get("success"))
-    except Exception:
-        return False
+    from .utils import recaptcha  # pooled session, token cache and circuit breaker
+
+    return recaptcha.verify(response_token, scope)
+
+def consume_recaptcha(form) -> None:
+    """Call once a protected form's submission is saved: its token must not be accepted again."""
+    if _recaptcha_enabled() and form.recaptcha_token.data:
+        from .utils import recaptcha
+
+        recaptcha.forget(form.recaptcha_token.data, _recaptcha_scope(form))
 
 
 class SignupForm(FlaskForm):
@@ -58,7 +60,7 @@ class ApplyForm(FlaskForm):
     submit = SubmitField("Submit application")
 
     def validate_recaptcha_token(self, field):
-        if _recaptcha_enabled() and not validate_recaptcha(field.data):
+        if _recaptcha_enabled() and not validate_recaptcha(field.data, _recaptcha_scope(self)):
             raise ValidationError("Please complete the reCAPTCHA and try again.")
 
 
@@ -71,7 +73,7 @@ class ContactForm(FlaskForm):
     submit = SubmitField("Send")
 
     def validate_recaptcha_token(self, field):
-        if _recaptcha_enabled() and not validate_recaptcha(field.data):
+        if _recaptcha_enabled() and not validate_recaptcha(field.data, _recaptcha_scope(self)):
             raise ValidationError("Please complete the reCAPTCHA and try again.")
 
 
@@ -85,7 +87,7 @@ class TourRequestForm(FlaskForm):
     submit = SubmitField("Request tour")
 
     def validate_recaptcha_token(self, field):
-        if _recaptcha_enabled() and not validate_recaptcha(field.data):
+        if _recaptcha_enabled() and not validate_recaptcha(field.data, _recaptcha_scope(self)):
             raise ValidationError("Please complete the reCAPTCHA and try again.")
 
 
@@ -104,7 +106,7 @@ class StorySubmitForm(FlaskForm):
     submit = SubmitField("Submit story for review")
 
     def validate_recaptcha_token(self, field):
-        if _recaptcha_enabled() and not validate_recaptcha(field.data):
+        if _recaptcha_enabled() and not validate_recaptcha(field.data, _recaptcha_scope(self)):
             raise ValidationError("Please complete the reCAPTCHA and try again.")
 
 
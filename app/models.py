@@ -15,7 +15,7 @@ class User(UserMixin, db.Model):
     __tablename__ = "users"
 
     id = db.Column(db.Integer, primary_key=True)
-    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False, index=True)
     updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
 
     name = db.Column(db.String(120), nullable=False)
@@ -40,9 +40,13 @@ class User(UserMixin, db.Model):
 
 class Application(db.Model):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Change-feed watermark: WHERE (updated_at, id) > (?, ?) ORDER BY updated_at, id
+        db.Index("ix_applications_updated_at_id", "updated_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False, index=True)
     updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
 
     full_name = db.Column(db.String(120), nullable=False)
@@ -55,9 +59,13 @@ class Application(db.Model):
 
 class ContactMessage(db.Model):
     __tablename__ = "contact_messages"
+    __table_args__ = (
+        db.Index("ix_contact_messages_updated_at_id", "updated_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
 
     name = db.Column(db.String(120), nullable=False)
     email = db.Column(db.String(255), nullable=False)
@@ -68,9 +76,13 @@ class ContactMessage(db.Model):
 class TourRequest(db.Model):
     """Tour request submissions from /tour."""
     __tablename__ = "tour_requests"
+    __table_args__ = (
+        db.Index("ix_tour_requests_updated_at_id", "updated_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
 
     name = db.Column(db.String(120), nullable=False)
     email = db.Column(db.String(255), nullable=False)
@@ -84,12 +96,16 @@ class InterestSignup(db.Model):
     __tablename__ = "interest_signups"
 
     id = db.Column(db.Integer, primary_key=True)
-    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False, index=True)
     email = db.Column(db.String(255), nullable=False, unique=True, index=True)
 
 
 class Story(db.Model):
     __tablename__ = "stories"
+    __table_args__ = (
+        # Public list (approved) and admin moderation queue (by status), newest first
+        db.Index("ix_stories_status_created_at", "status", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(180), nullable=False)
@@ -118,6 +134,16 @@ class Opening(db.Model):
     """A published listing for available beds/rooms."""
 
     __tablename__ = "openings"
+    __table_args__ = (
+        # Public pages only ever list published openings, newest first
+        db.Index(
+            "ix_openings_published_created_at",
+            "created_at",
+            postgresql_where=db.text("status = 'published'"),
+            sqlite_where=db.text("status = 'published'"),
+        ),
+        db.Index("ix_openings_status_created_at", "status", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, nullable=False, default=_utcnow)
@@ -169,9 +195,15 @@ class DepositPayment(db.Model):
     """Tracks deposit payments via Stripe."""
 
     __tablename__ = "deposit_payments"
+    __table_args__ = (
+        db.Index("ix_deposit_payments_updated_at_id", "updated_at", "id"),
+        # Checkout reuses a payer's open session: WHERE email = ? AND status = 'pending'
+        db.Index("ix_deposit_payments_email_status", "email", "status"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    created_at = db.Column(db.DateTime, nullable=False, default=_utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=_utcnow, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=_utcnow, onupdate=_utcnow)
 
     full_name = db.Column(db.String(180), nullable=False)
     email = db.Column(db.String(255), nullable=False)
@@ -179,8 +211,10 @@ class DepositPayment(db.Model):
 
     stripe_session_id = db.Column(db.String(255), nullable=True, unique=True)
     stripe_payment_intent = db.Column(db.String(255), nullable=True)
+    checkout_url = db.Column(db.String(2048), nullable=True)
+    checkout_expires_at = db.Column(db.DateTime, nullable=True)
     amount_cents = db.Column(db.Integer, nullable=False)
-    status = db.Column(db.String(30), nullable=False, default="pending")  # pending, paid, failed
+    status = db.Column(db.String(30), nullable=False, default="pending", index=True)  # pending, paid, failed, expired, refunded
 
     notes = db.Column(db.Text, nullable=True)
 
@@ -188,6 +222,55 @@ class DepositPayment(db.Model):
         return f"<DepositPayment {self.id} {self.status} {self.email}>"
 
 
+class StripeEvent(db.Model):
+    """Raw Stripe webhook event, stored once per event id and applied in the background."""
+
+    __tablename__ = "stripe_events"
+    __table_args__ = (
+        # Processor scans pending events oldest-first
+        db.Index("ix_stripe_events_status_created", "status", "stripe_created", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.String(255), nullable=False, unique=True)  # evt_...
+    type = db.Column(db.String(80), nullable=False, index=True)
+    stripe_created = db.Column(db.Integer, nullable=False)  # event.created (unix seconds)
+    received_at = db.Column(db.DateTime, nullable=False, default=_utcnow)
+    payload = db.Column(db.Text, nullable=False)
+
+    status = db.Column(db.String(20), nullable=False, default="pending")  # pending, processing, processed, ignored, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    claimed_at = db.Column(db.DateTime, nullable=True)  # when a worker set it "processing"
+    processed_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<StripeEvent {self.event_id} {self.type} {self.status}>"
+
+
+class PerfEvent(db.Model):
+    """A statement or request slower than its threshold (see utils/perf_log.py)."""
+
+    __tablename__ = "perf_events"
+    __table_args__ = (
+        # Admin view filters by kind within a time window; the daily summary groups one day
+        db.Index("ix_perf_events_kind_created_at", "kind", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=_utcnow, index=True)
+    kind = db.Column(db.String(10), nullable=False)  # query | request
+    endpoint = db.Column(db.String(120), nullable=True)
+    method = db.Column(db.String(10), nullable=True)
+    status_code = db.Column(db.Integer, nullable=True)
+    duration_ms = db.Column(db.Float, nullable=False)
+    statement = db.Column(db.Text, nullable=True)  # normalized SQL, literals folded; for requests the route pattern (url_rule), never the concrete path
+    params = db.Column(db.String(200), nullable=True)  # parameter types only, never values
+
+    def __repr__(self) -> str:
+        return f"<PerfEvent {self.kind} {self.endpoint} {self.duration_ms:.0f}ms>"
+
+
 class ActivityLog(db.Model):
     """Immutable audit log for user activity, form submissions, and admin actions.
 
@@ -196,6 +279,10 @@ class ActivityLog(db.Model):
     """
 
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # Dashboard stats and recent-activity feed filter by category within a time window
+        db.Index("ix_activity_logs_category_created_at", "category", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, nullable=False, default=_utcnow, index=True)
@@ -41,6 +41,55 @@ def slugify(value: str) -> str:
     return value or "item"
 
 
+def unique_slug(model, base: str, exclude_id: int | None = None) -> str:
+    """Return ``base`` or the first free ``base-N`` for ``model.slug``.
+
+    Fetches every existing ``base`` / ``base-%`` slug in one query and picks
+    the suffix in memory, instead of probing one candidate per query.
+    """
+    from ..extensions import db
+
+    pattern = base.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "-%"
+    q = db.session.query(model.slug).filter(
+        db.or_(model.slug == base, model.slug.like(pattern, escape="\\"))
+    )
+    if exclude_id is not None:
+        q = q.filter(model.id != exclude_id)
+    taken = {row[0] for row in q}
+
+    if base not in taken:
+        return base
+    i = 2
+    while f"{base}-{i}" in taken:
+        i += 1
+    return f"{base}-{i}"
+
+
+def save_with_unique_slug(row, base: str, attempts: int = 5):
+    """Assign a free slug to ``row`` and commit it.
+
+    Two concurrent submissions can pick the same slug; the loser hits the
+    unique constraint, rolls back to a savepoint and retries with a fresh
+    allocation, so any other pending changes in the session survive.
+    """
+    from sqlalchemy.exc import IntegrityError
+    from ..extensions import db
+
+    model = type(row)
+    for attempt in range(attempts):
+        slug = unique_slug(model, base, exclude_id=row.id)
+        try:
+            with db.session.begin_nested():
+                row.slug = slug
+                db.session.add(row)
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+            continue
+        db.session.commit()
+        return row
+
+
 def log_activity(
     action: str,
     category: str = "general",
@@ -53,13 +102,15 @@ def log_activity(
     """Write an immutable activity log entry.
 
     Safe to call from anywhere — silently fails if DB unavailable.
+    On SQLite production mode the insert is queued to the writer thread
+    instead of committing on the request's session.
     """
-    from flask import request as _req, has_request_context
+    from flask import current_app, has_app_context, request as _req, has_request_context
     from flask_login import current_user as _cu
 
     try:
         from ..extensions import db
-        from ..models import ActivityLog
+        from ..models import ActivityLog, _utcnow
 
         entry = ActivityLog(
             action=action[:80],
@@ -83,6 +134,14 @@ def log_activity(
             entry.path = (_req.path or "")[:500]
             entry.method = (_req.method or "")[:10]
 
+        writer = current_app.extensions.get("sqlite_writer") if has_app_context() else None
+        if writer is not None:
+            values = {c.key: getattr(entry, c.key) for c in ActivityLog.__table__.columns if c.key != "id"}
+            values["created_at"] = values["created_at"] or _utcnow()
+            values["level"] = values["level"] or "info"
+            writer.submit_insert(ActivityLog.__table__, values)
+            return
+
         db.session.add(entry)
         db.session.commit()
     except Exception:
@@ -92,3 +151,62 @@ def log_activity(
             db.session.rollback()
         except Exception:
             pass
+
+
+def log_activity_bulk(entries: list[dict], category: str = "admin_action", level: str = "info") -> None:
+    """Write many activity log entries in one INSERT (executemany).
+
+    Each entry carries ``action`` plus optional ``details``,
+    ``resource_type`` and ``resource_id``; user and request fields are
+    taken once from the current request. Fails silently like log_activity.
+    """
+    if not entries:
+        return
+    from flask import current_app, has_app_context, request as _req, has_request_context
+    from flask_login import current_user as _cu
+
+    try:
+        from ..extensions import db
+        from ..models import ActivityLog, _utcnow
+
+        shared = {
+            "created_at": _utcnow(),
+            "category": category[:30],
+            "level": level,
+            "user_id": _cu.id if hasattr(_cu, "id") and _cu.is_authenticated else None,
+            "ip_address": None,
+            "user_agent": None,
+            "path": None,
+            "method": None,
+        }
+        if has_request_context():
+            shared.update(
+                ip_address=_req.headers.get("X-Forwarded-For", _req.remote_addr or "")[:45],
+                user_agent=(_req.user_agent.string or "")[:512],
+                path=(_req.path or "")[:500],
+                method=(_req.method or "")[:10],
+            )
+        rows = [
+            {
+                **shared,
+                "action": e["action"][:80],
+                "details": (e.get("details") or "")[:4000] or None,
+                "resource_type": e.get("resource_type"),
+                "resource_id": e.get("resource_id"),
+            }
+            for e in entries
+        ]
+
+        writer = current_app.extensions.get("sqlite_writer") if has_app_context() else None
+        if writer is not None:
+            writer.submit_insert(ActivityLog.__table__, rows)
+            return
+
+        db.session.execute(ActivityLog.__table__.insert(), rows)
+        db.session.commit()
+    except Exception:
+        try:
+            from ..extensions import db
+            db.session.rollback()
+        except Exception:
+            pass
@@ -0,0 +1,161 @@
+"""Idempotent Stripe Checkout sessions for deposits.
+
+Double-clicks and back-button retries used to create a new Checkout
+Session and a new ``DepositPayment`` row each time. Now:
+
+* a payer with a pending deposit whose session is still open (and not
+  about to expire) is sent straight back to that session, with no Stripe
+  call at all. Name, email, phone and amount must all match, the same
+  fields as the idempotency key, so typing someone else's email never
+  reveals their open Checkout page and corrected details get a new one;
+* otherwise the session is created with an idempotency key derived from
+  the payer's details and the current ``STRIPE_CHECKOUT_IDEMPOTENCY_WINDOW``,
+  so concurrent clicks that both miss the lookup still get one session
+  from Stripe, and the unique ``stripe_session_id`` leaves one row.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import DepositPayment
+from .stripe_client import get_client
+
+REUSE_MARGIN = timedelta(minutes=5)  # don't hand out a session that expires mid-payment
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def idempotency_key(email: str, name: str, phone: str, amount: int, now: float | None = None) -> str:
+    window = int(current_app.config.get("STRIPE_CHECKOUT_IDEMPOTENCY_WINDOW", 600))
+    bucket = int((now or time.time()) // max(window, 1))
+    # Stripe rejects a reused key with different parameters, so everything sent goes into it.
+    digest = hashlib.sha256(f"{email}|{name}|{phone}|{amount}|{bucket}".encode()).hexdigest()[:40]
+    return f"deposit-checkout-{digest}"
+
+
+def reusable_deposit(email: str, name: str, phone: str, amount: int) -> DepositPayment | None:
+    """The payer's newest pending deposit, with these exact details, whose Checkout Session is still open."""
+    cutoff = _naive_utc(datetime.now(timezone.utc) + REUSE_MARGIN)
+    return db.session.scalar(
+        select(DepositPayment)
+        .where(
+            DepositPayment.email == email,
+            DepositPayment.status == "pending",
+            DepositPayment.full_name == name,
+            DepositPayment.phone.is_(None) if not phone else DepositPayment.phone == phone,
+            DepositPayment.amount_cents == amount,
+            DepositPayment.checkout_url.is_not(None),
+            DepositPayment.checkout_expires_at > cutoff,
+        )
+        .order_by(DepositPayment.id.desc())
+        .limit(1)
+    )
+
+
+def get_or_create_checkout(name: str, email: str, phone: str, amount: int,
+                           success_url: str, cancel_url: str) -> tuple[DepositPayment, bool]:
+    """Return ``(deposit, created)``; ``deposit.checkout_url`` is where to send the payer.
+
+    Raises whatever the Stripe client raises if a new session can't be created.
+    """
+    email = email.strip().lower()
+    existing = reusable_deposit(email, name, phone, amount)
+    if existing is not None:
+        return existing, False
+
+    session = get_client().checkout.sessions.create(
+        {
+            "payment_method_types": ["card"],
+            "customer_email": email,
+            "line_items": [{
+                "price_data": {
+                    "currency": "usd",
+                    "product_data": {
+                        "name": "Overcomers — Deposit to Secure Your Spot",
+                        "description": f"Refundable deposit for sober living housing. We will contact {name} to schedule move-in.",
+                    },
+                    "unit_amount": amount,
+                },
+                "quantity": 1,
+            }],
+            "mode": "payment",
+            "success_url": success_url,
+            "cancel_url": cancel_url,
+            "metadata": {"full_name": name, "phone": phone},
+        },
+        {"idempotency_key": idempotency_key(email, name, phone, amount)},
+    )
+
+    payment = DepositPayment(
+        full_name=name,
+        email=email,
+        phone=phone or None,
+        stripe_session_id=session.id,
+        checkout_url=session.url,
+        checkout_expires_at=(datetime.fromtimestamp(session.expires_at, timezone.utc).replace(tzinfo=None)
+                             if session.get("expires_at") else None),
+        amount_cents=amount,
+        status="pending",
+    )
+    db.session.add(payment)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent click got the same session back from Stripe and saved it first.
+        db.session.rollback()
+        return db.session.scalar(select(DepositPayment).where(DepositPayment.stripe_session_id == session.id)), False
+    return payment, True
+
+
+def send_deposit_paid_emails(payment) -> None:
+    """Tell the admins and the payer that a deposit was paid (success page and reconcile).
+
+    ``payment`` is a DepositPayment or any row with its name, email, phone and amount.
+    """
+    from .mailer import send_email
+
+    amount = f"${payment.amount_cents / 100:.2f}"
+    try:
+        send_email(
+            to_email=current_app.config.get("NOTIFY_EMAIL"),
+            subject="[Overcomers] New deposit payment!",
+            body=(
+                f"Deposit received!\n\n"
+                f"Name: {payment.full_name}\n"
+                f"Email: {payment.email}\n"
+                f"Phone: {payment.phone or 'not provided'}\n"
+                f"Amount: {amount}\n\n"
+                f"Contact them to schedule move-in.\n"
+            ),
+        )
+    except Exception:
+        pass
+
+    try:
+        send_email(
+            to_email=payment.email,
+            subject="Deposit received — Overcomers",
+            body=(
+                f"Hi {(payment.full_name.split() or ['there'])[0]},\n\n"
+                f"We received your deposit of {amount}. Thank you!\n\n"
+                f"Next steps:\n"
+                f"  1. We'll call or text you within 24 hours to confirm details\n"
+                f"  2. We'll schedule your move-in date\n"
+                f"  3. You'll receive a welcome packet with house guidelines\n\n"
+                f"If you have questions, reply to this email or call (805) 202-8473.\n\n"
+                f"— The Overcomers Team\n"
+                f"support@overcomersrc.com\n"
+            ),
+        )
+    except Exception:
+        pass
@@ -0,0 +1,106 @@
+"""Dashboard counters for the admin home page.
+
+All headline counts are fetched in a single ``UNION ALL`` round-trip and
+kept in a short per-worker TTL cache. Write paths that change any of the
+counted tables call :func:`invalidate_dashboard_counts` so the admin who
+just made a change sees it immediately; other workers catch up within
+``DASHBOARD_STATS_TTL`` seconds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import func, literal, select, union_all
+
+_lock = threading.Lock()
+_cache: dict = {"expires": 0.0, "counts": None, "generation": 0}
+
+COUNT_KEYS = (
+    "new",
+    "total",
+    "pending_stories",
+    "messages",
+    "tours",
+    "interest",
+    "deposits_paid",
+    "deposits_pending",
+)
+
+
+def _counts_query():
+    """Build the single UNION ALL statement returning (key, count) rows."""
+    from ..models import Application, ContactMessage, DepositPayment, InterestSignup, Story, TourRequest
+
+    def _count(key, model, *criteria):
+        stmt = select(literal(key).label("key"), func.count().label("n")).select_from(model)
+        if criteria:
+            stmt = stmt.where(*criteria)
+        return stmt
+
+    return union_all(
+        _count("new", Application, Application.status == "new"),
+        _count("total", Application),
+        _count("pending_stories", Story, Story.status == "pending"),
+        _count("messages", ContactMessage),
+        _count("tours", TourRequest),
+        _count("interest", InterestSignup),
+        _count("deposits_paid", DepositPayment, DepositPayment.status == "paid"),
+        _count("deposits_pending", DepositPayment, DepositPayment.status == "pending"),
+    )
+
+
+def _count_separately() -> dict:
+    """Per-table fallback used when the combined query fails (e.g. a table is missing)."""
+    from ..extensions import db
+
+    counts = dict.fromkeys(COUNT_KEYS, 0)
+    for part in _counts_query().selects:
+        try:
+            key, n = db.session.execute(part).one()
+            counts[key] = n
+        except Exception:
+            db.session.rollback()
+    return counts
+
+
+def fetch_dashboard_counts() -> dict:
+    """Run the combined count query without touching the cache."""
+    from ..extensions import db
+
+    try:
+        rows = db.session.execute(_counts_query()).all()
+    except Exception:
+        db.session.rollback()
+        return _count_separately()
+    counts = dict.fromkeys(COUNT_KEYS, 0)
+    counts.update({key: n for key, n in rows})
+    return counts
+
+
+def get_dashboard_counts() -> dict:
+    """Return cached dashboard counts, refreshing them once the TTL lapses."""
+    ttl = float(current_app.config.get("DASHBOARD_STATS_TTL", 30))
+    now = time.monotonic()
+    with _lock:
+        if _cache["counts"] is not None and now < _cache["expires"]:
+            return dict(_cache["counts"])
+        generation = _cache["generation"]
+
+    counts = fetch_dashboard_counts()
+    with _lock:
+        # Don't cache a result that raced with a write-path invalidation.
+        if generation == _cache["generation"]:
+            _cache["counts"] = counts
+            _cache["expires"] = time.monotonic() + ttl
+    return dict(counts)
+
+
+def invalidate_dashboard_counts() -> None:
+    """Drop the cached counts so the next dashboard load re-queries."""
+    with _lock:
+        _cache["counts"] = None
+        _cache["expires"] = 0.0
+        _cache["generation"] += 1
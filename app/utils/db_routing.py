@@ -0,0 +1,142 @@
+"""Optional read-replica routing.
+
+Set ``DATABASE_REPLICA_URL`` and mark read-only views with
+:func:`read_only`. Those views read from the replica; everything else, all
+flushes and any INSERT/UPDATE/DELETE statement stay on the primary.
+
+Read-your-writes: after a non-GET request commits, the browser is pinned
+to the primary for ``DATABASE_REPLICA_STICKY_SECONDS`` (a timestamp in the
+signed session cookie), so the redirect after a POST shows the change.
+
+The replica is health- and lag-checked at most every
+``DATABASE_REPLICA_CHECK_INTERVAL`` seconds; when it is down or further
+behind than ``DATABASE_REPLICA_MAX_LAG`` seconds, reads fall back to the
+primary until a later check passes.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from flask import Flask, current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+
+log = logging.getLogger(__name__)
+
+STICKY_KEY = "_db_primary_until"
+
+_PG_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def read_only(fn):
+    """Mark a view as safe to serve from the read replica."""
+    fn.db_read_only = True
+    return fn
+
+
+class ReplicaRouter:
+    """Holds the replica engine and its cached health/lag state."""
+
+    def __init__(self, engine, max_lag: float, check_interval: float) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.healthy = False
+        self.lag: float | None = None
+        self.checked_at = 0.0
+        self._checking = threading.Lock()
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, ctx) -> None:
+        if ctx.is_disconnect:
+            self.healthy = False
+            self.checked_at = time.monotonic()
+
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    lag = float(conn.execute(_PG_LAG_SQL).scalar() or 0)
+                else:
+                    conn.execute(text("SELECT 1"))
+                    lag = 0.0
+            self.lag = lag
+            self.healthy = lag <= self.max_lag
+            if not self.healthy:
+                log.warning("Read replica lagging %.1fs; reading from primary", lag)
+        except Exception as e:
+            if self.healthy:
+                log.warning("Read replica unavailable, falling back to primary: %s", e)
+            self.healthy = False
+            self.lag = None
+        self.checked_at = time.monotonic()
+
+    def available(self) -> bool:
+        """Current verdict; refreshes it when stale (one thread checks, others use the last verdict)."""
+        if time.monotonic() - self.checked_at >= self.check_interval and self._checking.acquire(blocking=False):
+            try:
+                self.check()
+            finally:
+                self._checking.release()
+        return self.healthy
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends read-only view reads to the replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, "is_dml", False):
+            router = _replica_for_request()
+            if router is not None:
+                return router.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _note_write(_session) -> None:
+    if has_request_context():
+        g.db_wrote = True
+
+
+def _replica_for_request() -> ReplicaRouter | None:
+    if not has_request_context() or not g.get("db_read_only"):
+        return None
+    router = current_app.extensions.get("db_replica")
+    if router is None or not router.available():
+        return None
+    return router
+
+
+def init_replica(app: Flask) -> None:
+    """Create the replica engine and request hooks when DATABASE_REPLICA_URL is set."""
+    from ..config import _normalize_database_url
+
+    url = app.config.get("DATABASE_REPLICA_URL")
+    if not url:
+        return
+
+    engine = create_engine(_normalize_database_url(url), **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    app.extensions["db_replica"] = ReplicaRouter(
+        engine,
+        max_lag=float(app.config.get("DATABASE_REPLICA_MAX_LAG", 5)),
+        check_interval=float(app.config.get("DATABASE_REPLICA_CHECK_INTERVAL", 5)),
+    )
+    sticky_seconds = float(app.config.get("DATABASE_REPLICA_STICKY_SECONDS", 10))
+
+    @app.before_request
+    def _route_reads():
+        view = app.view_functions.get(request.endpoint or "")
+        if getattr(view, "db_read_only", False) and session.get(STICKY_KEY, 0) < time.time():
+            g.db_read_only = True
+
+    @app.after_request
+    def _pin_after_write(response):
+        if g.get("db_wrote") and request.method not in ("GET", "HEAD", "OPTIONS"):
+            session[STICKY_KEY] = time.time() + sticky_seconds
+        return response
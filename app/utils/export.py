@@ -0,0 +1,109 @@
+"""Streaming CSV exports for the admin.
+
+A :class:`CsvExporter` names the columns of one table and the query
+args it may be filtered by (exact-match columns plus a ``from``/``to``
+date range). :meth:`CsvExporter.response` streams the matching rows
+newest first from a server-side cursor in ``yield_per`` partitions, so
+exports have no row cap and memory stays flat however large the table
+or its text columns get. Pass ``compressed=True`` for ``.csv.gz``.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import zlib
+from datetime import datetime, timedelta
+
+from flask import Response, stream_with_context
+from sqlalchemy import select
+
+from ..extensions import db
+from .listview import parse_day
+
+YIELD_PER = 1000
+
+# Leading characters a spreadsheet would evaluate as a formula.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def csv_safe_rows(rows) -> list[list[str]]:
+    """Stringify a batch of rows and neutralise CSV formula injection in one pass."""
+    out = []
+    for row in rows:
+        cells = [_cell(v) for v in row]
+        out.append(["'" + c if c.startswith(_FORMULA_PREFIXES) else c for c in cells])
+    return out
+
+
+class CsvExporter:
+    def __init__(self, model, columns, filters=(), date_column: str = "created_at") -> None:
+        """``columns`` maps CSV header -> model attribute name, in output order."""
+        self.model = model
+        self.headers = list(columns)
+        self.attrs = [getattr(model, name) for name in columns.values()]
+        self.filters = tuple(filters)
+        self.date_col = getattr(model, date_column)
+
+    def statement(self, args):
+        stmt = select(*self.attrs)
+        for name in self.filters:
+            value = (args.get(name) or "").strip()
+            if value:
+                stmt = stmt.where(getattr(self.model, name) == value)
+        start, end = parse_day(args.get("from")), parse_day(args.get("to"))
+        if start:
+            stmt = stmt.where(self.date_col >= start)
+        if end:
+            stmt = stmt.where(self.date_col < end + timedelta(days=1))
+        return stmt.order_by(self.date_col.desc(), self.model.id.desc())
+
+    def iter_csv(self, args):
+        """CSV text in chunks of up to YIELD_PER rows."""
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(self.headers)
+        result = db.session.execute(self.statement(args).execution_options(yield_per=YIELD_PER))
+        for partition in result.partitions():
+            writer.writerows(csv_safe_rows(partition))
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+
+    def response(self, args, filename: str, compressed: bool = False) -> Response:
+        return stream_download(self.iter_csv(args), f"{filename}.csv", "text/csv", compressed)
+
+
+def encode_chunks(chunks, compressed: bool = False):
+    """UTF-8 encode text chunks, gzip-compressing them incrementally if asked."""
+    if not compressed:
+        for chunk in chunks:
+            yield chunk.encode("utf-8")
+        return
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = gz.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield gz.flush()
+
+
+def stream_download(chunks, filename: str, mimetype: str, compressed: bool = False) -> Response:
+    """Attachment response streaming ``chunks`` (text) as-is or as ``<filename>.gz``."""
+    if compressed:
+        filename, mimetype = f"{filename}.gz", "application/gzip"
+    return Response(
+        stream_with_context(encode_chunks(chunks, compressed)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
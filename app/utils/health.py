@@ -0,0 +1,126 @@
+"""Readiness prober behind ``/health/ready``.
+
+A background thread (one per worker, started on first use and again after
+a fork) probes the database, queue depths and upload disk space every
+``HEALTH_PROBE_INTERVAL`` seconds. Health endpoints only read the cached
+result, so uptime monitors never add database load.
+
+Queues register themselves with :func:`register_queue` as a name and a
+zero-argument callable returning the current depth.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import Flask
+from sqlalchemy import text
+
+
+def register_queue(app: Flask, name: str, depth_fn) -> None:
+    app.extensions.setdefault("outbox_queues", {})[name] = depth_fn
+
+
+class HealthProber:
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.interval = float(app.config.get("HEALTH_PROBE_INTERVAL", 15))
+        self.background = bool(app.config.get("HEALTH_PROBE_BACKGROUND", True))
+        self.result: dict | None = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread: threading.Thread | None = None
+
+    # ── checks ──
+    def _check_db(self) -> dict:
+        from ..extensions import db
+
+        t0 = time.perf_counter()
+        try:
+            with self.app.app_context():
+                with db.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            return {"ok": True, "ms": round((time.perf_counter() - t0) * 1000, 2)}
+        except Exception as e:
+            return {"ok": False, "error": type(e).__name__}
+
+    def _check_queues(self) -> dict:
+        limit = int(self.app.config.get("HEALTH_MAX_QUEUE_DEPTH", 1000))
+        depths = {}
+        for name, depth_fn in self.app.extensions.get("outbox_queues", {}).items():
+            try:
+                depths[name] = int(depth_fn())
+            except Exception:
+                depths[name] = -1
+        return {"ok": all(0 <= d <= limit for d in depths.values()), "depths": depths, "limit": limit}
+
+    def _check_disk(self) -> dict:
+        folder = self.app.config.get("UPLOAD_FOLDER") or "."
+        min_free_mb = int(self.app.config.get("HEALTH_MIN_FREE_MB", 100))
+        try:
+            usage = shutil.disk_usage(folder if os.path.isdir(folder) else os.path.dirname(folder) or ".")
+        except OSError as e:
+            return {"ok": False, "error": type(e).__name__}
+        free_mb = usage.free // (1024 * 1024)
+        return {"ok": free_mb >= min_free_mb, "free_mb": free_mb, "min_free_mb": min_free_mb}
+
+    def probe(self) -> dict:
+        checks = {"db": self._check_db(), "queues": self._check_queues(), "disk": self._check_disk()}
+        if not checks["db"]["ok"]:
+            status = "down"
+        elif all(c["ok"] for c in checks.values()):
+            status = "ok"
+        else:
+            status = "degraded"
+        result = {
+            "status": status,
+            "checks": checks,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "pid": os.getpid(),
+        }
+        with self._lock:
+            self.result = result
+            self.checked_at = time.monotonic()
+        return result
+
+    # ── background loop ──
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.probe()
+            except Exception:
+                pass
+
+    def start(self) -> None:
+        """Worker start: begin probing before the first health check asks."""
+        if self.background:
+            self._ensure_thread()
+
+    def _ensure_thread(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != pid or self._thread is None or not self._thread.is_alive():
+                self._pid = pid
+                self._thread = threading.Thread(target=self._run, name="health-prober", daemon=True)
+                self._thread.start()
+
+    def current(self) -> dict:
+        """Cached result plus its age; probes inline only when there is none yet
+        (or, without the background thread, when it has gone stale)."""
+        if self.background:
+            self._ensure_thread()
+        stale = time.monotonic() - self.checked_at >= self.interval
+        if self.result is None or (stale and not self.background):
+            self.probe()
+        with self._lock:
+            result = dict(self.result)
+            result["age_s"] = round(time.monotonic() - self.checked_at, 3)
+        return result
@@ -0,0 +1,162 @@
+"""Shared engine behind the admin list pages.
+
+A :class:`ListView` describes one table: the columns the page shows (only
+those are selected), which columns the ``q`` search box matches, which
+columns can be filtered by exact value, an optional facet column (status
+pills with per-value counts) and the timestamp used for ``from``/``to``
+date ranges. :meth:`ListView.page` reads those from the query string and
+returns a :class:`ListPage`.
+
+Pagination is keyset, newest first: ``after`` is an opaque cursor holding
+the last row's ``(created_at, id)``, so page 500 costs the same index range
+scan as page 1 and rows inserted meanwhile never shift the pages.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timedelta
+
+from flask import request, url_for
+from sqlalchemy import Boolean, and_, func, or_, select
+
+from ..extensions import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, row_id = json.loads(raw)
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_day(value: str | None) -> datetime | None:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d") if value else None
+    except ValueError:
+        return None
+
+
+class ListPage:
+    """One page of results plus everything the template needs to render
+    the filter bar, facet pills and pager."""
+
+    def __init__(self, rows, columns, next_cursor, facets, total, args) -> None:
+        self.rows = rows
+        self.columns = columns
+        self.next_cursor = next_cursor
+        self.facets = facets
+        self.total = total
+        self.args = args
+
+    def url(self, **changes) -> str:
+        """URL of the current list with some query args replaced (None drops one)."""
+        args = {**self.args, **changes}
+        return url_for(request.endpoint, **{k: v for k, v in args.items() if v not in (None, "")})
+
+    def to_json(self) -> dict:
+        def _value(v):
+            return v.isoformat() if isinstance(v, datetime) else v
+
+        return {
+            "columns": self.columns,
+            "rows": [{c: _value(getattr(row, c)) for c in self.columns} for row in self.rows],
+            "next": self.next_cursor,
+            "facets": self.facets,
+            "total": self.total,
+        }
+
+
+class ListView:
+    def __init__(self, model, columns, search=(), filters=(), facet: str | None = None,
+                 date_column: str = "created_at") -> None:
+        self.model = model
+        self.columns = list(dict.fromkeys(["id", date_column, *columns]))
+        self.search = [getattr(model, c) for c in search]
+        self.filters = tuple(filters)
+        self.facet = facet
+        self.date_col = getattr(model, date_column)
+
+    def _criteria(self, args) -> tuple[list, list]:
+        """(criteria without the facet filter, facet criteria)."""
+        criteria = []
+        q = (args.get("q") or "").strip().lower()
+        if q and self.search:
+            criteria.append(or_(*(func.lower(c).contains(q, autoescape=True) for c in self.search)))
+
+        for name in self.filters:
+            value = (args.get(name) or "").strip()
+            if not value:
+                continue
+            col = getattr(self.model, name)
+            if isinstance(col.type, Boolean):
+                if value.lower() in _TRUE:
+                    criteria.append(col.is_(True))
+                elif value.lower() in _FALSE:
+                    criteria.append(col.is_(False))
+            else:
+                criteria.append(col == value)
+
+        start, end = parse_day(args.get("from")), parse_day(args.get("to"))
+        if start:
+            criteria.append(self.date_col >= start)
+        if end:
+            criteria.append(self.date_col < end + timedelta(days=1))
+
+        facet_criteria = []
+        if self.facet and args.get(self.facet):
+            facet_criteria.append(getattr(self.model, self.facet) == args[self.facet])
+        return criteria, facet_criteria
+
+    def statement(self, args, limit: int = DEFAULT_PAGE_SIZE):
+        """SELECT for one page (plus one extra row to detect a next page)."""
+        criteria, facet_criteria = self._criteria(args)
+        stmt = select(*(getattr(self.model, c) for c in self.columns)).where(*criteria, *facet_criteria)
+        cursor = decode_cursor(args.get("after", ""))
+        if cursor:
+            ts, last_id = cursor
+            stmt = stmt.where(or_(self.date_col < ts, and_(self.date_col == ts, self.model.id < last_id)))
+        return stmt.order_by(self.date_col.desc(), self.model.id.desc()).limit(limit + 1)
+
+    def facet_statement(self, args):
+        """Per-value counts of the facet column under every filter but the facet itself."""
+        criteria, _facet_criteria = self._criteria(args)
+        facet_col = getattr(self.model, self.facet)
+        return select(facet_col, func.count()).where(*criteria).group_by(facet_col)
+
+    def page(self, args=None) -> ListPage:
+        args = request.args if args is None else args
+        limit = min(max(args.get("limit", DEFAULT_PAGE_SIZE, type=int) or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+        rows = db.session.execute(self.statement(args, limit)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(getattr(last, self.date_col.key), last.id)
+
+        facets = {}
+        if self.facet:
+            facets = {str(value): n for value, n in db.session.execute(self.facet_statement(args)).all()}
+            total = facets.get(args[self.facet], 0) if args.get(self.facet) else sum(facets.values())
+        else:
+            criteria, _facet_criteria = self._criteria(args)
+            total = db.session.execute(select(func.count()).select_from(self.model).where(*criteria)).scalar()
+
+        keep = ("q", "from", "to", "limit", *self.filters, *((self.facet,) if self.facet else ()))
+        echoed = {k: args.get(k) for k in keep if args.get(k)}
+        return ListPage(rows, self.columns, next_cursor, facets, total, echoed)
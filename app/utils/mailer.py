@@ -1,8 +1,6 @@
 
 from __future__ import annotations
 
-import smtplib
-from email.message import EmailMessage
 from flask import current_app
 
 def send_email(to_email: str, subject: str, body: str) -> None:
@@ -18,6 +16,10 @@ def send_email(to_email: str, subject: str, body: str) -> None:
         current_app.logger.info("SMTP not configured; skipping email.")
         return
 
+    # Deferred: most requests never send mail
+    import smtplib
+    from email.message import EmailMessage
+
     # Sanitize subject to prevent header injection
     subject = subject.replace("\r", "").replace("\n", " ").strip()[:200]
 
@@ -0,0 +1,92 @@
+"""Tiny in-process metrics: named latency histograms and counters.
+
+Per worker, lock-protected, no external dependencies. Values are in
+milliseconds; buckets are upper bounds. ``snapshot()`` returns plain
+dicts for the admin metrics endpoint.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_lock = threading.Lock()
+_histograms: dict[str, "Histogram"] = {}
+_counters: dict[str, int] = {}
+
+
+class Histogram:
+    """Fixed-bucket histogram with count/sum/max and bucket-based percentiles."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        i = bisect.bisect_left(self.buckets, value_ms)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.total += value_ms
+            if value_ms > self.max:
+                self.max = value_ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0 < q <= 1)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return float(self.buckets[i]) if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum_ms": round(self.total, 3),
+                "max_ms": round(self.max, 3),
+                "p50_ms": self.percentile(0.50),
+                "p95_ms": self.percentile(0.95),
+                "p99_ms": self.percentile(0.99),
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+            }
+
+
+def histogram(name: str) -> Histogram:
+    h = _histograms.get(name)
+    if h is None:
+        with _lock:
+            h = _histograms.setdefault(name, Histogram())
+    return h
+
+
+def observe(name: str, value_ms: float) -> None:
+    histogram(name).observe(value_ms)
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def snapshot() -> dict:
+    with _lock:
+        names = sorted(_histograms)
+        counters = dict(sorted(_counters.items()))
+    return {"histograms": {n: _histograms[n].snapshot() for n in names}, "counters": counters}
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
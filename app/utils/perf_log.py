@@ -0,0 +1,224 @@
+"""Slow-query and slow-request log (``perf_events``).
+
+Cursor executes are timed with engine events, and requests are timed
+from ``before_request`` to teardown. A statement slower than
+``PERF_SLOW_QUERY_MS`` or a request slower than ``PERF_SLOW_REQUEST_MS``
+becomes one compact row with:
+
+* the endpoint;
+* the duration;
+* for a statement, its normalized SQL (literals folded, as in
+  query_counter) and the *types* of its parameters, never their values;
+* for a request, its route pattern (``/auth/confirm/<token>``), never
+  the concrete path, which can carry tokens.
+
+Request threads only put events on a bounded in-memory queue; when the
+queue is full, events are dropped and counted. A per-worker thread writes
+them every ``PERF_LOG_FLUSH_INTERVAL`` seconds with one executemany
+INSERT and prunes rows older than ``PERF_LOG_RETENTION_DAYS`` once an
+hour. The thread starts on first use and again after a fork. With
+``PERF_LOG_BACKGROUND=0`` (tests) events are written at request teardown
+instead. /admin/perf lists the events and a daily top-N summary.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import delete, event, insert
+
+from . import metrics
+from .health import register_queue
+from .query_counter import normalize
+
+log = logging.getLogger(__name__)
+
+PRUNE_EVERY_SECONDS = 3600
+
+
+def _param_types(parameters, executemany: bool) -> str | None:
+    """Parameter shapes for the log: ``(int, str)`` or ``50 × (int, str)``."""
+    if not parameters:
+        return None
+    rows = len(parameters) if executemany else 1
+    first = parameters[0] if executemany else parameters
+    values = first.values() if isinstance(first, dict) else first
+    try:
+        shape = "(" + ", ".join(type(v).__name__ for v in values) + ")"
+    except TypeError:
+        shape = type(first).__name__
+    return (f"{rows} × {shape}" if executemany else shape)[:200]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class PerfLog:
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.slow_query_ms = float(app.config.get("PERF_SLOW_QUERY_MS", 100))
+        self.slow_request_ms = float(app.config.get("PERF_SLOW_REQUEST_MS", 1000))
+        self.background = bool(app.config.get("PERF_LOG_BACKGROUND", True))
+        self.flush_interval = float(app.config.get("PERF_LOG_FLUSH_INTERVAL", 2))
+        self.max_queue = int(app.config.get("PERF_LOG_MAX_QUEUE", 10_000))
+        self.retention = timedelta(days=float(app.config.get("PERF_LOG_RETENTION_DAYS", 14)))
+        self.engine = None
+        self._queue: queue.Queue = queue.Queue(self.max_queue)
+        self._writing = threading.local()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread: threading.Thread | None = None
+        self._pruned_at: float | None = None
+
+    def start(self) -> None:
+        """Worker start: run the flusher now instead of on the first slow event."""
+        if self.background:
+            self._ensure_thread()
+
+    # ── recording ──
+    def record(self, kind: str, duration_ms: float, statement: str | None = None, params: str | None = None,
+               endpoint: str | None = None, method: str | None = None, status_code: int | None = None) -> None:
+        if has_request_context():
+            endpoint = endpoint or request.endpoint
+            method = method or request.method
+        row = {
+            "created_at": _utcnow(), "kind": kind, "endpoint": (endpoint or threading.current_thread().name)[:120],
+            "method": method, "status_code": status_code, "duration_ms": round(duration_ms, 3),
+            "statement": statement, "params": params,
+        }
+        if self.background:
+            self._ensure_thread()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            metrics.incr("perf_log.dropped")
+            return
+        metrics.incr(f"perf_log.slow_{kind}")
+
+    def _before_execute(self, _conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+        if context is not None:
+            context._perf_t0 = time.perf_counter()
+
+    def _after_execute(self, _conn, _cursor, statement, parameters, context, executemany) -> None:
+        t0 = getattr(context, "_perf_t0", None)
+        if t0 is None or getattr(self._writing, "active", False):
+            return
+        elapsed = (time.perf_counter() - t0) * 1000
+        if elapsed >= self.slow_query_ms:
+            self.record("query", elapsed, statement=normalize(statement)[:4000],
+                        params=_param_types(parameters, executemany))
+
+    def _start_request(self) -> None:
+        g.perf_t0 = time.perf_counter()
+
+    def _note_status(self, response):
+        g.perf_status = response.status_code
+        return response
+
+    def _end_request(self, _exc) -> None:
+        t0 = g.pop("perf_t0", None)
+        if t0 is not None:
+            elapsed = (time.perf_counter() - t0) * 1000
+            if elapsed >= self.slow_request_ms:
+                route = request.url_rule.rule if request.url_rule is not None else request.endpoint
+                self.record("request", elapsed, statement=(route or "")[:500] or None,
+                            status_code=g.get("perf_status", 500 if _exc else None))
+        if not self.background and not self._queue.empty():
+            self.flush()
+
+    # ── writing ──
+    def depth(self) -> int:
+        return self._queue.qsize() if self._pid in (None, os.getpid()) else 0
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows written."""
+        from ..models import PerfEvent
+
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        now = time.monotonic()
+        prune = self._pruned_at is None or now - self._pruned_at >= PRUNE_EVERY_SECONDS
+        if not rows and not prune:
+            return 0
+        self._writing.active = True  # our own INSERT/DELETE must not log themselves
+        try:
+            with self.engine.begin() as conn:
+                if rows:
+                    conn.execute(insert(PerfEvent.__table__), rows)
+                if prune:
+                    conn.execute(delete(PerfEvent.__table__).where(PerfEvent.created_at < _utcnow() - self.retention))
+                    self._pruned_at = now
+        except Exception as e:
+            metrics.incr("perf_log.write_errors")
+            log.warning("Perf log flush failed (%d events lost): %s", len(rows), e)
+            return 0
+        finally:
+            self._writing.active = False
+        return len(rows)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def _ensure_thread(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != pid or self._thread is None or not self._thread.is_alive():
+                if self._pid != pid:
+                    self._queue = queue.Queue(self.max_queue)  # don't inherit the parent's backlog
+                self._pid = pid
+                self._thread = threading.Thread(target=self._run, name="perf-log", daemon=True)
+                self._thread.start()
+
+
+def init_perf_log(app: Flask) -> PerfLog | None:
+    """Time statements and requests when PERF_LOG_ENABLED (the default)."""
+    from ..extensions import db
+
+    if not app.config.get("PERF_LOG_ENABLED", True):
+        return None
+    perf = PerfLog(app)
+    with app.app_context():
+        perf.engine = db.engine
+    event.listen(perf.engine, "before_cursor_execute", perf._before_execute)
+    event.listen(perf.engine, "after_cursor_execute", perf._after_execute)
+    app.before_request(perf._start_request)
+    app.after_request(perf._note_status)
+    app.teardown_request(perf._end_request)
+    app.extensions["perf_log"] = perf
+    register_queue(app, "perf_log", perf.depth)
+    return perf
+
+
+def daily_summary(day: datetime, top: int = 20, kind: str | None = None) -> list[dict]:
+    """The ``top`` statements/requests of one day by total time spent."""
+    from ..extensions import db
+    from ..models import PerfEvent
+
+    total = db.func.sum(PerfEvent.duration_ms)
+    q = (
+        db.session.query(
+            PerfEvent.kind, PerfEvent.endpoint, PerfEvent.statement,
+            db.func.count().label("count"), total.label("total_ms"),
+            db.func.avg(PerfEvent.duration_ms).label("avg_ms"), db.func.max(PerfEvent.duration_ms).label("max_ms"),
+        )
+        .filter(PerfEvent.created_at >= day, PerfEvent.created_at < day + timedelta(days=1))
+    )
+    if kind:
+        q = q.filter(PerfEvent.kind == kind)
+    q = q.group_by(PerfEvent.kind, PerfEvent.endpoint, PerfEvent.statement).order_by(total.desc()).limit(top)
+    return [row._asdict() for row in q]
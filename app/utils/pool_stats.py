@@ -0,0 +1,70 @@
+"""Connection-pool telemetry.
+
+``InstrumentedQueuePool`` is a drop-in ``QueuePool`` that records how long
+each checkout waited (``db.pool.checkout_wait_ms``), checkouts served from
+overflow, pool timeouts, new connections and invalidations into
+:mod:`app.utils.metrics`. ``pool_status()`` reports the live gauges.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+SLOW_CHECKOUT_MS = 1000
+
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            metrics.incr("db.pool.timeouts")
+            log.warning("DB pool checkout timed out (size=%s overflow=%s)", self.size(), self.overflow())
+            raise
+        waited = (time.perf_counter() - t0) * 1000
+        metrics.observe("db.pool.checkout_wait_ms", waited)
+        metrics.incr("db.pool.checkouts")
+        if self.overflow() > 0:
+            metrics.incr("db.pool.overflow_checkouts")
+        if waited > SLOW_CHECKOUT_MS:
+            log.warning("DB pool checkout waited %.0f ms", waited)
+        return conn
+
+
+@event.listens_for(InstrumentedQueuePool, "connect")
+def _on_connect(_dbapi_conn, _record) -> None:
+    metrics.incr("db.pool.connects")
+
+
+@event.listens_for(InstrumentedQueuePool, "invalidate")
+def _on_invalidate(_dbapi_conn, _record, _exc) -> None:
+    metrics.incr("db.pool.invalidations")
+
+
+@event.listens_for(InstrumentedQueuePool, "soft_invalidate")
+def _on_soft_invalidate(_dbapi_conn, _record, _exc) -> None:
+    metrics.incr("db.pool.soft_invalidations")
+
+
+def pool_status(engine) -> dict:
+    """Live pool gauges for one engine."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+    }
@@ -0,0 +1,86 @@
+"""Support for gunicorn's ``preload_app`` (see gunicorn.conf.py).
+
+With preloading, the master builds the app once and forks workers that
+share its memory copy-on-write. For that to pay off and stay safe:
+
+* :func:`warm_shared_state` runs in the master before forking. It
+  compiles every Jinja template, loads the web manifest and, when
+  ``SITE_URL`` is set, builds the sitemap, so workers inherit them
+  instead of each building its own copy. Without ``SITE_URL`` the sitemap
+  is built per worker, per request host.
+* :func:`after_fork` runs in each worker. It drops the database
+  connections inherited from the master without closing them (the master
+  and siblings share those sockets), then :func:`start_background`
+  starts the worker's own loops: the Stripe event processor, perf log
+  flusher and health prober. Otherwise they would wait for first use, and
+  events stored before a restart would wait for new traffic. They also
+  restart lazily whenever the pid changes; the SQLite writer only starts
+  on its first write.
+* :func:`before_exit` runs as a worker exits (``max_requests`` recycling
+  included) and drains the SQLite writer's queue.
+"""
+
+from __future__ import annotations
+
+import gc
+
+from flask import Flask
+
+# app.extensions entries with a per-worker start()
+BACKGROUND_WORKERS = ("stripe_events", "perf_log", "health_prober")
+
+
+def warm_shared_state(app: Flask) -> dict:
+    """Precompute read-only state in the master; returns what was warmed."""
+    from ..blueprints.public import manifest_bytes, sitemap_xml
+
+    env = app.jinja_env
+    names = [n for n in env.list_templates() if n.endswith((".html", ".xml", ".txt"))]
+    if env.cache is not None and getattr(env.cache, "capacity", len(names)) < len(names):
+        env.cache = type(env.cache)(len(names) + 50)  # keep every compiled template resident
+    for name in names:
+        try:
+            env.get_template(name)
+        except Exception as e:  # an unused broken template must not stop the deploy
+            app.logger.warning(f"Template {name} not precompiled: {e}")
+
+    manifest_bytes(app.static_folder)
+    base = app.config.get("SITE_URL") or ""
+    if base:
+        sitemap_xml(base)
+    return {"templates": len(names), "sitemap_base": base or None}
+
+
+def freeze() -> None:
+    """Move everything allocated so far out of the GC's reach, so collections
+    in workers don't write to (and un-share) the master's pages."""
+    gc.collect()
+    gc.freeze()
+
+
+def after_fork(app: Flask) -> None:
+    """Per-worker reset after fork: forget inherited pooled connections, start the worker's loops."""
+    from ..extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    replica = app.extensions.get("db_replica")
+    if replica is not None:
+        replica.engine.dispose(close=False)
+    start_background(app)
+
+
+def start_background(app: Flask) -> None:
+    """Start this worker's background loops (each is a no-op when configured off)."""
+    for name in BACKGROUND_WORKERS:
+        worker = app.extensions.get(name)
+        if worker is not None:
+            worker.start()
+
+
+def before_exit(app: Flask) -> None:
+    """Worker exit (recycled or shut down): write out what the SQLite writer still holds."""
+    writer = app.extensions.get("sqlite_writer")
+    if writer is not None:
+        writer.stop()
@@ -0,0 +1,260 @@
+"""On-demand sampling profiler for live requests.
+
+An admin switches profiling on from /admin/profiles for a set of
+endpoints, a sample rate and a time limit. The switch is a small JSON file
+in ``PROFILE_DIR`` so every gunicorn worker sees it. While it is on, a
+sampled request gets a :class:`StackSampler`: a thread that reads the
+request thread's stack every ``PROFILE_INTERVAL_MS`` through
+``sys._current_frames()``. It adds no tracing hooks, so the profiled code
+runs at full speed. At teardown the folded stacks are written as a
+``.collapsed`` file (Brendan Gregg's format, one ``a;b;c count`` per line).
+flamegraph.pl and speedscope read that format, and the admin page can
+also convert a profile to speedscope JSON.
+
+When profiling is off, each request costs a monotonic-clock comparison.
+The control file is re-checked at most once a second.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from flask import Flask, current_app, g, request
+
+from . import metrics
+
+CONTROL_FILE = "control.json"
+# 20261019T115001Z~admin.activity_log~123ms~4242~a1b2.collapsed
+_NAME_RE = re.compile(r"^(\d{8}T\d{6}Z)~([\w.\-]+)~(\d+)ms~(\d+)~([0-9a-f]{4})\.collapsed$")
+_SKIP_ENDPOINTS = ("static",)
+_RECHECK_SECONDS = 1.0
+
+
+def _short_path(path: str) -> str:
+    for marker in ("site-packages", "app"):
+        key = f"{os.sep}{marker}{os.sep}"
+        if key in path:
+            tail = path.rsplit(key, 1)[1]
+            return tail if marker == "site-packages" else f"app/{tail}"
+    return os.path.basename(path)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse(frame) -> str:
+    """Root-first ``a;b;c`` for a frame and its callers."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Samples one thread's stack on a timer until stopped."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse(frame)] += 1
+            del frame  # don't keep the request's frames alive between samples
+
+
+def to_speedscope(collapsed: str, name: str, interval_ms: float) -> dict:
+    """Convert collapsed stacks to a speedscope "sampled" profile."""
+    frames: list[dict] = []
+    index: dict[str, int] = {}
+    samples, weights = [], []
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if not stack or not count.isdigit():
+            continue
+        ids = []
+        for label in stack.split(";"):
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            ids.append(index[label])
+        samples.append(ids)
+        weights.append(int(count) * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "app.utils.profiler",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": name, "unit": "milliseconds",
+            "startValue": 0, "endValue": sum(weights), "samples": samples, "weights": weights,
+        }],
+    }
+
+
+class Profiler:
+    """Profiling switch, per-request hooks and the on-disk profile store."""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._state: dict | None = None
+        self._checked = 0.0
+        self._mtime: float | None = None
+
+    @property
+    def directory(self) -> str:
+        return self.app.config["PROFILE_DIR"]
+
+    # ── switch ──
+    def state(self) -> dict | None:
+        """The active settings, or None when profiling is off or expired."""
+        now = time.monotonic()
+        if now - self._checked >= _RECHECK_SECONDS:
+            self._checked = now
+            self._reload()
+        state = self._state
+        if state is not None and state["until"] <= time.time():
+            return None
+        return state
+
+    def _reload(self) -> None:
+        path = os.path.join(self.directory, CONTROL_FILE)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._state, self._mtime = None, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(path) as f:
+                self._state = json.load(f)
+            self._mtime = mtime
+        except (OSError, ValueError):
+            self._state = None
+
+    def enable(self, endpoints: list[str], rate: float, minutes: float, by: str) -> dict:
+        state = {"endpoints": sorted(set(endpoints)), "rate": min(max(rate, 0.0), 1.0),
+                 "until": time.time() + minutes * 60, "by": by}
+        self._write_control(state)
+        return state
+
+    def disable(self) -> None:
+        try:
+            os.remove(os.path.join(self.directory, CONTROL_FILE))
+        except FileNotFoundError:
+            pass
+        self._checked = 0.0
+
+    def _write_control(self, state: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, CONTROL_FILE)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)  # workers never read a half-written file
+        self._checked = 0.0
+
+    # ── store ──
+    def save(self, samples: Counter, endpoint: str, duration_ms: float) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        name = f"{stamp}~{endpoint}~{int(duration_ms)}ms~{os.getpid()}~{random.getrandbits(16):04x}.collapsed"
+        with open(os.path.join(self.directory, name), "w") as f:
+            f.writelines(f"{stack} {n}\n" for stack, n in samples.most_common())
+        self._prune()
+        return name
+
+    def _prune(self) -> None:
+        keep = int(self.app.config.get("PROFILE_KEEP", 200))
+        for name in [p["name"] for p in self.profiles()][keep:]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def profiles(self) -> list[dict]:
+        """Stored profiles, newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        out = []
+        for name in names:
+            m = _NAME_RE.match(name)
+            if m:
+                out.append({
+                    "name": name, "endpoint": m.group(2), "duration_ms": int(m.group(3)), "pid": int(m.group(4)),
+                    "created_at": datetime.strptime(m.group(1), "%Y%m%dT%H%M%SZ"),
+                })
+        out.sort(key=lambda p: p["name"], reverse=True)
+        return out
+
+    def read(self, name: str) -> str | None:
+        if not _NAME_RE.match(name):
+            return None  # also rules out path traversal
+        try:
+            with open(os.path.join(self.directory, name)) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    # ── request hooks ──
+    def before_request(self) -> None:
+        state = self.state()
+        if state is None:
+            return
+        endpoint = request.endpoint or ""
+        if not endpoint or endpoint in _SKIP_ENDPOINTS or endpoint.startswith("admin.profile"):
+            return
+        if state["endpoints"] and endpoint not in state["endpoints"]:
+            return
+        if random.random() >= state["rate"]:
+            return
+        interval = float(self.app.config.get("PROFILE_INTERVAL_MS", 5)) / 1000
+        g.profile = (StackSampler(threading.get_ident(), interval).start(), time.perf_counter(), endpoint)
+
+    def teardown_request(self, _exc) -> None:
+        active = g.pop("profile", None)
+        if active is None:
+            return
+        sampler, t0, endpoint = active
+        samples = sampler.stop()
+        if samples:
+            try:
+                self.save(samples, endpoint, (time.perf_counter() - t0) * 1000)
+                metrics.incr("profiler.profiles_saved")
+            except OSError as e:
+                current_app.logger.warning(f"Profile not saved: {e}")
+
+
+def init_profiler(app: Flask) -> Profiler:
+    profiler = Profiler(app)
+    app.extensions["profiler"] = profiler
+    app.before_request(profiler.before_request)
+    app.teardown_request(profiler.teardown_request)
+    return profiler
@@ -0,0 +1,144 @@
+"""Per-request SQL statement counting and N+1 detection (debug/testing).
+
+With ``QUERY_COUNTER=1`` (or in debug mode) every request records the
+statements it runs. The response carries ``X-Query-Count``, and when one
+normalized statement repeats ``QUERY_N1_THRESHOLD`` times or more (the same
+SELECT with only the bound values changing, as a lazy-loaded
+relationship in a template loop produces) the request is logged as a
+suspected N+1 and counted in ``db.n_plus_one_suspected``.
+
+Tests can hold an endpoint to a budget whether or not the per-request
+mode is on:
+
+    with assert_max_queries(6):
+        admin_client.get("/admin/activity-log")
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from flask import Flask, g
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+_active: ContextVar[tuple["QueryLog", ...]] = ContextVar("query_logs", default=())
+_listening = False
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Statement text with literals and IN-lists folded, for grouping."""
+    text = _STRING.sub("?", statement)
+    text = _NUMBER.sub("?", text)
+    text = _PARAM_LIST.sub("(?)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+class QueryLog:
+    """Statements seen while this log is active."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def groups(self) -> Counter:
+        return Counter(normalize(s) for s in self.statements)
+
+    def suspects(self, threshold: int) -> list[tuple[str, int]]:
+        """Normalized statements that ran at least ``threshold`` times, most frequent first."""
+        return [(sql, n) for sql, n in self.groups().most_common() if n >= threshold]
+
+    def report(self) -> str:
+        return "\n".join(f"{n:>4} × {sql}" for sql, n in self.groups().most_common())
+
+
+def _on_execute(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+    for qlog in _active.get():
+        qlog.statements.append(statement)
+
+
+def _listen() -> None:
+    global _listening
+    if not _listening:
+        # On the Engine class, so the primary, the replica and test engines are all covered
+        event.listen(Engine, "before_cursor_execute", _on_execute)
+        _listening = True
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryLog]:
+    """Collect the statements run inside the block (this thread/context only)."""
+    _listen()
+    qlog = QueryLog()
+    token = _active.set(_active.get() + (qlog,))
+    try:
+        yield qlog
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryLog]:
+    """Fail with the grouped statements if the block runs more than ``limit`` queries."""
+    with count_queries() as qlog:
+        yield qlog
+    if qlog.count > limit:
+        raise AssertionError(f"{qlog.count} queries executed, expected at most {limit}:\n{qlog.report()}")
+
+
+def init_query_counter(app: Flask) -> None:
+    """Count statements per request when QUERY_COUNTER is on (or the app is in debug mode)."""
+    if not (app.config.get("QUERY_COUNTER") or app.debug):
+        return
+    _listen()
+    threshold = int(app.config.get("QUERY_N1_THRESHOLD", 5))
+
+    @app.before_request
+    def _start_query_log():
+        g.query_log = QueryLog()
+        g.query_log_token = _active.set(_active.get() + (g.query_log,))
+
+    @app.after_request
+    def _query_count_header(response):
+        qlog = g.get("query_log")
+        if qlog is None:
+            return response
+        response.headers["X-Query-Count"] = str(qlog.count)
+        suspects = qlog.suspects(threshold)
+        if suspects:
+            from flask import request
+
+            metrics.incr("db.n_plus_one_suspected")
+            response.headers["X-Query-N1"] = str(len(suspects))
+            log.warning("Suspected N+1 on %s %s (%d queries): %s", request.method, request.path, qlog.count,
+                        "; ".join(f"{n}× {sql[:200]}" for sql, n in suspects))
+        return response
+
+    @app.teardown_request
+    def _stop_query_log(_exc):
+        token = g.pop("query_log_token", None)
+        if token is not None:
+            try:
+                _active.reset(token)
+            except ValueError:  # teardown ran in a different context than before_request
+                _active.set(())
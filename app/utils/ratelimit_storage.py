@@ -0,0 +1,150 @@
+"""Rate-limit counters shared by every gunicorn worker on the host.
+
+``memory://`` keeps one set of counters per worker, so with N workers each
+limit is effectively N times looser and resets on every restart. This
+registers a ``sqlite://`` storage scheme for flask-limiter / ``limits``:
+a small WAL-mode SQLite file updated with one atomic upsert per hit, so
+all workers see the same counts without running Redis or memcached.
+
+    RATELIMIT_STORAGE_URI=sqlite:////var/data/ratelimit.db
+
+Supports the default fixed-window strategy. Expired windows are deleted
+at most every ``cleanup_interval`` seconds by whichever worker notices.
+Connections are per thread and reopened after a fork.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import closing
+
+from limits.storage import Storage
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS counters ("
+    " key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires REAL NOT NULL"
+    ") WITHOUT ROWID"
+)
+
+# A window that has expired restarts at `amount`; otherwise the counter grows.
+_INCR = (
+    "INSERT INTO counters (key, value, expires) VALUES (?1, ?2, ?3) "
+    "ON CONFLICT(key) DO UPDATE SET "
+    " value = CASE WHEN counters.expires <= ?4 THEN excluded.value ELSE counters.value + excluded.value END,"
+    " expires = CASE WHEN counters.expires <= ?4 THEN excluded.expires ELSE counters.expires END"
+)
+
+
+
+class _Connection(sqlite3.Connection):
+    """Weak-referenceable, so open connections can be tracked across fork()."""
+
+
+# A forked child must never close a connection it inherited: SQLite's POSIX
+# locks are per process, and closing any descriptor of the file drops the
+# locks the child's own connection holds, silently breaking atomicity.
+_open_connections: weakref.WeakSet = weakref.WeakSet()
+_inherited: list = []
+
+
+def _keep_inherited_connections() -> None:
+    _inherited.extend(_open_connections)
+
+
+os.register_at_fork(after_in_child=_keep_inherited_connections)
+
+
+class SQLiteStorage(Storage):
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, cleanup_interval: float = 60,
+                 busy_timeout: float = 5, **options) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = uri.split("://", 1)[1]
+        self.path = path[1:] if path.startswith("/") else path  # sqlite:///rel, sqlite:////abs
+        self.cleanup_interval = float(cleanup_interval)
+        self.busy_timeout = float(busy_timeout)
+        self._local = threading.local()
+        self._next_cleanup = 0.0
+        self._returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Created on a throwaway connection so the process that builds the app
+        # (a preloading gunicorn master) holds nothing open when it forks.
+        with closing(self._connect()) as conn:
+            conn.execute(_SCHEMA)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != pid:
+            conn = self._connect()
+            _open_connections.add(conn)
+            self._local.conn, self._local.pid = conn, pid
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                               check_same_thread=False, factory=_Connection)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # counters survive a crash of the app, not of the host
+        return conn
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        now = time.time()
+        conn = self._conn()
+        params = (key, amount, now + expiry, now)
+        if self._returning:
+            # fetchall() steps the statement to completion, which is what commits it.
+            value = conn.execute(_INCR + " RETURNING value", params).fetchall()[0][0]
+        else:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(_INCR, params)
+                value = conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()[0]
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if now >= self._next_cleanup:
+            self._next_cleanup = now + self.cleanup_interval
+            self.cleanup(now)
+        return value
+
+    def get(self, key: str) -> int:
+        row = self._conn().execute(
+            "SELECT value FROM counters WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._conn().execute(
+            "SELECT expires FROM counters WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def cleanup(self, now: float | None = None) -> int:
+        """Delete expired windows; returns how many were removed."""
+        cur = self._conn().execute("DELETE FROM counters WHERE expires <= ?", (now or time.time(),))
+        return cur.rowcount
+
+    def check(self) -> bool:
+        try:
+            self._conn().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        return self._conn().execute("DELETE FROM counters").rowcount
+
+    def clear(self, key: str) -> None:
+        self._conn().execute("DELETE FROM counters WHERE key = ?", (key,))
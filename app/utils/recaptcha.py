@@ -0,0 +1,144 @@
+"""reCAPTCHA verification over a pooled, keep-alive HTTP session.
+
+Every protected form submit used to open a fresh TCP + TLS connection to
+Google inside the request thread. Verification now goes through one
+``requests.Session`` per worker process with strict connect/read timeouts.
+
+Tokens that verified successfully are remembered for
+``RECAPTCHA_CACHE_TTL`` seconds (Google's tokens are single-use, so a form
+re-rendered for an unrelated validation error would otherwise fail its
+second check). The entry is scoped to one browser session and form, and
+:func:`forget` drops it once the submission is saved, so a solved token
+can't be replayed on another form or resubmitted. After ``RECAPTCHA_BREAKER_FAILURES`` consecutive errors or
+timeouts the circuit opens for ``RECAPTCHA_BREAKER_COOLDOWN`` seconds and
+checks are answered by policy instead of waiting on the verifier:
+``RECAPTCHA_FAIL_OPEN=1`` accepts submissions, the default rejects them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+
+from flask import current_app
+
+from . import metrics
+
+MAX_ENTRIES = 4096
+
+_lock = threading.Lock()
+_verified: dict[str, float] = {}
+_session = None
+_session_pid = None
+
+
+class _Breaker:
+    """Consecutive-failure circuit breaker; half-opens after the cooldown."""
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self, now: float) -> bool:
+        return now >= self.open_until
+
+    def record(self, ok: bool, threshold: int, cooldown: float, now: float) -> None:
+        with self._lock:
+            if ok:
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.failures >= threshold:  # stays tripped, so one failure while half-open reopens it
+                self.open_until = now + cooldown
+                metrics.incr("recaptcha.breaker_opened")
+
+    def reset(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+
+
+breaker = _Breaker()
+
+
+def _get_session():
+    """The worker's pooled session, recreated after a fork."""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        import requests  # deferred: only needed when reCAPTCHA is configured
+        from requests.adapters import HTTPAdapter
+
+        with _lock:
+            if _session is None or _session_pid != pid:
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+                session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+                _session, _session_pid = session, pid
+    return _session
+
+
+def _token_key(token: str, scope: str) -> str:
+    return hashlib.sha256(f"{scope}\0{token}".encode()).hexdigest()
+
+
+def _remember(key: str, ttl: float, now: float) -> None:
+    with _lock:
+        if len(_verified) >= MAX_ENTRIES:
+            for k in [k for k, exp in _verified.items() if exp <= now] or [next(iter(_verified))]:
+                _verified.pop(k, None)
+        _verified[key] = now + ttl
+
+
+def verify(token: str, scope: str = "") -> bool:
+    """True if Google accepts ``token`` (or recently did for this ``scope``), per the breaker policy otherwise."""
+    cfg = current_app.config
+    now = time.monotonic()
+    key = _token_key(token, scope)
+    with _lock:
+        expires = _verified.get(key)
+    if expires and expires > now:
+        metrics.incr("recaptcha.cache_hit")
+        return True
+
+    if not breaker.allow(now):
+        metrics.incr("recaptcha.short_circuit")
+        return bool(cfg.get("RECAPTCHA_FAIL_OPEN"))
+
+    t0 = time.perf_counter()
+    try:
+        r = _get_session().post(
+            cfg["RECAPTCHA_VERIFY_URL"],
+            data={"secret": cfg["RECAPTCHA_SECRET_KEY"], "response": token},
+            timeout=(cfg["RECAPTCHA_CONNECT_TIMEOUT"], cfg["RECAPTCHA_READ_TIMEOUT"]),
+        )
+        r.raise_for_status()
+        success = bool(r.json().get("success"))
+    except Exception as e:
+        current_app.logger.warning(f"reCAPTCHA verification failed: {e}")
+        metrics.incr("recaptcha.error")
+        breaker.record(False, int(cfg["RECAPTCHA_BREAKER_FAILURES"]), float(cfg["RECAPTCHA_BREAKER_COOLDOWN"]), now)
+        return bool(cfg.get("RECAPTCHA_FAIL_OPEN"))
+    finally:
+        metrics.observe("recaptcha.verify", (time.perf_counter() - t0) * 1000)
+
+    breaker.record(True, 0, 0, now)
+    if success:
+        _remember(key, float(cfg["RECAPTCHA_CACHE_TTL"]), now)
+    return success
+
+
+def forget(token: str, scope: str = "") -> None:
+    """Drop a verified token once its form was accepted; the next use must verify again."""
+    with _lock:
+        _verified.pop(_token_key(token, scope), None)
+
+
+def reset() -> None:
+    """Forget cached tokens and close the circuit (tests, config changes)."""
+    with _lock:
+        _verified.clear()
+    breaker.reset()
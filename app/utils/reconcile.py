@@ -0,0 +1,134 @@
+"""Reconcile pending deposits against Stripe.
+
+A deposit only leaves "pending" when the payer's browser reaches the
+success page or the webhook arrives. If both are missed the row stays
+pending forever, so ``flask reconcile-deposits`` (run on a schedule)
+pages through pending deposits older than a grace period, looks each
+Checkout Session up with bounded concurrency over the pooled client, and
+applies what it finds with one executemany UPDATE per batch.
+
+Only paid and expired sessions change anything; open sessions and lookup
+errors are left for the next run and listed in the report. Rows the
+guarded UPDATE actually changed (a webhook may have settled some first)
+are logged, and newly paid ones get the same admin and payer emails as
+the success page, which these payers never reached.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, select
+
+from ..extensions import db
+from ..models import DepositPayment, _utcnow
+
+PAID_STATUSES = ("paid", "no_payment_required")
+
+
+def session_outcome(session) -> tuple[str, str | None]:
+    """(deposit status, payment intent) implied by a Checkout Session."""
+    if session["status"] == "complete" and session["payment_status"] in PAID_STATUSES:
+        return "paid", session.get("payment_intent")
+    if session["status"] == "expired":
+        return "expired", None
+    return "pending", None
+
+
+class DepositReconciler:
+    def __init__(self, client, batch: int = 100, concurrency: int = 4, older_than: timedelta = timedelta(minutes=30)) -> None:
+        self.client = client
+        self.batch = batch
+        self.concurrency = concurrency
+        self.older_than = older_than
+
+    def _lookup(self, row) -> dict:
+        try:
+            session = self.client.checkout.sessions.retrieve(row.stripe_session_id)
+        except Exception as e:
+            return {"id": row.id, "error": f"{type(e).__name__}: {e}"[:300]}
+        status, intent = session_outcome(session)
+        return {"id": row.id, "status": status, "payment_intent": intent}
+
+    def _apply(self, changes: list[dict]) -> int:
+        if not changes:
+            return 0
+        table = DepositPayment.__table__
+        stmt = (
+            table.update()
+            .where(table.c.id == bindparam("b_id"), table.c.status == "pending")  # a webhook may have won the race
+            .values(
+                status=bindparam("b_status"),
+                stripe_payment_intent=db.func.coalesce(table.c.stripe_payment_intent, bindparam("b_intent")),
+                updated_at=bindparam("b_now"),
+            )
+        )
+        now = _utcnow()
+        db.session.execute(stmt, [
+            {"b_id": c["id"], "b_status": c["status"], "b_intent": c["payment_intent"], "b_now": now} for c in changes
+        ])
+        # An executemany UPDATE has no portable RETURNING; this run's timestamp marks the rows it changed,
+        # read back inside the same transaction while they are still locked.
+        changed = db.session.execute(
+            select(DepositPayment.id, DepositPayment.status, DepositPayment.full_name, DepositPayment.email,
+                   DepositPayment.phone, DepositPayment.amount_cents)
+            .where(DepositPayment.id.in_([c["id"] for c in changes]), DepositPayment.updated_at == now)
+        ).all()
+        db.session.commit()
+        if not changed:
+            return 0
+
+        from . import log_activity_bulk
+        from .checkout import send_deposit_paid_emails
+        from .dashboard_stats import invalidate_dashboard_counts
+
+        invalidate_dashboard_counts()
+        log_activity_bulk([
+            {"action": f"deposit_{p.status}", "details": "Reconciled with Stripe checkout session",
+             "resource_type": "deposit", "resource_id": p.id}
+            for p in changed
+        ], category="payment")
+        for payment in changed:
+            if payment.status == "paid":
+                send_deposit_paid_emails(payment)
+        return len(changed)
+
+    def run(self) -> dict:
+        """Reconcile every eligible pending deposit; returns the summary report."""
+        started = time.perf_counter()
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - self.older_than
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "checked": 0, "paid": 0, "expired": 0, "still_pending": 0, "updated": 0,
+            "changes": [], "errors": [],
+        }
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="reconcile") as pool:
+            while True:
+                rows = db.session.execute(
+                    select(DepositPayment.id, DepositPayment.stripe_session_id)
+                    .where(DepositPayment.status == "pending", DepositPayment.stripe_session_id.is_not(None),
+                           DepositPayment.created_at < cutoff, DepositPayment.id > last_id)
+                    .order_by(DepositPayment.id)
+                    .limit(self.batch)
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                results = list(pool.map(self._lookup, rows))
+                changes = []
+                for r in results:
+                    if "error" in r:
+                        report["errors"].append(r)
+                    elif r["status"] == "pending":
+                        report["still_pending"] += 1
+                    else:
+                        report[r["status"]] += 1
+                        changes.append(r)
+                report["checked"] += len(rows)
+                report["updated"] += self._apply(changes)
+                report["changes"].extend(changes)
+        report["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return report
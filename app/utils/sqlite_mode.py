@@ -0,0 +1,159 @@
+"""SQLite production mode for small single-node deployments.
+
+When the app runs on a SQLite file (no DATABASE_URL), every pooled
+connection gets WAL journaling and tuned pragmas via an engine ``connect``
+event. Readers never block behind a writer in WAL mode.
+
+Only the highest-volume write, activity logging, goes through one writer
+thread per worker. Request threads hand those rows off instead of each
+taking the write lock for them. Everything else still commits directly
+and waits on ``busy_timeout`` when the lock is taken: form and admin
+writes, the perf-log flusher and the Stripe processor. So does each
+worker's writer thread, since gunicorn workers are separate processes.
+This narrows lock contention; it does not remove it.
+
+The writer thread starts lazily on first use and is re-created after a
+fork, so it is safe under a preloading gunicorn master. Queued rows live
+in memory: gunicorn's ``worker_exit`` hook (see prefork.before_exit)
+drains the queue when a worker is recycled or shut down. A crash still
+loses what was queued.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from flask import Flask
+from sqlalchemy import event
+
+from .health import register_queue
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def is_sqlite_file(uri: str) -> bool:
+    """True for a file-backed SQLite URI (not ``sqlite://`` / ``:memory:``)."""
+    if not uri.startswith("sqlite"):
+        return False
+    path = uri.split("///", 1)[1] if "///" in uri else ""
+    return bool(path) and not path.startswith(":memory:") and "mode=memory" not in path
+
+
+def _pragma_listener(pragmas: dict):
+    def _set_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cur.execute(f"PRAGMA {name}={value}")
+        finally:
+            cur.close()
+
+    return _set_pragmas
+
+
+class SQLiteWriter:
+    """Single background thread that applies queued writes in batches.
+
+    ``submit(fn)`` queues ``fn(connection)`` and returns a Future. Jobs are
+    drained up to ``batch_size`` at a time and run in one transaction; if a
+    batch fails, its jobs are retried one by one so a bad row only fails
+    its own Future.
+    """
+
+    def __init__(self, engine, batch_size: int = 200) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+
+    def _ensure_started(self) -> queue.Queue:
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return self._queue
+        with self._lock:
+            if self._pid != pid or self._thread is None or not self._thread.is_alive():
+                self._pid = pid
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name="sqlite-writer", daemon=True)
+                self._thread.start()
+        return self._queue
+
+    def depth(self) -> int:
+        """Jobs waiting to be written (0 when the thread hasn't started)."""
+        return self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+
+    def submit(self, fn) -> Future:
+        fut: Future = Future()
+        self._ensure_started().put((fn, fut))
+        return fut
+
+    def submit_insert(self, table, values: dict) -> Future:
+        return self.submit(lambda conn: conn.execute(table.insert(), values))
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until everything queued so far has been written."""
+        self.submit(lambda conn: None).result(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._queue.put((_STOP, None))
+            self._thread.join(timeout)
+
+    def _run(self, q: queue.Queue) -> None:
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(fn is _STOP for fn, _ in batch)
+            jobs = [(fn, fut) for fn, fut in batch if fn is not _STOP]
+            if jobs:
+                self._apply(jobs)
+            if stop:
+                return
+
+    def _apply(self, jobs) -> None:
+        try:
+            with self.engine.begin() as conn:
+                results = [fn(conn) for fn, _ in jobs]
+        except Exception:
+            for fn, fut in jobs:
+                try:
+                    with self.engine.begin() as conn:
+                        fut.set_result(fn(conn))
+                except Exception as e:
+                    log.warning("SQLite writer job failed: %s", e)
+                    fut.set_exception(e)
+            return
+        for (_, fut), result in zip(jobs, results):
+            fut.set_result(result)
+
+
+def configure_sqlite(app: Flask) -> None:
+    """Apply pragmas and set up the writer thread for file-backed SQLite."""
+    from ..extensions import db
+
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+    if not uri.startswith("sqlite") or not app.config.get("SQLITE_TUNED", True):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "connect", _pragma_listener(app.config.get("SQLITE_PRAGMAS", {})))
+
+    if is_sqlite_file(uri) and app.config.get("SQLITE_WRITE_QUEUE", True):
+        writer = SQLiteWriter(engine, batch_size=int(app.config.get("SQLITE_WRITE_BATCH", 200)))
+        app.extensions["sqlite_writer"] = writer
+        register_queue(app, "sqlite_writer", writer.depth)
+        atexit.register(writer.stop)
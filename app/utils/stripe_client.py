@@ -0,0 +1,61 @@
+"""One Stripe API client per worker process.
+
+``get_client()`` returns a ``stripe.StripeClient`` that reuses a pooled,
+keep-alive ``requests.Session`` with connect/read timeouts, instead of the
+library's module-level globals. ``STRIPE_API_BASE`` points it somewhere
+other than api.stripe.com (a local stub in tests).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+from flask import current_app
+
+_lock = threading.Lock()
+_clients: dict[tuple, object] = {}
+
+
+def get_client():
+    """The worker's client for the configured key and API base (None if Stripe isn't configured)."""
+    cfg = current_app.config
+    api_key = cfg.get("STRIPE_SECRET_KEY", "")
+    if not api_key:
+        return None
+    key = (os.getpid(), api_key, cfg["STRIPE_API_BASE"])
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                if any(k[0] != key[0] for k in _clients):
+                    _clients.clear()  # forked: sockets belong to the parent
+                client = _clients[key] = _build(api_key, cfg)
+    return client
+
+
+def _build(api_key: str, cfg):
+    import requests
+    import stripe  # deferred: only payment routes and jobs need it
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=int(cfg["STRIPE_POOL_SIZE"])))
+    session.mount("http://", HTTPAdapter(pool_maxsize=int(cfg["STRIPE_POOL_SIZE"])))
+    http_client = stripe.RequestsClient(
+        timeout=(float(cfg["STRIPE_CONNECT_TIMEOUT"]), float(cfg["STRIPE_READ_TIMEOUT"])),
+        session=session,
+    )
+    return stripe.StripeClient(
+        api_key,
+        base_addresses={"api": cfg["STRIPE_API_BASE"]},
+        max_network_retries=int(cfg["STRIPE_MAX_RETRIES"]),
+        http_client=http_client,
+    )
+
+
+def reset() -> None:
+    """Drop cached clients (tests, key rotation)."""
+    with _lock:
+        _clients.clear()
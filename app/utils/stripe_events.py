@@ -0,0 +1,240 @@
+"""Idempotent, replayable Stripe webhook processing.
+
+The webhook only verifies the signature and stores the raw event in
+``stripe_events`` (unique on the Stripe event id, so retried deliveries
+are recorded once) before answering 200. A background thread per worker
+applies pending events oldest-first. It is started when the worker starts
+(see prefork.after_fork) and again on a delivery if it is not running, and
+it sweeps every ``STRIPE_EVENTS_POLL_INTERVAL`` seconds, so retried and
+left-over events don't wait for new traffic. Each event is claimed with a
+conditional UPDATE, so two workers never apply the same one. A claim older
+than ``STRIPE_EVENT_CLAIM_TIMEOUT`` seconds belongs to a worker that died;
+the sweep puts it back to pending (or failed after
+``STRIPE_EVENT_MAX_ATTEMPTS``).
+
+Deposit state transitions only move forward (see ``ALLOWED_FROM``): an
+event that would not change anything, e.g. a redelivery or a replay of an
+already-applied event, is marked ``ignored``. That makes replaying stored
+events (``flask stripe-replay``) safe.
+
+Without the thread (``STRIPE_EVENTS_BACKGROUND=0``) events are applied
+inline right after they are stored.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+
+from flask import Flask, current_app
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import DepositPayment, StripeEvent, _utcnow
+from . import metrics
+
+# target status -> deposit statuses it may be reached from. "expired" may still
+# become "paid": admins expire stale deposits locally while the Checkout Session
+# stays open, and captured money outranks local state.
+ALLOWED_FROM = {
+    "paid": {"pending", "failed", "expired"},
+    "failed": {"pending"},
+    "expired": {"pending", "failed"},
+    "refunded": {"paid"},
+}
+
+
+def record_event(event, payload: str) -> bool:
+    """Store a verified event; False if this event id was already recorded."""
+    row = StripeEvent(
+        event_id=event["id"],
+        type=event["type"][:80],
+        stripe_created=int(event.get("created") or time.time()),
+        payload=payload,
+    )
+    db.session.add(row)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        metrics.incr("stripe.events.duplicate")
+        return False
+    metrics.incr("stripe.events.received")
+    return True
+
+
+# ── state transitions ──
+def _target(event: dict):
+    """(lookup column, lookup value, new status, extra fields) for ``event``, or None."""
+    kind, obj = event["type"], event["data"]["object"]
+    if kind == "checkout.session.completed":
+        # Delayed payment methods complete unpaid and settle with async_payment_* later.
+        status = "paid" if obj.get("payment_status") in ("paid", "no_payment_required") else None
+        return "stripe_session_id", obj["id"], status, {"stripe_payment_intent": obj.get("payment_intent") or None}
+    if kind == "checkout.session.async_payment_succeeded":
+        return "stripe_session_id", obj["id"], "paid", {"stripe_payment_intent": obj.get("payment_intent") or None}
+    if kind == "checkout.session.async_payment_failed":
+        return "stripe_session_id", obj["id"], "failed", {}
+    if kind == "checkout.session.expired":
+        return "stripe_session_id", obj["id"], "expired", {}
+    if kind == "payment_intent.payment_failed":
+        return "stripe_payment_intent", obj["id"], "failed", {}
+    if kind == "charge.refunded" and obj.get("refunded"):  # partial refunds leave the deposit paid
+        return "stripe_payment_intent", obj.get("payment_intent"), "refunded", {}
+    return None
+
+
+def apply_event(event: dict) -> tuple[str, dict | None]:
+    """Apply one event to its deposit without committing.
+
+    Returns ``("processed" | "ignored", activity)``, where ``activity`` is the
+    log_activity() arguments to record once the change is committed.
+    """
+    target = _target(event)
+    if target is None:
+        return "ignored", None
+    column, value, status, extra = target
+    payment = db.session.scalar(select(DepositPayment).where(getattr(DepositPayment, column) == value)) if value else None
+    if payment is None:
+        return "ignored", None
+
+    for key, v in extra.items():
+        if v and not getattr(payment, key):
+            setattr(payment, key, v)
+    if status is None or payment.status not in ALLOWED_FROM[status]:
+        return ("processed" if db.session.is_modified(payment) else "ignored"), None
+
+    previous, payment.status = payment.status, status
+    return "processed", {
+        "action": f"deposit_{status}",
+        "category": "payment",
+        "details": f"Stripe {event['type']} ({event['id']}): {previous} -> {status}",
+        "resource_type": "deposit",
+        "resource_id": payment.id,
+        "level": "warning" if status in ("failed", "refunded") else "info",
+    }
+
+
+class StripeEventProcessor:
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.background = bool(app.config.get("STRIPE_EVENTS_BACKGROUND", True))
+        self.poll_interval = float(app.config.get("STRIPE_EVENTS_POLL_INTERVAL", 30))
+        self.max_attempts = int(app.config.get("STRIPE_EVENT_MAX_ATTEMPTS", 5))
+        self.claim_timeout = timedelta(seconds=float(app.config.get("STRIPE_EVENT_CLAIM_TIMEOUT", 300)))
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Worker start: run the loop and sweep whatever is already waiting."""
+        if self.background:
+            self._ensure_thread()
+            self._wake.set()
+
+    def notify(self) -> None:
+        """A new event was stored: wake the worker's processor (or apply it inline)."""
+        if not self.background:
+            self.process_pending()
+            return
+        self._ensure_thread()
+        self._wake.set()
+
+    def _claim(self, row_id: int) -> StripeEvent | None:
+        claimed = db.session.execute(
+            update(StripeEvent)
+            .where(StripeEvent.id == row_id, StripeEvent.status == "pending")
+            .values(status="processing", attempts=StripeEvent.attempts + 1, claimed_at=_utcnow())
+        ).rowcount
+        db.session.commit()
+        return db.session.get(StripeEvent, row_id, populate_existing=True) if claimed else None
+
+    def process_one(self, row: StripeEvent) -> str:
+        activity = None
+        try:
+            outcome, activity = apply_event(json.loads(row.payload))
+        except Exception as e:
+            db.session.rollback()
+            row = db.session.get(StripeEvent, row.id, populate_existing=True)
+            row.status = "failed" if row.attempts >= self.max_attempts else "pending"
+            row.error = f"{type(e).__name__}: {e}"[:2000]
+            current_app.logger.warning(f"Stripe event {row.event_id} failed: {e}")
+            outcome = "error"
+        else:
+            row.status, row.error, row.processed_at = outcome, None, _utcnow()
+        db.session.commit()
+        if outcome == "processed":
+            from . import log_activity
+            from .dashboard_stats import invalidate_dashboard_counts
+
+            invalidate_dashboard_counts()
+            if activity:
+                log_activity(**activity)
+        metrics.incr(f"stripe.events.{outcome}")
+        return outcome
+
+    def reclaim_stale(self) -> int:
+        """Release claims older than the timeout (their worker died); returns how many."""
+        cutoff = _utcnow() - self.claim_timeout
+        stale = (StripeEvent.status == "processing", or_(StripeEvent.claimed_at.is_(None), StripeEvent.claimed_at < cutoff))
+        error = "claim timed out (worker stopped while applying)"
+        failed = db.session.execute(
+            update(StripeEvent).where(*stale, StripeEvent.attempts >= self.max_attempts).values(status="failed", error=error)
+        ).rowcount
+        released = db.session.execute(update(StripeEvent).where(*stale).values(status="pending", error=error)).rowcount
+        db.session.commit()
+        if failed or released:
+            metrics.incr("stripe.events.reclaimed", failed + released)
+        return failed + released
+
+    def process_pending(self, batch: int = 100) -> dict:
+        """Apply pending events oldest-first until none are left; returns outcome counts."""
+        self.reclaim_stale()
+        counts: dict[str, int] = {}
+        retry: set[int] = set()
+        while True:
+            ids = db.session.scalars(
+                select(StripeEvent.id)
+                .where(StripeEvent.status == "pending", StripeEvent.id.not_in(retry))
+                .order_by(StripeEvent.stripe_created, StripeEvent.id)
+                .limit(batch)
+            ).all()
+            if not ids:
+                return counts
+            for row_id in ids:
+                row = self._claim(row_id)
+                if row is None:
+                    continue  # another worker has it
+                outcome = self.process_one(row)
+                counts[outcome] = counts.get(outcome, 0) + 1
+                if outcome == "error":
+                    retry.add(row_id)  # retried on the next wake-up, not in a tight loop
+
+    # ── background loop ──
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    self.process_pending()
+                except Exception as e:
+                    self.app.logger.warning(f"Stripe event processing stopped: {e}")
+                finally:
+                    db.session.remove()
+
+    def _ensure_thread(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != pid or self._thread is None or not self._thread.is_alive():
+                self._pid = pid
+                self._wake = threading.Event()
+                self._thread = threading.Thread(target=self._run, name="stripe-events", daemon=True)
+                self._thread.start()
@@ -0,0 +1,272 @@
+"""Deterministic synthetic data at production-like volumes.
+
+``seed.py`` only lays out the homepage and a few stories, so admin lists,
+exports, the change feed and query plans can't be judged at real size.
+:func:`generate` fills every table from one ``random.Random(seed)``: the
+same seed and end date always give the same rows. Activity is skewed
+like the real log (mostly page views, a daytime peak, growing toward
+the end date); submissions follow the same curve.
+
+Rows go in with ``COPY ... FROM STDIN`` on Postgres (psycopg 3) and
+with executemany ``INSERT`` batches elsewhere. Identifiers carry the seed
+(``u12.s42@example.test``, ``story-s42-7``), so a second run needs a
+different seed.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterable
+
+from sqlalchemy import insert, select
+
+from ..extensions import db
+from ..models import (
+    ActivityLog,
+    Application,
+    ContactMessage,
+    DepositPayment,
+    InterestSignup,
+    Opening,
+    Story,
+    TourRequest,
+    User,
+)
+
+DEFAULT_VOLUMES = {
+    "users": 500,
+    "activity": 1_000_000,
+    "applications": 100_000,
+    "messages": 100_000,
+    "tours": 100_000,
+    "interest": 100_000,
+    "deposits": 10_000,
+    "openings": 200,
+    "stories": 2_000,
+}
+
+# category -> (weight, actions); weights follow the production log's mix
+ACTIVITY_MIX = {
+    "page_view": (70, ("page_view",)),
+    "auth": (10, ("login_success", "login_failed", "logout", "register")),
+    "form_submit": (8, ("contact_submitted", "tour_requested", "application_submitted", "interest_signup")),
+    "admin_action": (5, ("application_status_changed:reviewed", "story_approved", "opening_published", "exported:applications")),
+    "error": (3, ("server_error", "not_found")),
+    "payment": (2, ("deposit_initiated", "deposit_paid", "deposit_expired")),
+    "status_change": (2, ("deposit_status_changed", "story_status_changed")),
+}
+PATHS = ("/", "/openings", "/apply", "/contact", "/tour", "/what-we-do", "/faq", "/stories", "/guide", "/deposit")
+USER_AGENTS = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 Chrome/124.0 Mobile Safari/537.36",
+    "Googlebot/2.1 (+http://www.google.com/bot.html)",
+)
+# Relative traffic per hour of day (Pacific daytime peak, quiet overnight), indexed by UTC hour
+HOUR_WEIGHTS = (9, 8, 6, 4, 3, 2, 2, 2, 2, 2, 3, 4, 5, 7, 9, 10, 11, 12, 12, 12, 11, 11, 10, 10)
+PHOTOS = tuple(f"/static/assets/photos/{name}" for name in (
+    "backyard-deck.png", "backyard-lawn.png", "bathroom-full.jpg", "bathroom-half.jpg", "bedroom-bunk.png",
+    "bedroom-private.png", "bedroom-shared.png", "bedroom-upstairs.png", "exterior-front.jpg",
+))
+FIRST = ("Alex", "Jordan", "Sam", "Taylor", "Chris", "Jamie", "Morgan", "Casey", "Riley", "Drew", "Maria", "Luis", "Ana", "Marcus")
+LAST = ("Garcia", "Smith", "Nguyen", "Johnson", "Lopez", "Brown", "Lee", "Martinez", "Davis", "Wilson", "Clark", "Reyes")
+CITIES = ("Grover Beach", "Arroyo Grande", "Pismo Beach", "San Luis Obispo", "Oceano", "Nipomo")
+LOREM = ("Looking for a stable place to live while I keep working on my recovery. "
+         "I have a job lined up nearby and can move in within two weeks. "
+         "Happy to follow house rules, attend meetings and help with chores.").split()
+
+
+class Generator:
+    """Row factories sharing one RNG and one time window ``[end - days, end)``."""
+
+    def __init__(self, seed: int, end: datetime, days: int) -> None:
+        self.seed = seed
+        self.rnd = random.Random(seed)
+        self.end = end
+        self.days = days
+        self._hours = list(range(24))
+        self._categories = list(ACTIVITY_MIX)
+        self._category_weights = [ACTIVITY_MIX[c][0] for c in self._categories]
+
+    def when(self) -> datetime:
+        """A timestamp in the window: more recent days busier, daytime hours busier."""
+        # sqrt of a uniform draw: daily volume grows linearly toward the end date
+        day = int(self.days * math.sqrt(self.rnd.random()))
+        hour = self.rnd.choices(self._hours, HOUR_WEIGHTS)[0]
+        start = self.end - timedelta(days=self.days - day)
+        return start.replace(hour=hour) + timedelta(seconds=self.rnd.randrange(3600))
+
+    def name(self) -> str:
+        return f"{self.rnd.choice(FIRST)} {self.rnd.choice(LAST)}"
+
+    def email(self, kind: str, i: int) -> str:
+        return f"{kind}{i}.s{self.seed}@example.test"
+
+    def phone(self) -> str | None:
+        return f"805-555-{self.rnd.randrange(10000):04d}" if self.rnd.random() < 0.8 else None
+
+    def text(self, words: tuple[int, int]) -> str:
+        return " ".join(self.rnd.choices(LOREM, k=self.rnd.randint(*words)))
+
+    def ip(self) -> str:
+        return f"{self.rnd.randint(1, 223)}.{self.rnd.randrange(256)}.{self.rnd.randrange(256)}.{self.rnd.randint(1, 254)}"
+
+    # ── factories: (i) -> column dict, same keys on every row ──
+    def user(self, i: int, password_hash: str) -> dict:
+        created = self.when()
+        return {
+            "created_at": created, "updated_at": created, "name": self.name(), "username": f"user{i}-s{self.seed}",
+            "email": self.email("u", i), "phone": self.phone(), "password_hash": password_hash,
+            "is_admin": False, "last_login": created + timedelta(days=self.rnd.randrange(30)),
+            "email_confirmed": self.rnd.random() < 0.7, "confirm_token": None,
+        }
+
+    def activity(self, i: int, user_ids: list[int]) -> dict:
+        category = self.rnd.choices(self._categories, self._category_weights)[0]
+        action = self.rnd.choice(ACTIVITY_MIX[category][1])
+        level = "error" if category == "error" else "warning" if action == "login_failed" else "info"
+        path = self.rnd.choice(PATHS)
+        return {
+            "created_at": self.when(),
+            "user_id": self.rnd.choice(user_ids) if user_ids and category != "page_view" and self.rnd.random() < 0.6 else None,
+            "ip_address": self.ip(), "user_agent": self.rnd.choice(USER_AGENTS),
+            "action": action, "category": category, "path": path,
+            "method": "POST" if category in ("form_submit", "auth", "payment") else "GET",
+            "details": f"{action} {path}" if category != "page_view" else None,
+            "resource_type": None, "resource_id": None, "level": level,
+        }
+
+    def application(self, i: int) -> dict:
+        created = self.when()
+        status = self.rnd.choices(("new", "reviewed", "approved", "rejected"), (20, 40, 25, 15))[0]
+        return {
+            "created_at": created, "updated_at": created if status == "new" else created + timedelta(hours=self.rnd.randint(1, 96)),
+            "full_name": self.name(), "email": self.email("a", i), "phone": self.phone(),
+            "message": self.text((10, 60)), "status": status,
+        }
+
+    def message(self, i: int) -> dict:
+        created = self.when()
+        return {
+            "created_at": created, "updated_at": created, "name": self.name(), "email": self.email("m", i),
+            "subject": self.rnd.choice(("Question about openings", "Volunteering", "Partnership", "Pricing", "Visiting")),
+            "message": self.text((8, 50)),
+        }
+
+    def tour(self, i: int) -> dict:
+        created = self.when()
+        return {
+            "created_at": created, "updated_at": created, "name": self.name(), "email": self.email("t", i),
+            "phone": self.phone(), "preferred_time": self.rnd.choice(("Weekday mornings", "Weekday evenings", "Weekends", None)),
+            "notes": self.text((0, 20)) or None,
+        }
+
+    def interest(self, i: int) -> dict:
+        return {"created_at": self.when(), "email": self.email("i", i)}
+
+    def deposit(self, i: int) -> dict:
+        created = self.when()
+        status = self.rnd.choices(("paid", "pending", "expired", "failed", "refunded"), (60, 10, 20, 5, 5))[0]
+        return {
+            "created_at": created, "updated_at": created + timedelta(minutes=self.rnd.randint(1, 90)),
+            "full_name": self.name(), "email": self.email("d", i), "phone": self.phone(),
+            "stripe_session_id": f"cs_synthetic_s{self.seed}_{i}", "stripe_payment_intent": None,
+            "checkout_url": None, "checkout_expires_at": created + timedelta(hours=24),
+            "amount_cents": 100000, "status": status, "notes": None,
+        }
+
+    def opening(self, i: int) -> dict:
+        created = self.when()
+        city = self.rnd.choice(CITIES)
+        return {
+            "created_at": created, "updated_at": created, "title": f"{self.rnd.randint(1, 3)} beds in {city}",
+            "slug": f"opening-s{self.seed}-{i}", "city": city, "state": "CA",
+            "beds_available": self.rnd.randint(1, 4), "available_on": (created + timedelta(days=self.rnd.randint(0, 60))).date(),
+            "price_monthly": "$1,000 / month", "deposit": "$1,000 deposit", "hide_price": self.rnd.random() < 0.5,
+            "summary": self.text((8, 20)), "details": self.text((40, 120)), "house_rules": self.text((10, 30)),
+            "included": "Utilities, Wi-Fi, laundry", "contact_name": self.name(), "contact_email": self.email("o", i),
+            "contact_phone": self.phone(), "photos_json": json.dumps(self.rnd.sample(PHOTOS, self.rnd.randint(1, 6))),
+            "status": self.rnd.choices(("published", "draft", "archived"), (60, 20, 20))[0],
+        }
+
+    def story(self, i: int, reviewer_ids: list[int]) -> dict:
+        created = self.when()
+        status = self.rnd.choices(("approved", "pending", "rejected"), (70, 20, 10))[0]
+        reviewed = status != "pending"
+        return {
+            "created_at": created, "title": f"{self.name().split()[0]}'s story", "slug": f"story-s{self.seed}-{i}",
+            "summary": self.text((8, 20)), "body": self.text((80, 300)),
+            "image_url": self.rnd.choice(PHOTOS) if self.rnd.random() < 0.7 else None,
+            "author_name": self.name() if self.rnd.random() < 0.6 else "Anonymous", "status": status,
+            "reviewed_at": created + timedelta(days=1) if reviewed else None,
+            "reviewed_by": self.rnd.choice(reviewer_ids) if reviewed and reviewer_ids else None,
+        }
+
+
+def _copy_supported() -> bool:
+    return db.engine.dialect.name == "postgresql" and db.engine.dialect.driver == "psycopg"
+
+
+def bulk_insert(model, rows: Iterable[dict], batch: int = 10_000) -> int:
+    """Insert ``rows`` (dicts with identical keys) in batches; COPY on Postgres."""
+    table = model.__table__
+    total = 0
+    rows = iter(rows)
+    while True:
+        chunk = [row for _, row in zip(range(batch), rows)]
+        if not chunk:
+            return total
+        if _copy_supported():
+            columns = list(chunk[0])
+            cursor = db.session.connection().connection.driver_connection.cursor()
+            with cursor, cursor.copy(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in chunk:
+                    copy.write_row([row[c] for c in columns])
+        else:
+            db.session.execute(insert(table), chunk)
+        db.session.commit()
+        total += len(chunk)
+
+
+def generate(volumes: dict, seed: int = 42, end: date | None = None, days: int = 365, batch: int = 10_000,
+             progress: Callable[[str, int, float], None] | None = None) -> dict:
+    """Fill the database; returns ``{table: rows}``. ``volumes`` keys as in DEFAULT_VOLUMES."""
+    from werkzeug.security import generate_password_hash
+
+    end = end or datetime.now(timezone.utc).date()
+    # Naive UTC like the rest of the stored timestamps
+    gen = Generator(seed, datetime(end.year, end.month, end.day), days)
+    counts = {}
+
+    def load(name: str, model, make: Callable[[int], dict]) -> None:
+        n = int(volumes.get(name, 0))
+        if n <= 0:
+            return
+        t0 = time.perf_counter()
+        counts[name] = bulk_insert(model, (make(i) for i in range(n)), batch)
+        if progress:
+            progress(name, counts[name], time.perf_counter() - t0)
+
+    # One hash for every synthetic account: hashing 500 passwords would dominate small runs
+    password_hash = generate_password_hash(f"synthetic-{seed}")
+    load("users", User, lambda i: gen.user(i, password_hash))
+    user_ids: list[int] = list(db.session.scalars(
+        select(User.id).where(User.email.like(f"%.s{seed}@example.test")).order_by(User.id)
+    ))
+    reviewer_ids = list(db.session.scalars(select(User.id).where(User.is_admin.is_(True)))) or user_ids[:3]
+
+    load("activity", ActivityLog, lambda i: gen.activity(i, user_ids))
+    load("applications", Application, gen.application)
+    load("messages", ContactMessage, gen.message)
+    load("tours", TourRequest, gen.tour)
+    load("interest", InterestSignup, gen.interest)
+    load("deposits", DepositPayment, gen.deposit)
+    load("openings", Opening, gen.opening)
+    load("stories", Story, lambda i: gen.story(i, reviewer_ids))
+    return counts
+
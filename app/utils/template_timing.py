@@ -0,0 +1,104 @@
+"""Template render timing, fed into :mod:`app.utils.metrics`.
+
+Three measurements:
+
+* ``template.render.<name>``: every ``render_template``, timed between
+  Flask's ``before_render_template`` and ``template_rendered`` signals.
+  This is inclusive, so a page's time contains its ``{% extends %}``
+  layout.
+* ``template.fragment.<name>``: regions wrapped in the
+  :class:`TimingExtension` tag ``{% timed "name" %}...{% endtimed %}``.
+  base.html wraps its header, analytics, footer and reCAPTCHA parts this
+  way.
+* ``template.filter.<name>`` counters: calls to the filters named in
+  ``TEMPLATE_COUNTED_FILTERS``.
+
+``template.request_ms`` histograms the total render time of each request.
+Compare it with the request latency to see how much rendering matters,
+and use the fragment histograms to pick what is worth caching.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+
+from flask import Flask, before_render_template, g, has_request_context, template_rendered
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from . import metrics
+
+
+class TimingExtension(Extension):
+    """``{% timed "name" %}body{% endtimed %}`` renders body and records how long it took."""
+
+    tags = {"timed"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(template_timing=True)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        body = parser.parse_statements(("name:endtimed",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_render_timed", [name]), [], [], body).set_lineno(lineno)
+
+    def _render_timed(self, name: str, caller) -> str:
+        if not self.environment.template_timing:
+            return caller()
+        t0 = time.perf_counter()
+        try:
+            return caller()
+        finally:
+            metrics.observe(f"template.fragment.{name}", (time.perf_counter() - t0) * 1000)
+
+
+def _counting(name: str, fn):
+    @functools.wraps(fn)  # keeps jinja_pass_arg, so context/eval-context filters still get it
+    def counted(*args, **kwargs):
+        metrics.incr(f"template.filter.{name}")
+        return fn(*args, **kwargs)
+
+    return counted
+
+
+def count_filters(app: Flask, names) -> None:
+    """Wrap the named filters so each call bumps a counter (call after registering them)."""
+    filters = app.jinja_env.filters
+    for name in names:
+        if name in filters and not hasattr(filters[name], "__wrapped__"):
+            filters[name] = _counting(name, filters[name])
+
+
+def _before_render(_app, template, context, **_extra) -> None:
+    if has_request_context():
+        g.setdefault("template_timers", []).append(time.perf_counter())
+
+
+def _rendered(_app, template, context, **_extra) -> None:
+    if not has_request_context() or not g.get("template_timers"):
+        return
+    elapsed = (time.perf_counter() - g.template_timers.pop()) * 1000
+    metrics.observe(f"template.render.{template.name or 'string'}", elapsed)
+    if not g.template_timers:  # outermost render; nested ones are already inside it
+        g.template_ms = g.get("template_ms", 0.0) + elapsed
+
+
+def init_template_timing(app: Flask) -> None:
+    """Add the ``{% timed %}`` tag (templates use it either way); time renders when TEMPLATE_TIMING is on."""
+    app.jinja_env.add_extension(TimingExtension)
+    app.jinja_env.template_timing = bool(app.config.get("TEMPLATE_TIMING", True))
+    if not app.jinja_env.template_timing:
+        return
+    count_filters(app, app.config.get("TEMPLATE_COUNTED_FILTERS", ()))
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
+
+    @app.after_request
+    def _observe_render_total(response):
+        total = g.pop("template_ms", None)
+        if total is not None:
+            metrics.observe("template.request_ms", total)
+        return response
@@ -0,0 +1,96 @@
+"""Per-worker cache behind ``login_manager.user_loader``.
+
+Every authenticated request used to load the full ``User`` row. Templates
+only ever read a handful of fields, so the loader now returns a
+:class:`UserSnapshot` built from a small TTL cache. Anything beyond those
+fields — reading ``phone``, calling ``check_password``, or assigning to any
+attribute — lazily loads the real ORM object, so views that mutate the
+user keep working unchanged.
+
+Invalidate with :func:`invalidate_user` after changing a cached field.
+The cache is per process: a change made from the CLI reaches running
+workers once ``USER_CACHE_TTL`` lapses.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from flask import current_app
+from flask_login import UserMixin
+
+SNAPSHOT_FIELDS = ("id", "name", "is_admin", "email_confirmed")
+MAX_ENTRIES = 2048
+
+_lock = threading.Lock()
+_cache: dict[int, tuple[float, tuple]] = {}
+
+
+class UserSnapshot(UserMixin):
+    """Read-only view of the fields templates need, with lazy ORM fallback."""
+
+    def __init__(self, id: int, name: str, is_admin: bool, email_confirmed: bool) -> None:
+        d = self.__dict__
+        d["id"] = id
+        d["name"] = name
+        d["is_admin"] = bool(is_admin)
+        d["email_confirmed"] = bool(email_confirmed)
+        d["_model"] = None
+
+    @property
+    def model(self):
+        """The full ``User`` row, loaded on first use."""
+        if self.__dict__["_model"] is None:
+            from ..extensions import db
+            from ..models import User
+
+            self.__dict__["_model"] = db.session.get(User, self.__dict__["id"])
+        return self.__dict__["_model"]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self.model, name, value)
+        if name in SNAPSHOT_FIELDS:
+            self.__dict__[name] = value
+
+    def __repr__(self) -> str:
+        return f"<UserSnapshot {self.__dict__['id']}>"
+
+
+def load_user_snapshot(user_id: int) -> UserSnapshot | None:
+    """Return a fresh snapshot for ``user_id``, querying only on a cache miss."""
+    ttl = float(current_app.config.get("USER_CACHE_TTL", 60))
+    now = time.monotonic()
+    with _lock:
+        hit = _cache.get(user_id)
+    if hit and hit[0] > now:
+        return UserSnapshot(*hit[1])
+
+    from ..extensions import db
+    from ..models import User
+
+    row = db.session.execute(
+        db.select(*(getattr(User, f) for f in SNAPSHOT_FIELDS)).where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+    values = tuple(row)
+    with _lock:
+        if len(_cache) >= MAX_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+        _cache[user_id] = (now + ttl, values)
+    return UserSnapshot(*values)
+
+
+def invalidate_user(user_id: int | None = None) -> None:
+    """Forget one cached user, or all of them when ``user_id`` is None."""
+    with _lock:
+        if user_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(user_id, None)
@@ -0,0 +1,59 @@
+"""Gunicorn settings (Procfile and render.yaml run `gunicorn -c gunicorn.conf.py wsgi:app`).
+
+The app is built once in the master (preload_app) and shared with workers
+copy-on-write; see app/utils/prefork.py for what is warmed before the fork
+and reset after it. Set GUNICORN_PRELOAD=0 to build the app per worker.
+Compare memory per worker with `python tools/worker_memory.py`.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "2"))
+timeout = 120
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# Recycle workers now and then so slow leaks can't accumulate; the jitter
+# keeps them from all restarting at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+
+def when_ready(server):
+    """Master, app loaded, no workers yet: warm shared state and freeze the GC."""
+    if not server.cfg.preload_app:
+        return
+    from app.utils import prefork
+
+    warmed = prefork.warm_shared_state(server.app.wsgi())
+    prefork.freeze()
+    server.log.info(f"Preloaded app shared with workers: {warmed}")
+
+
+def post_fork(server, worker):
+    """Preloaded worker: reset inherited pools and start its background loops."""
+    if not server.cfg.preload_app:
+        return
+    from app.utils import prefork
+
+    prefork.after_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    """Without preload the worker built its own app; just start its background loops."""
+    if worker.cfg.preload_app:
+        return
+    from app.utils import prefork
+
+    prefork.start_background(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    """Recycled or stopping worker: don't drop queued SQLite writes."""
+    flask_app = getattr(worker, "wsgi", None)
+    if not hasattr(flask_app, "extensions"):  # the app never loaded
+        return
+    from app.utils import prefork
+
+    prefork.before_exit(flask_app)
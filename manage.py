@@ -28,6 +28,7 @@ import click
 from app import create_app
 from app.extensions import db
 from app.models import User
+from app.utils.user_cache import invalidate_user
 
 
 @click.group()
@@ -47,6 +48,7 @@ def make_admin(email: str) -> None:
             raise click.ClickException(f"No user found for {email}")
         user.is_admin = True
         db.session.commit()
+        invalidate_user(user.id)
         click.echo(f"{user.email} is now an admin")
 
 
@@ -0,0 +1,57 @@
+"""Add indexes for hot list/dashboard queries.
+
+Covers newest-first listings (openings, stories, applications, messages,
+tours, deposits), the dashboard's category + time-window activity counts,
+and deposit status lookups. On Postgres the indexes are built with
+CREATE INDEX CONCURRENTLY so the upgrade doesn't lock writers out.
+
+Revision ID: 0007
+Revises: 0006
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+
+PUBLISHED = sa.text("status = 'published'")
+
+INDEXES = [
+    # (name, table, columns, extra kwargs)
+    ("ix_openings_published_created_at", "openings", ["created_at"],
+     {"postgresql_where": PUBLISHED, "sqlite_where": PUBLISHED}),
+    ("ix_openings_status_created_at", "openings", ["status", "created_at"], {}),
+    ("ix_stories_status_created_at", "stories", ["status", "created_at"], {}),
+    ("ix_activity_logs_category_created_at", "activity_logs", ["category", "created_at"], {}),
+    ("ix_applications_created_at", "applications", ["created_at"], {}),
+    ("ix_contact_messages_created_at", "contact_messages", ["created_at"], {}),
+    ("ix_tour_requests_created_at", "tour_requests", ["created_at"], {}),
+    ("ix_deposit_payments_created_at", "deposit_payments", ["created_at"], {}),
+    ("ix_deposit_payments_status", "deposit_payments", ["status"], {}),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if _is_postgres():
+        # CONCURRENTLY cannot run inside a transaction block.
+        with op.get_context().autocommit_block():
+            for name, table, cols, kw in INDEXES:
+                op.create_index(name, table, cols, postgresql_concurrently=True, if_not_exists=True, **kw)
+    else:
+        for name, table, cols, kw in INDEXES:
+            op.create_index(name, table, cols, if_not_exists=True, **kw)
+
+
+def downgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, _cols, _kw in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _cols, _kw in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,43 @@
+"""Index created_at on users and interest signups for keyset-paged admin lists.
+
+The admin list pages walk every table newest-first with a
+(created_at, id) cursor; the other listed tables got their created_at
+indexes in 0007. Built CONCURRENTLY on Postgres, as there.
+
+Revision ID: 0008
+Revises: 0007
+"""
+
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+
+INDEXES = [
+    ("ix_users_created_at", "users", ["created_at"]),
+    ("ix_interest_signups_created_at", "interest_signups", ["created_at"]),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, cols in INDEXES:
+                op.create_index(name, table, cols, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols, if_not_exists=True)
+
+
+def downgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, _cols in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _cols in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,36 @@
+"""Add updated_at to messages, tours and deposits; index the change-feed watermark.
+
+Existing rows are backfilled with their created_at, so the first sync
+picks everything up in creation order. Each synced table gets an
+(updated_at, id) index for the feed's keyset scan.
+
+Revision ID: 0009
+Revises: 0008
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0009"
+down_revision = "0008"
+
+NEW_COLUMNS = ["contact_messages", "tour_requests", "deposit_payments"]
+INDEXED = ["applications", *NEW_COLUMNS]
+
+
+def upgrade():
+    for table in NEW_COLUMNS:
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True))
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+    for table in INDEXED:
+        op.create_index(f"ix_{table}_updated_at_id", table, ["updated_at", "id"])
+
+
+def downgrade():
+    for table in reversed(INDEXED):
+        op.drop_index(f"ix_{table}_updated_at_id", table_name=table)
+    for table in reversed(NEW_COLUMNS):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("updated_at")
@@ -0,0 +1,35 @@
+"""Add stripe_events table for idempotent, replayable webhook processing.
+
+Revision ID: 0010
+Revises: 0009
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+
+
+def upgrade():
+    op.create_table(
+        "stripe_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_id", sa.String(255), nullable=False, unique=True),
+        sa.Column("type", sa.String(80), nullable=False),
+        sa.Column("stripe_created", sa.Integer(), nullable=False),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_stripe_events_type", "stripe_events", ["type"])
+    op.create_index("ix_stripe_events_status_created", "stripe_events", ["status", "stripe_created", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_stripe_events_status_created", table_name="stripe_events")
+    op.drop_index("ix_stripe_events_type", table_name="stripe_events")
+    op.drop_table("stripe_events")
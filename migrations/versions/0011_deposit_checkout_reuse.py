@@ -0,0 +1,25 @@
+"""Remember each deposit's Checkout URL and expiry so open sessions can be reused.
+
+Revision ID: 0011
+Revises: 0010
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0011"
+down_revision = "0010"
+
+
+def upgrade():
+    with op.batch_alter_table("deposit_payments") as batch:
+        batch.add_column(sa.Column("checkout_url", sa.String(2048), nullable=True))
+        batch.add_column(sa.Column("checkout_expires_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_deposit_payments_email_status", "deposit_payments", ["email", "status"])
+
+
+def downgrade():
+    op.drop_index("ix_deposit_payments_email_status", table_name="deposit_payments")
+    with op.batch_alter_table("deposit_payments") as batch:
+        batch.drop_column("checkout_expires_at")
+        batch.drop_column("checkout_url")
@@ -0,0 +1,34 @@
+"""Add perf_events table for the slow-query and slow-request log.
+
+Revision ID: 0012
+Revises: 0011
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0012"
+down_revision = "0011"
+
+
+def upgrade():
+    op.create_table(
+        "perf_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("kind", sa.String(10), nullable=False),
+        sa.Column("endpoint", sa.String(120), nullable=True),
+        sa.Column("method", sa.String(10), nullable=True),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("duration_ms", sa.Float(), nullable=False),
+        sa.Column("statement", sa.Text(), nullable=True),
+        sa.Column("params", sa.String(200), nullable=True),
+    )
+    op.create_index("ix_perf_events_created_at", "perf_events", ["created_at"])
+    op.create_index("ix_perf_events_kind_created_at", "perf_events", ["kind", "created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_perf_events_kind_created_at", table_name="perf_events")
+    op.drop_index("ix_perf_events_created_at", table_name="perf_events")
+    op.drop_table("perf_events")
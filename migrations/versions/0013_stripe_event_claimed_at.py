@@ -0,0 +1,21 @@
+"""Record when a Stripe event was claimed so claims of dead workers can be released.
+
+Revision ID: 0013
+Revises: 0012
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0013"
+down_revision = "0012"
+
+
+def upgrade():
+    with op.batch_alter_table("stripe_events") as batch:
+        batch.add_column(sa.Column("claimed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("stripe_events") as batch:
+        batch.drop_column("claimed_at")
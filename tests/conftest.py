@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+# Keep tests off instance/local.db: the engine is bound when create_app() runs.
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SECRET_KEY", "test-key")
+# Probe inline when stale instead of from a thread sharing the in-memory connection.
+os.environ["HEALTH_PROBE_BACKGROUND"] = "0"
+os.environ["STRIPE_EVENTS_BACKGROUND"] = "0"  # likewise, apply webhook events inline
+os.environ.setdefault("RATELIMIT_STORAGE_URI", "memory://")
+os.environ["PERF_LOG_BACKGROUND"] = "0"  # write slow-query/request events at teardown
+os.environ["QUERY_COUNTER"] = "1"  # X-Query-Count on every response
+
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.utils.dashboard_stats import invalidate_dashboard_counts
+from app.utils.user_cache import invalidate_user
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, RATELIMIT_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    # Per-worker caches outlive the app; ids are reused by the next test's database.
+    invalidate_user()
+    invalidate_dashboard_counts()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_client(app):
+    from app.models import User
+
+    user = User(name="Admin", email="admin@example.com", username="admin", is_admin=True, email_confirmed=True)
+    user.set_password("correct-horse")
+    db.session.add(user)
+    db.session.commit()
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user.id)
+        sess["_fresh"] = True
+    return client
+
+
+# ── Local Stripe API stub ────────────────────────────────────
+class StripeStub(ThreadingHTTPServer):
+    """Just enough of api.stripe.com for checkout sessions: create (honouring
+    Idempotency-Key) and retrieve. ``sessions`` can be edited directly."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StripeStubHandler)
+        self.sessions: dict[str, dict] = {}
+        self.idempotent: dict[str, str] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def add_session(self, session_id: str, **fields) -> dict:
+        session = {
+            "id": session_id, "object": "checkout.session", "status": "open", "payment_status": "unpaid",
+            "payment_intent": None, "url": f"https://checkout.stripe.test/{session_id}",
+            "expires_at": int(time.time()) + 86400, **fields,
+        }
+        self.sessions[session_id] = session
+        return session
+
+
+class _StripeStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.requests.append(("GET", self.path))
+        session = self.server.sessions.get(self.path.rsplit("/", 1)[-1].split("?")[0])
+        if session is None or not self.path.startswith("/v1/checkout/sessions/"):
+            self._reply(404, {"error": {"type": "invalid_request_error", "message": "No such checkout.session"}})
+        else:
+            self._reply(200, session)
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+        with self.server.lock:
+            self.server.requests.append(("POST", self.path))
+            key = self.headers.get("Idempotency-Key")
+            if key in self.server.idempotent:
+                return self._reply(200, self.server.sessions[self.server.idempotent[key]])
+            session_id = f"cs_test_stub{len(self.server.sessions) + 1}"
+            form = parse_qs(body)
+            session = self.server.add_session(session_id, customer_email=form.get("customer_email", [None])[0])
+            if key:
+                self.server.idempotent[key] = session_id
+        self._reply(200, session)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stripe_stub(app):
+    from app.utils import stripe_client
+
+    server = StripeStub()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app.config.update(STRIPE_SECRET_KEY="sk_test_stub", STRIPE_API_BASE=server.url, STRIPE_MAX_RETRIES=0)
+    stripe_client.reset()
+    yield server
+    stripe_client.reset()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,91 @@
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import ActivityLog, Application, DepositPayment, Story, TourRequest
+
+
+def _statements(app):
+    seen = []
+
+    def before(_conn, _cursor, statement, *_args):
+        seen.append(statement.split()[0].upper())
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    return seen, lambda: event.remove(db.engine, "before_cursor_execute", before)
+
+
+def test_bulk_application_status_one_update(app, admin_client):
+    rows = [Application(full_name=f"Applicant {i}", email=f"a{i}@example.com") for i in range(50)]
+    db.session.add_all(rows)
+    db.session.commit()
+    ids = [str(r.id) for r in rows[:40]]
+
+    seen, stop = _statements(app)
+    try:
+        resp = admin_client.post("/admin/applications/bulk", data={"status": "reviewed", "ids": ids})
+    finally:
+        stop()
+    assert resp.status_code == 302
+    assert seen.count("UPDATE") == 1
+    assert Application.query.filter_by(status="reviewed").count() == 40
+    assert Application.query.filter_by(status="new").count() == 10
+    logs = ActivityLog.query.filter_by(action="application_status_changed:reviewed").all()
+    assert len(logs) == 40
+    assert {log.resource_id for log in logs} == {int(i) for i in ids}
+
+
+def test_bulk_stories(app, admin_client):
+    stories = [Story(title=f"S{i}", slug=f"s{i}", body="x") for i in range(4)]
+    db.session.add_all(stories)
+    db.session.commit()
+    a, b, c, d = (s.id for s in stories)
+
+    admin_client.post("/admin/stories/bulk", data={"action": "approve", "ids": [a, b]})
+    admin_client.post("/admin/stories/bulk", data={"action": "delete", "ids": [c]})
+    statuses = {s.id: s.status for s in db.session.execute(db.select(Story)).scalars()}
+    assert statuses == {a: "approved", b: "approved", d: "pending"}
+    assert db.session.get(Story, a).reviewed_by is not None
+
+
+def test_bulk_tours_and_deposits(app, admin_client):
+    tours = [TourRequest(name=f"T{i}", email=f"t{i}@example.com") for i in range(3)]
+    paid = DepositPayment(full_name="P", email="p@example.com", amount_cents=100, status="paid")
+    pending = DepositPayment(full_name="Q", email="q@example.com", amount_cents=100, status="pending")
+    db.session.add_all([*tours, paid, pending])
+    db.session.commit()
+
+    admin_client.post("/admin/tour-requests/bulk", data={"action": "delete", "ids": [t.id for t in tours[:2]]})
+    assert TourRequest.query.count() == 1
+
+    admin_client.post("/admin/deposits/bulk", data={"action": "expire", "ids": [paid.id, pending.id]})
+    assert {d.status for d in DepositPayment.query} == {"paid", "expired"}
+    admin_client.post("/admin/deposits/bulk", data={"action": "delete", "ids": [paid.id, pending.id]})
+    assert [d.status for d in DepositPayment.query] == ["paid"]
+
+
+def test_bulk_delete_keeps_live_and_money_deposits(app, admin_client):
+    rows = {status: DepositPayment(full_name=status, email=f"{status}@example.com", amount_cents=100, status=status)
+            for status in ("pending", "paid", "refunded", "expired", "failed")}
+    db.session.add_all(rows.values())
+    db.session.commit()
+
+    admin_client.post("/admin/deposits/bulk", data={"action": "delete", "ids": [d.id for d in rows.values()]})
+    assert sorted(d.status for d in DepositPayment.query) == ["paid", "pending", "refunded"]
+
+
+def test_oversize_selection_is_rejected_not_truncated(app, admin_client):
+    from app.blueprints.admin import BULK_MAX_IDS
+
+    rows = [Application(full_name=f"Applicant {i}", email=f"a{i}@example.com") for i in range(3)]
+    db.session.add_all(rows)
+    db.session.commit()
+    ids = [r.id for r in rows] + list(range(10_000, 10_000 + BULK_MAX_IDS))
+
+    resp = admin_client.post("/admin/applications/bulk", data={"status": "reviewed", "ids": ids}, follow_redirects=True)
+    assert b"Too many rows selected" in resp.data
+    assert Application.query.filter_by(status="reviewed").count() == 0
+
+
+def test_bulk_requires_admin(app, client):
+    resp = client.post("/admin/applications/bulk", data={"status": "reviewed", "ids": ["1"]})
+    assert resp.status_code in (302, 401, 403)
@@ -0,0 +1,91 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from app.cli import change_feed_cmd
+from app.extensions import db
+from app.models import Application, TourRequest
+
+BASE = datetime(2026, 4, 1, 9, 0, 0)
+
+
+def _lines(body: bytes) -> list[dict]:
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+def _tours(n, start=0):
+    db.session.add_all([
+        TourRequest(name=f"T{i}", email=f"t{i}@example.com", created_at=BASE, updated_at=BASE + timedelta(seconds=i // 3))
+        for i in range(start, start + n)
+    ])
+    db.session.commit()
+
+
+def test_feed_resumes_from_cursor(app, admin_client):
+    _tours(10)
+    first = _lines(admin_client.get("/admin/feed/tours.ndjson?limit=4").get_data())
+    assert [r["name"] for r in first] == ["T0", "T1", "T2", "T3"]
+    rest = _lines(admin_client.get(f"/admin/feed/tours.ndjson?after={first[-1]['_cursor']}").get_data())
+    assert [r["name"] for r in rest] == [f"T{i}" for i in range(4, 10)]
+
+    # Only new or changed rows come through after the last cursor.
+    tour = db.session.get(TourRequest, first[0]["id"])
+    tour.notes = "called back"
+    tour.updated_at = BASE + timedelta(minutes=5)
+    db.session.commit()
+    changed = _lines(admin_client.get(f"/admin/feed/tours.ndjson?after={rest[-1]['_cursor']}").get_data())
+    assert [(r["id"], r["notes"]) for r in changed] == [(tour.id, "called back")]
+
+
+def test_feed_since_gzip_and_settle(app, admin_client):
+    db.session.add_all([
+        Application(full_name="Old", email="o@example.com", updated_at=BASE),
+        Application(full_name="Fresh", email="f@example.com"),  # updated just now: held back
+    ])
+    db.session.commit()
+    resp = admin_client.get("/admin/feed/applications.ndjson.gz?since=2026-01-01T00:00:00")
+    assert resp.mimetype == "application/gzip"
+    assert [r["full_name"] for r in _lines(gzip.decompress(resp.get_data()))] == ["Old"]
+
+    app.config["CHANGE_FEED_SETTLE_SECONDS"] = 0
+    body = admin_client.get("/admin/feed/applications.ndjson").get_data()
+    assert [r["full_name"] for r in _lines(body)] == ["Old", "Fresh"]
+
+
+def test_bulk_update_bumps_updated_at(app, admin_client):
+    row = Application(full_name="A", email="a@example.com", updated_at=BASE)
+    db.session.add(row)
+    db.session.commit()
+    admin_client.post("/admin/applications/bulk", data={"status": "reviewed", "ids": [row.id]})
+    db.session.expire_all()
+    assert db.session.get(Application, row.id).updated_at > BASE
+
+
+def test_cli_advances_state_file(app, tmp_path):
+    _tours(5)
+    state, out = tmp_path / "state.json", tmp_path / "tours.ndjson"
+    runner = app.test_cli_runner()
+    args = ["tours", "--state-file", str(state), "--out", str(out), "--batch", "2"]
+
+    assert runner.invoke(change_feed_cmd, args).exit_code == 0
+    assert len(out.read_text().splitlines()) == 5
+    assert "tours" in json.loads(state.read_text())
+
+    _tours(2, start=5)
+    assert runner.invoke(change_feed_cmd, args).exit_code == 0
+    names = [json.loads(line)["name"] for line in out.read_text().splitlines()]
+    assert names == [f"T{i}" for i in range(7)]
+
+
+def test_bad_watermark_is_an_error_not_a_restart(app, admin_client, tmp_path):
+    _tours(3)
+    assert admin_client.get("/admin/feed/tours.ndjson?after=not-a-cursor").status_code == 400
+    resp = admin_client.get("/admin/feed/tours.ndjson?since=yesterday")
+    assert resp.status_code == 400 and b"Invalid since timestamp" in resp.data
+
+    state, out = tmp_path / "state.json", tmp_path / "tours.ndjson"
+    state.write_text(json.dumps({"tours": "corrupted"}))
+    result = app.test_cli_runner().invoke(change_feed_cmd, ["tours", "--state-file", str(state), "--out", str(out)])
+    assert result.exit_code != 0 and "invalid after cursor" in result.output
+    assert not out.exists() or out.read_text() == ""
+    assert json.loads(state.read_text()) == {"tours": "corrupted"}
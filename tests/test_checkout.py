@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+from app.extensions import db
+from app.models import DepositPayment
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+FORM = {"full_name": "Pat Doe", "email": "Pat@Example.com", "phone": "555"}
+
+
+def _posts(stub):
+    return [path for method, path in stub.requests if method == "POST"]
+
+
+def test_repeat_clicks_reuse_one_session(app, client, stripe_stub):
+    first = client.post("/deposit/create-checkout", data=FORM)
+    again = client.post("/deposit/create-checkout", data=FORM)
+    assert first.status_code == again.status_code == 303
+    assert first.headers["Location"] == again.headers["Location"] == "https://checkout.stripe.test/cs_test_stub1"
+    assert _posts(stripe_stub) == ["/v1/checkout/sessions"]  # the retry never reached Stripe
+
+    deposit = DepositPayment.query.one()
+    assert (deposit.email, deposit.stripe_session_id, deposit.status) == ("pat@example.com", "cs_test_stub1", "pending")
+    assert deposit.checkout_expires_at > _now() + timedelta(hours=23)
+
+
+def test_concurrent_click_gets_same_session_from_stripe(app, client, stripe_stub, monkeypatch):
+    from app.utils import checkout
+
+    # Both requests miss the reuse lookup, as when two clicks race.
+    monkeypatch.setattr(checkout, "reusable_deposit", lambda email, name, phone, amount: None)
+    locations = {client.post("/deposit/create-checkout", data=FORM).headers["Location"] for _ in range(2)}
+    assert len(locations) == 1
+    assert len(_posts(stripe_stub)) == 2
+    assert len(stripe_stub.sessions) == 1  # Stripe replayed the idempotent response
+    assert DepositPayment.query.count() == 1
+
+
+def test_expiring_session_is_not_reused(app, client, stripe_stub):
+    client.post("/deposit/create-checkout", data=FORM)
+    deposit = DepositPayment.query.one()
+    deposit.checkout_expires_at = _now() + timedelta(minutes=1)  # about to lapse
+    db.session.commit()
+    app.config["STRIPE_CHECKOUT_IDEMPOTENCY_WINDOW"] = 7  # a later idempotency window
+
+    resp = client.post("/deposit/create-checkout", data=FORM)
+    assert resp.headers["Location"] == "https://checkout.stripe.test/cs_test_stub2"
+    assert DepositPayment.query.count() == 2
+
+
+def test_other_details_get_their_own_session(app, client, stripe_stub):
+    client.post("/deposit/create-checkout", data=FORM)
+    # Someone else typing Pat's email must not land on Pat's Checkout page; nor does a corrected phone.
+    other = client.post("/deposit/create-checkout", data={**FORM, "full_name": "Mallory"})
+    corrected = client.post("/deposit/create-checkout", data={**FORM, "phone": "556"})
+    assert other.headers["Location"] == "https://checkout.stripe.test/cs_test_stub2"
+    assert corrected.headers["Location"] == "https://checkout.stripe.test/cs_test_stub3"
+    assert DepositPayment.query.count() == 3
+
+
+def test_reuse_without_phone(app, client, stripe_stub):
+    form = {**FORM, "phone": ""}
+    locations = {client.post("/deposit/create-checkout", data=form).headers["Location"] for _ in range(2)}
+    assert locations == {"https://checkout.stripe.test/cs_test_stub1"}
@@ -0,0 +1,45 @@
+from app.extensions import db
+from app.models import Application, DepositPayment, Story
+from app.utils.dashboard_stats import fetch_dashboard_counts, get_dashboard_counts, invalidate_dashboard_counts
+
+
+def _seed():
+    db.session.add_all([
+        Application(full_name="A", email="a@example.com", status="new"),
+        Application(full_name="B", email="b@example.com", status="approved"),
+        Story(title="Pending story", slug="pending-story", body="x", status="pending"),
+        DepositPayment(full_name="P", email="p@example.com", amount_cents=100, status="paid"),
+        DepositPayment(full_name="Q", email="q@example.com", amount_cents=100, status="pending"),
+    ])
+    db.session.commit()
+
+
+def test_counts_single_query(app):
+    _seed()
+    counts = fetch_dashboard_counts()
+    assert counts == {
+        "new": 1, "total": 2, "pending_stories": 1, "messages": 0,
+        "tours": 0, "interest": 0, "deposits_paid": 1, "deposits_pending": 1,
+    }
+
+
+def test_cache_and_invalidation(app):
+    invalidate_dashboard_counts()
+    assert get_dashboard_counts()["total"] == 0
+    db.session.add(Application(full_name="C", email="c@example.com"))
+    db.session.commit()
+    assert get_dashboard_counts()["total"] == 0  # served from cache
+    invalidate_dashboard_counts()
+    assert get_dashboard_counts()["total"] == 1
+
+
+def test_apply_post_invalidates(client):
+    invalidate_dashboard_counts()
+    assert get_dashboard_counts()["new"] == 0
+    r = client.post("/apply", data={"full_name": "Dee Applicant", "email": "dee@example.com"})
+    assert r.status_code == 302
+    assert get_dashboard_counts()["new"] == 1
+
+
+def test_dashboard_renders(admin_client):
+    assert admin_client.get("/admin/").status_code == 200
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import create_engine, insert
+
+from app import create_app
+from app.extensions import db
+from app.models import Opening
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setenv("DATABASE_REPLICA_URL", replica_url)
+    monkeypatch.setenv("SQLITE_WRITE_QUEUE", "0")
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, RATELIMIT_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+    replica = create_engine(replica_url)
+    db.metadata.create_all(replica)
+    with replica.begin() as conn:
+        conn.execute(insert(Opening), {"title": "Replica only", "slug": "replica-only", "status": "published",
+                                       "beds_available": 1, "hide_price": True})
+    yield app
+    replica.dispose()
+    app.extensions["db_replica"].engine.dispose()
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_read_only_view_uses_replica(replica_app):
+    client = replica_app.test_client()
+    assert b"Replica only" in client.get("/openings").data
+    # Unmarked views (and the model's default bind) still use the primary.
+    with replica_app.app_context():
+        assert Opening.query.count() == 0
+
+
+def test_post_pins_browser_to_primary(replica_app):
+    client = replica_app.test_client()
+    r = client.post("/interest", data={"email": "pin@example.com"})
+    assert r.status_code == 302
+    # Redirect target reads from the primary during the sticky window.
+    assert b"Replica only" not in client.get("/openings").data
+    # A different browser is not pinned.
+    assert b"Replica only" in replica_app.test_client().get("/openings").data
+
+
+def test_falls_back_when_replica_down(replica_app, tmp_path):
+    router = replica_app.extensions["db_replica"]
+    router.engine.dispose()
+    router.engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'nope.db'}")
+    router.checked_at = 0.0
+    r = replica_app.test_client().get("/openings")
+    assert r.status_code == 200
+    assert b"Replica only" not in r.data
+    assert router.healthy is False
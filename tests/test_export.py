@@ -0,0 +1,60 @@
+import csv
+import gzip
+import io
+from datetime import datetime
+
+from app.extensions import db
+from app.models import Application, ContactMessage
+from app.utils import export
+from app.utils.export import csv_safe_rows
+
+
+def _rows(body: str) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(body)))
+
+
+def test_csv_safe_rows():
+    rows = csv_safe_rows([("=SUM(A1)", "+1", "-2", "@x", "\tt", "plain", None, 5, datetime(2026, 1, 2, 3, 4))])
+    assert rows == [["'=SUM(A1)", "'+1", "'-2", "'@x", "'\tt", "plain", "", "5", "2026-01-02T03:04:00"]]
+
+
+def test_applications_export_is_unbounded_and_streamed(app, admin_client, monkeypatch):
+    monkeypatch.setattr(export, "YIELD_PER", 100)
+    db.session.add_all([
+        Application(full_name=f"A {i}", email=f"a{i}@example.com", status="new" if i % 2 else "reviewed",
+                    message='says "hi"\nover two lines')
+        for i in range(5_250)
+    ])
+    db.session.commit()
+
+    resp = admin_client.get("/admin/applications/export.csv")
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    rows = _rows(resp.get_data(as_text=True))
+    assert rows[0] == ["created_at", "full_name", "email", "phone", "status", "message"]
+    assert len(rows) == 5_251
+    assert rows[1][5] == 'says "hi"\nover two lines'
+
+    rows = _rows(admin_client.get("/admin/export/applications.csv?status=reviewed").get_data(as_text=True))
+    assert len(rows) == 2_626
+    assert {r[4] for r in rows[1:]} == {"reviewed"}
+
+
+def test_gzip_and_date_range(app, admin_client):
+    db.session.add_all([
+        ContactMessage(created_at=datetime(2026, 5, day), name="N", email="n@example.com", subject="=cmd", message="m")
+        for day in (1, 2, 3)
+    ])
+    db.session.commit()
+
+    resp = admin_client.get("/admin/export/messages.csv.gz?from=2026-05-02&to=2026-05-02")
+    assert resp.mimetype == "application/gzip"
+    assert "messages_" in resp.headers["Content-Disposition"] and ".csv.gz" in resp.headers["Content-Disposition"]
+    rows = _rows(gzip.decompress(resp.get_data()).decode())
+    assert len(rows) == 2
+    assert rows[1][0].startswith("2026-05-02")
+    assert rows[1][3] == "'=cmd"
+
+
+def test_unknown_export(admin_client):
+    assert admin_client.get("/admin/export/users.csv").status_code == 404
@@ -0,0 +1,78 @@
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import ActivityLog
+from app.utils.health import register_queue
+
+
+def _count_queries(app):
+    seen = []
+
+    def before(*_args):
+        seen.append(1)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before)
+    return seen, lambda: event.remove(engine, "before_cursor_execute", before)
+
+
+def test_live_does_no_io(app, client):
+    seen, stop = _count_queries(app)
+    try:
+        resp = client.get("/health/live")
+    finally:
+        stop()
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "ok"}
+    assert seen == []
+
+
+def test_ready_serves_cached_result(app, client):
+    first = client.get("/health/ready")
+    assert first.status_code == 200
+    body = first.get_json()
+    assert body["status"] == "ok"
+    assert body["checks"]["db"]["ok"] is True
+    assert "free_mb" in body["checks"]["disk"]
+    assert "age_s" in body
+
+    seen, stop = _count_queries(app)
+    try:
+        again = client.get("/health")
+    finally:
+        stop()
+    assert again.get_json()["checked_at"] == body["checked_at"]
+    assert seen == []
+
+
+def test_ready_skips_activity_log_and_headers(app, client):
+    resp = client.get("/health/ready")
+    assert "Content-Security-Policy" not in resp.headers
+    assert ActivityLog.query.count() == 0
+
+
+def test_only_health_endpoints_skip_headers(app, client):
+    app.add_url_rule("/healthcare", "healthcare", lambda: "a page, not a probe")
+    resp = client.get("/healthcare")
+    assert "Content-Security-Policy" in resp.headers and resp.headers["X-Frame-Options"] == "SAMEORIGIN"
+    assert ActivityLog.query.filter_by(action="page_view:/healthcare").count() == 1
+
+
+def test_deep_queue_is_degraded(app, client):
+    register_queue(app, "outbox", lambda: 5000)
+    app.extensions["health_prober"].probe()
+    resp = client.get("/health/ready")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["status"] == "degraded"
+    assert body["checks"]["queues"]["depths"] == {"outbox": 5000, "perf_log": 0}
+
+
+def test_db_failure_is_not_ready(app, client, monkeypatch):
+    prober = app.extensions["health_prober"]
+    monkeypatch.setattr(prober, "_check_db", lambda: {"ok": False, "error": "OperationalError"})
+    prober.probe()
+    resp = client.get("/health/ready")
+    assert resp.status_code == 503
+    assert resp.get_json()["status"] == "down"
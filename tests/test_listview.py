@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import ContactMessage, DepositPayment, User
+from app.utils.listview import decode_cursor, encode_cursor
+
+BASE = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _messages(n):
+    db.session.add_all([
+        ContactMessage(created_at=BASE + timedelta(minutes=i // 2), name=f"Sender {i}",
+                       email=f"s{i}@example.com", subject="Hello" if i % 3 else "Spam", message="...")
+        for i in range(n)
+    ])
+    db.session.commit()
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(BASE, 42)) == (BASE, 42)
+    assert decode_cursor("not-a-cursor") is None
+
+
+def test_keyset_pages_cover_every_row_once(app, admin_client):
+    _messages(125)  # pairs share a created_at, so ties are broken by id
+    seen, after = [], None
+    while True:
+        url = "/admin/messages?format=json&limit=20" + (f"&after={after}" if after else "")
+        body = admin_client.get(url).get_json()
+        seen.extend(r["id"] for r in body["rows"])
+        after = body["next"]
+        if not after:
+            break
+    assert body["total"] == 125
+    assert len(seen) == len(set(seen)) == 125
+    assert body["columns"] == ["id", "created_at", "name", "email", "subject", "message"]
+
+
+def test_search_and_date_range(app, admin_client):
+    _messages(30)
+    body = admin_client.get("/admin/messages?format=json&q=spam").get_json()
+    assert body["total"] == 10
+    day = (BASE + timedelta(days=1)).strftime("%Y-%m-%d")
+    assert admin_client.get(f"/admin/messages?format=json&from={day}").get_json()["total"] == 0
+    assert admin_client.get(f"/admin/messages?format=json&to={day}").get_json()["total"] == 30
+
+
+def test_boolean_filters(app, admin_client):
+    db.session.add(User(name="Pending", email="p@example.com", username="pending", password_hash="x"))
+    db.session.commit()
+    body = admin_client.get("/admin/users?format=json&email_confirmed=0").get_json()
+    assert [r["username"] for r in body["rows"]] == ["pending"]
+    assert admin_client.get("/admin/users?format=json&is_admin=1").get_json()["total"] == 1
+
+
+def test_status_facets(app, admin_client):
+    db.session.add_all([
+        DepositPayment(full_name=f"D{i}", email=f"d{i}@example.com", amount_cents=100,
+                       status="paid" if i % 3 else "pending")
+        for i in range(9)
+    ])
+    db.session.commit()
+    body = admin_client.get("/admin/deposits?format=json&status=pending").get_json()
+    assert body["facets"] == {"paid": 6, "pending": 3}
+    assert body["total"] == 3
+    assert {r["status"] for r in body["rows"]} == {"pending"}
+
+    html = admin_client.get("/admin/deposits?status=pending").get_data(as_text=True)
+    assert "Pending (3)" in html and "Paid (6)" in html
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import PerfEvent
+from app.utils.perf_log import _param_types, daily_summary
+
+
+@pytest.fixture
+def perf(app):
+    perf = app.extensions["perf_log"]
+    perf.slow_query_ms = perf.slow_request_ms = 0  # everything is "slow"
+    yield perf
+    perf.slow_query_ms, perf.slow_request_ms = 100, 1000
+
+
+def test_slow_statements_and_requests_are_logged_without_values(admin_client, perf):
+    admin_client.get("/admin/activity-log?q=hunter2-secret")
+
+    events = PerfEvent.query.all()
+    kinds = {e.kind for e in events}
+    assert kinds == {"query", "request"}
+    request_event = next(e for e in events if e.kind == "request")
+    assert (request_event.endpoint, request_event.method, request_event.status_code) == ("admin.activity_log", "GET", 200)
+    assert request_event.statement == "/admin/activity-log"
+
+    search = [e for e in events if e.kind == "query" and "LIKE" in (e.statement or "").upper()]
+    assert search and all(e.endpoint == "admin.activity_log" for e in search)
+    assert search[0].params.startswith("(str")
+    assert not any("hunter2" in (e.statement or "") + (e.params or "") for e in events)
+    # The log's own writes are not logged
+    assert not any("perf_events" in (e.statement or "") for e in events)
+
+
+def test_slow_requests_store_the_route_not_the_path(client, perf):
+    client.get("/auth/confirm/secret-confirmation-token")
+    event = PerfEvent.query.filter_by(kind="request").one()
+    assert event.statement == "/auth/confirm/<token>"
+    assert not PerfEvent.query.filter(PerfEvent.statement.contains("secret-confirmation-token")).count()
+
+
+def test_fast_requests_are_not_logged(client, app):
+    client.get("/faq")
+    assert PerfEvent.query.count() == 0
+
+
+def test_full_queue_drops_events(app, perf):
+    import queue
+
+    perf._queue = queue.Queue(2)
+    for _ in range(5):
+        perf.record("query", 5.0, statement="SELECT ?")
+    assert perf.flush() == 2
+    assert PerfEvent.query.count() == 2
+
+
+def test_old_events_are_pruned(app):
+    perf = app.extensions["perf_log"]
+    db.session.add(PerfEvent(kind="query", duration_ms=500, created_at=datetime.now() - timedelta(days=30)))
+    db.session.commit()
+    perf._pruned_at = None
+    perf.record("query", 150.0, statement="SELECT ?")
+    perf.flush()
+    assert [e.duration_ms for e in PerfEvent.query] == [150.0]
+
+
+def test_daily_summary_and_admin_page(admin_client, app):
+    day = datetime(2026, 3, 1)
+    rows = [("query", "admin.dashboard", "SELECT count(*) FROM activity_logs", ms) for ms in (300, 500)]
+    rows += [("query", "public.index", "SELECT * FROM openings", 150),
+             ("request", "admin.dashboard", "/admin", 1200),
+             ("query", "admin.dashboard", "SELECT count(*) FROM activity_logs", 900)]
+    for i, (kind, endpoint, statement, ms) in enumerate(rows):
+        when = day + timedelta(hours=i) if i < 4 else day - timedelta(hours=1)  # last one is the day before
+        db.session.add(PerfEvent(kind=kind, endpoint=endpoint, statement=statement, duration_ms=ms, created_at=when))
+    db.session.commit()
+
+    summary = daily_summary(day, top=2)
+    assert [(r["endpoint"], r["count"], r["total_ms"]) for r in summary] == [
+        ("admin.dashboard", 1, 1200), ("admin.dashboard", 2, 800)]
+    assert daily_summary(day, kind="query")[0]["max_ms"] == 500
+
+    page = admin_client.get("/admin/perf?day=2026-03-01&kind=query&min_ms=200")
+    assert page.status_code == 200
+    assert page.data.count(b"SELECT count(*) FROM activity_logs") >= 2
+    requests_only = admin_client.get("/admin/perf?day=2026-03-01&kind=request")
+    assert b"/admin</td>" in requests_only.data and b"FROM openings" not in requests_only.data
+
+
+def test_param_types():
+    assert _param_types((1, "a", None), False) == "(int, str, NoneType)"
+    assert _param_types([{"a": 1}, {"a": 2}], True) == "2 × (int)"
+    assert _param_types((), False) is None
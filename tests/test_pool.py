@@ -0,0 +1,58 @@
+import threading
+
+from sqlalchemy import create_engine, text
+
+from app.config import _pool_topology
+from app.utils import metrics
+from app.utils.pool_stats import InstrumentedQueuePool, pool_status
+
+
+def test_topology_fits_budget():
+    t = _pool_topology({"WEB_CONCURRENCY": "2", "GUNICORN_THREADS": "2", "DB_MAX_CONNECTIONS": "20"})
+    assert (t["pool_size"], t["max_overflow"], t["warnings"]) == (2, 2, [])
+
+    t = _pool_topology({"WEB_CONCURRENCY": "4", "GUNICORN_THREADS": "8", "DB_MAX_CONNECTIONS": "20"})
+    assert t["pool_size"] == 5 and t["max_overflow"] == 0
+    assert any("queue for connections" in w for w in t["warnings"])
+
+
+def test_topology_warns_when_overrides_exceed_budget():
+    t = _pool_topology({"WEB_CONCURRENCY": "3", "DB_MAX_CONNECTIONS": "20", "DB_POOL_SIZE": "5", "DB_MAX_OVERFLOW": "10"})
+    assert any("can open 45 connections" in w for w in t["warnings"])
+
+
+def test_instrumented_pool_records_waits(tmp_path):
+    metrics.reset()
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=1, pool_timeout=0.2)
+    held = [engine.connect() for _ in range(2)]
+    assert pool_status(engine)["overflow"] == 1
+
+    errors = []
+
+    def starve():
+        try:
+            engine.connect()
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+    t = threading.Thread(target=starve)
+    t.start()
+    t.join()
+    for conn in held:
+        conn.close()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    engine.dispose()
+
+    snap = metrics.snapshot()
+    assert errors == ["TimeoutError"]
+    assert snap["counters"]["db.pool.timeouts"] == 1
+    assert snap["counters"]["db.pool.overflow_checkouts"] >= 1
+    assert snap["histograms"]["db.pool.checkout_wait_ms"]["count"] == 3
+
+
+def test_metrics_endpoint(admin_client):
+    r = admin_client.get("/admin/metrics.json")
+    assert r.status_code == 200
+    assert "db_pools" in r.get_json()
@@ -0,0 +1,43 @@
+from app.blueprints import public
+from app.extensions import db
+from app.utils import prefork
+
+
+def test_warm_shared_state_compiles_templates(app, client):
+    app.config["SITE_URL"] = "https://example.org"
+    public.sitemap_xml.cache_clear()
+    warmed = prefork.warm_shared_state(app)
+    assert warmed["templates"] > 20
+    cached = {key[1] for key in app.jinja_env.cache.keys()}
+    assert {"base.html", "index.html", "admin/activity_log.html"} <= cached
+
+    resp = client.get("/sitemap.xml")
+    assert b"<loc>https://example.org/openings</loc>" in resp.data  # not the test client's localhost
+    assert public.sitemap_xml.cache_info().hits == 1  # served from the copy built before the fork
+    assert client.get("/manifest.json").get_json()["short_name"]
+
+
+def test_after_fork_replaces_inherited_pools(app):
+    db.session.execute(db.text("SELECT 1"))
+    before = db.engine.pool
+    prefork.after_fork(app)
+    assert db.engine.pool is not before
+    assert db.session.execute(db.text("SELECT 1")).scalar() == 1
+
+
+def test_after_fork_starts_background_loops(app, monkeypatch):
+    started = []
+    for name in prefork.BACKGROUND_WORKERS:
+        monkeypatch.setattr(app.extensions[name], "start", lambda name=name: started.append(name))
+    prefork.after_fork(app)
+    assert started == list(prefork.BACKGROUND_WORKERS)
+
+
+def test_stripe_processor_start_sweeps_immediately(app, monkeypatch):
+    processor = app.extensions["stripe_events"]
+    monkeypatch.setattr(processor, "_ensure_thread", lambda: None)
+    processor.start()  # STRIPE_EVENTS_BACKGROUND=0 in tests: nothing to start
+    assert not processor._wake.is_set()
+    monkeypatch.setattr(processor, "background", True)
+    processor.start()
+    assert processor._wake.is_set()  # the loop's first wait returns at once
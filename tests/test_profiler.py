@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+
+import pytest
+
+from app.utils.profiler import StackSampler, to_speedscope
+
+
+@pytest.fixture
+def profiler(app, tmp_path):
+    app.config["PROFILE_DIR"] = str(tmp_path)
+    app.config["PROFILE_INTERVAL_MS"] = 1
+    return app.extensions["profiler"]
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_collects_the_target_threads_stack():
+    sampler = StackSampler(threading.get_ident(), 0.001).start()
+    _busy(0.05)
+    samples = sampler.stop()
+    busy = {stack: n for stack, n in samples.items() if "_busy (" in stack}
+    assert sum(busy.values()) > 5
+    assert all(stack.index("test_sampler_collects") < stack.index("_busy") for stack in busy)
+
+
+def test_off_by_default(app, client, profiler):
+    assert profiler.state() is None
+    client.get("/faq")
+    assert profiler.profiles() == []
+
+
+def test_admin_starts_profiling_and_downloads_profiles(app, admin_client, profiler):
+    @app.get("/_test/slow")
+    def _slow():
+        _busy(0.05)
+        return "ok"
+
+    resp = admin_client.post("/admin/profiles/start", data={"endpoints": ["_slow"], "rate": "100", "minutes": "5"})
+    assert resp.status_code == 302
+    assert profiler.state()["endpoints"] == ["_slow"]
+
+    admin_client.get("/faq")  # not selected
+    admin_client.get("/_test/slow")
+    [captured] = profiler.profiles()
+    assert captured["endpoint"] == "_slow" and captured["duration_ms"] >= 50
+
+    page = admin_client.get("/admin/profiles")
+    assert b"Profiling is on" in page.data and captured["name"].encode() in page.data
+
+    collapsed = admin_client.get(f"/admin/profiles/{captured['name']}")
+    assert b"_slow (" in collapsed.data
+    speedscope = json.loads(admin_client.get(f"/admin/profiles/{captured['name']}?format=speedscope").data)
+    assert speedscope["profiles"][0]["type"] == "sampled"
+    assert admin_client.get("/admin/profiles/..%2Fcontrol.json").status_code == 404
+
+    admin_client.post("/admin/profiles/stop")
+    assert profiler.state() is None
+
+
+def test_expired_switch_is_off(profiler):
+    profiler.enable([], 1.0, minutes=-1, by="admin@example.com")
+    assert profiler.state() is None
+
+
+def test_keeps_newest_profiles(app, profiler):
+    from collections import Counter
+
+    app.config["PROFILE_KEEP"] = 3
+    for i in range(5):
+        profiler.save(Counter({"a;b": i + 1}), "public.faq", 10 + i)
+    assert len(profiler.profiles()) == 3
+
+
+def test_speedscope_conversion():
+    doc = to_speedscope("main;handler;query 3\nmain;render 1\n", "p", 5)
+    assert [f["name"] for f in doc["shared"]["frames"]] == ["main", "handler", "query", "render"]
+    assert doc["profiles"][0]["samples"] == [[0, 1, 2], [0, 3]]
+    assert doc["profiles"][0]["weights"] == [15, 5] and doc["profiles"][0]["endValue"] == 20
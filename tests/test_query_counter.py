@@ -0,0 +1,59 @@
+import pytest
+
+from app.extensions import db
+from app.models import ActivityLog, User
+from app.utils.query_counter import assert_max_queries, count_queries, normalize
+
+
+def _logs_from_distinct_users(n):
+    users = [User(name=f"U{i}", email=f"u{i}@example.com", username=f"u{i}", password_hash="x") for i in range(n)]
+    db.session.add_all(users)
+    db.session.commit()
+    db.session.add_all([ActivityLog(action="login_success", category="auth", user_id=u.id) for u in users])
+    db.session.commit()
+    db.session.expunge_all()  # nothing cached in the identity map
+
+
+def test_normalize_folds_literals_and_in_lists():
+    a = normalize("SELECT * FROM users WHERE id = 5 AND name = 'x'")
+    assert a == normalize("SELECT *  FROM users\n WHERE id = 17 AND name = 'it''s'")
+    assert normalize("WHERE id IN (?, ?, ?)") == normalize("WHERE id IN (?)")
+
+
+def test_activity_log_loads_users_with_the_page(admin_client):
+    _logs_from_distinct_users(20)
+    with assert_max_queries(10) as qlog:
+        resp = admin_client.get("/admin/activity-log")
+    assert resp.status_code == 200
+    assert b"u19@example.com" in resp.data
+    assert resp.headers["X-Query-Count"] == str(qlog.count)
+    assert "X-Query-N1" not in resp.headers
+    assert not [sql for sql, _ in qlog.suspects(5) if "FROM users" in sql]
+
+
+def test_public_pages_budget(client):
+    for path, budget in (("/", 4), ("/openings", 3), ("/stories", 3)):
+        with assert_max_queries(budget):
+            assert client.get(path).status_code == 200
+
+
+def test_repeated_statement_flags_n_plus_one(app, client):
+    _logs_from_distinct_users(6)
+
+    @app.get("/_test/n-plus-one")
+    def _n_plus_one():
+        return ",".join(log.user.email for log in ActivityLog.query.all())
+
+    resp = client.get("/_test/n-plus-one")
+    assert resp.headers["X-Query-N1"] == "1"
+    assert int(resp.headers["X-Query-Count"]) >= 7
+
+
+def test_assert_max_queries_reports_statements(app):
+    with pytest.raises(AssertionError, match=r"2 queries executed, expected at most 1:\n   2 × SELECT count"):
+        with assert_max_queries(1):
+            ActivityLog.query.count()
+            ActivityLog.query.count()
+    with count_queries() as outer, count_queries() as inner:
+        ActivityLog.query.count()
+    assert outer.count == inner.count == 1
@@ -0,0 +1,161 @@
+"""Query-plan regression tests for the hot list and dashboard queries.
+
+Each named query is EXPLAINed against a database filled to a realistic
+size and must not fall back to a full sequential scan of its table (or,
+on SQLite, to sorting the whole match set for ORDER BY ... LIMIT).
+Runs on in-memory SQLite by default; set EXPLAIN_DATABASE_URL to a
+throwaway Postgres database to check the Postgres planner instead.
+"""
+
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import Session
+from werkzeug.datastructures import MultiDict
+
+from app.blueprints.admin import DEPOSITS_VIEW, INTEREST_VIEW, MESSAGES_VIEW, TOURS_VIEW, USERS_VIEW
+from app.extensions import db
+from app.models import (
+    ActivityLog, Application, ContactMessage, DepositPayment, InterestSignup, Opening, Story, TourRequest, User,
+)
+from app.utils.changefeed import FEEDS
+from app.utils.listview import encode_cursor
+
+ROWS = {
+    "openings": 2_000,
+    "stories": 5_000,
+    "activity_logs": 50_000,
+    "applications": 10_000,
+    "contact_messages": 10_000,
+    "tour_requests": 10_000,
+    "deposit_payments": 5_000,
+    "users": 5_000,
+    "interest_signups": 5_000,
+}
+
+_now = datetime.now(timezone.utc)
+_today = _now.replace(hour=0, minute=0, second=0, microsecond=0)
+_page_two = MultiDict({"after": encode_cursor((_now - timedelta(days=30)).replace(tzinfo=None), 1)})
+
+
+def _named_queries():
+    """The statements the views run, keyed by where they run."""
+    return {
+        "public.index openings preview": select(Opening).filter_by(status="published").order_by(Opening.created_at.desc()).limit(3),
+        "public.openings": select(Opening).filter_by(status="published").order_by(Opening.created_at.desc()).limit(100),
+        "public.stories": select(Story).filter_by(status="approved").order_by(Story.created_at.desc()).limit(50),
+        "admin.stories": select(Story).filter_by(status="pending").order_by(Story.created_at.desc()).limit(300),
+        "admin.dashboard today_views": select(func.count()).select_from(ActivityLog).where(
+            ActivityLog.created_at >= _today, ActivityLog.category == "page_view"),
+        "admin.dashboard recent_activity": select(ActivityLog).where(
+            ActivityLog.category.in_(["form_submit", "payment", "auth", "admin_action"])
+        ).order_by(ActivityLog.created_at.desc()).limit(8),
+        "admin.applications": select(Application).order_by(Application.created_at.desc()).limit(200),
+        "admin.messages": MESSAGES_VIEW.statement(MultiDict()),
+        "admin.messages page 2": MESSAGES_VIEW.statement(_page_two),
+        "admin.users": USERS_VIEW.statement(MultiDict()),
+        "admin.tour_requests": TOURS_VIEW.statement(_page_two),
+        "admin.interest_list": INTEREST_VIEW.statement(_page_two),
+        "admin.deposits": DEPOSITS_VIEW.statement(MultiDict()),
+        "admin.deposits pending facet": DEPOSITS_VIEW.statement(MultiDict({"status": "pending"})),
+        "admin.deposits facet counts": DEPOSITS_VIEW.facet_statement(MultiDict()),
+        "deposits pending": select(DepositPayment).filter_by(status="pending"),
+        "admin.change_feed": FEEDS["applications"].statement(
+            ((_now - timedelta(days=30)).replace(tzinfo=None), 1), 1000, _now.replace(tzinfo=None)),
+    }
+
+
+def _populate(session) -> None:
+    rnd = random.Random(27)
+
+    def ts():
+        return _now - timedelta(minutes=rnd.randrange(60 * 24 * 365))
+
+    def bulk(model, rows):
+        session.execute(insert(model), rows)
+
+    bulk(Opening, [{
+        "created_at": ts(), "updated_at": _now, "title": f"Room {i}", "slug": f"room-{i}",
+        "status": "published" if i % 20 == 0 else rnd.choice(("draft", "archived")),
+        "beds_available": 1, "hide_price": True,
+    } for i in range(ROWS["openings"])])
+    bulk(Story, [{
+        "created_at": ts(), "title": f"Story {i}", "slug": f"story-{i}", "body": "...",
+        "status": rnd.choice(("approved", "rejected", "rejected", "rejected")) if i % 10 else "pending",
+    } for i in range(ROWS["stories"])])
+    bulk(ActivityLog, [{
+        "created_at": ts(), "action": "page_view:/",
+        "category": rnd.choice(("page_view",) * 8 + ("form_submit", "auth", "admin_action", "payment")),
+        "level": "info",
+    } for _ in range(ROWS["activity_logs"])])
+    bulk(Application, [{
+        "created_at": ts(), "updated_at": _now, "full_name": f"A {i}", "email": f"a{i}@example.com", "status": "new",
+    } for i in range(ROWS["applications"])])
+    bulk(ContactMessage, [{
+        "created_at": ts(), "name": f"M {i}", "email": f"m{i}@example.com", "subject": "s", "message": "m",
+    } for i in range(ROWS["contact_messages"])])
+    bulk(TourRequest, [{
+        "created_at": ts(), "name": f"T {i}", "email": f"t{i}@example.com",
+    } for i in range(ROWS["tour_requests"])])
+    bulk(DepositPayment, [{
+        "created_at": ts(), "full_name": f"D {i}", "email": f"d{i}@example.com", "amount_cents": 100000,
+        "status": "pending" if i % 25 == 0 else "paid",
+    } for i in range(ROWS["deposit_payments"])])
+    bulk(User, [{
+        "created_at": ts(), "updated_at": _now, "name": f"U {i}", "username": f"u{i}", "email": f"u{i}@example.com",
+        "password_hash": "x", "is_admin": False, "email_confirmed": bool(i % 2),
+    } for i in range(ROWS["users"])])
+    bulk(InterestSignup, [{"created_at": ts(), "email": f"i{i}@example.com"} for i in range(ROWS["interest_signups"])])
+    session.commit()
+    session.execute(text("ANALYZE"))
+    session.commit()
+
+
+def _plan_regressions(session, stmt) -> list[str]:
+    dialect = session.get_bind().dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "postgresql":
+        plan = session.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        found = []
+
+        def walk(node):
+            if node.get("Node Type") == "Seq Scan":
+                found.append(node.get("Relation Name", "?"))
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk(plan[0]["Plan"])
+        return found
+    rows = session.execute(text("EXPLAIN QUERY PLAN " + sql)).all()
+    return [
+        r[-1] for r in rows
+        if (r[-1].startswith("SCAN ") and " USING " not in r[-1]) or r[-1].startswith("USE TEMP B-TREE FOR ORDER BY")
+    ]
+
+
+@pytest.fixture(scope="module")
+def plan_session():
+    url = os.environ.get("EXPLAIN_DATABASE_URL")
+    if url:
+        engine = create_engine(url)
+        db.metadata.drop_all(engine)
+    else:
+        engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        _populate(session)
+        yield session
+    if url:
+        db.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", list(_named_queries()))
+def test_no_sequential_scan(plan_session, name):
+    stmt = _named_queries()[name]
+    assert _plan_regressions(plan_session, stmt) == [], f"{name} regressed to a sequential scan"
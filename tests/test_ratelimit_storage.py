@@ -0,0 +1,78 @@
+import multiprocessing
+import time
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from app import create_app
+from app.utils.ratelimit_storage import SQLiteStorage
+
+
+@pytest.fixture
+def uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'ratelimit.db'}"
+
+
+def test_scheme_registered(uri):
+    assert isinstance(storage_from_string(uri), SQLiteStorage)
+
+
+def test_counts_expiry_and_clear(uri):
+    storage = SQLiteStorage(uri)
+    assert storage.incr("k", 60) == 1
+    assert storage.incr("k", 60, amount=2) == 3
+    assert storage.get("k") == 3
+    assert time.time() < storage.get_expiry("k") <= time.time() + 60
+    storage.clear("k")
+    assert storage.get("k") == 0
+    assert storage.check()
+
+
+def test_expired_window_restarts_and_is_cleaned_up(uri):
+    storage = SQLiteStorage(uri, cleanup_interval=0)
+    storage.incr("short", 0.05)
+    storage.incr("short", 0.05)
+    time.sleep(0.1)
+    assert storage.get("short") == 0
+    assert storage.incr("short", 60) == 1  # new window, not 3
+    storage.incr("other", 0.01)
+    time.sleep(0.05)
+    storage.incr("trigger", 60)  # any hit may sweep expired rows
+    count = storage._conn().execute("SELECT count(*) FROM counters WHERE key = 'other'").fetchone()[0]
+    assert count == 0
+
+
+def _hammer(uri, n):
+    storage = SQLiteStorage(uri)
+    limiter = FixedWindowRateLimiter(storage)
+    item = parse("100000/minute")
+    for _ in range(n):
+        limiter.hit(item, "login", "1.2.3.4")
+
+
+def test_counts_are_exact_across_processes(uri):
+    SQLiteStorage(uri)  # create the schema before the workers race
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_hammer, args=(uri, 250)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+    stats = FixedWindowRateLimiter(SQLiteStorage(uri)).get_window_stats(parse("100000/minute"), "login", "1.2.3.4")
+    assert 100000 - stats.remaining == 1000
+
+
+def test_login_limit_shared_between_workers(uri, monkeypatch):
+    monkeypatch.setenv("RATELIMIT_STORAGE_URI", uri)
+    workers = [create_app(), create_app()]
+    for app in workers:
+        app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    codes = [
+        workers[i % 2].test_client().post("/auth/login", data={"email": "x@example.com", "password": "nope"}).status_code
+        for i in range(6)
+    ]
+    assert 429 not in codes[:5]
+    assert codes[5] == 429
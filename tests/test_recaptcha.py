@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from app.models import ContactMessage
+from app.utils import recaptcha
+
+
+class StubVerifier(ThreadingHTTPServer):
+    """Local stand-in for Google's siteverify: "slow…" tokens stall, "good…" tokens pass once."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.tokens: list[str] = []
+        self.connections = 0
+        self.delay = 0.5
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/siteverify"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self) -> None:
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        token = form["response"][0]
+        self.server.tokens.append(token)
+        if token.startswith("slow"):
+            time.sleep(self.server.delay)
+        body = json.dumps({"success": token.startswith("good") and self.server.tokens.count(token) == 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stub(app):
+    server = StubVerifier()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app.config.update(
+        RECAPTCHA_SITE_KEY="site", RECAPTCHA_SECRET_KEY="secret", RECAPTCHA_VERIFY_URL=server.url,
+        RECAPTCHA_READ_TIMEOUT=0.2, RECAPTCHA_BREAKER_FAILURES=2, RECAPTCHA_BREAKER_COOLDOWN=60,
+    )
+    recaptcha.reset()
+    yield server
+    recaptcha.reset()
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive_and_token_cache(app, stub):
+    assert recaptcha.verify("good-1")
+    assert recaptcha.verify("good-1")
+    assert recaptcha.verify("good-2")
+    assert not recaptcha.verify("bad-1")
+    assert stub.tokens == ["good-1", "good-2", "bad-1"]
+    assert stub.connections == 1
+
+
+def test_rerendered_form_does_not_reverify(app, client, stub):
+    data = {"name": "N", "email": "n@example.com", "subject": "Hi", "recaptcha_token": "good-form"}
+    assert client.post("/contact", data=data).status_code == 400  # missing message
+    assert client.post("/contact", data={**data, "message": "hello"}).status_code == 302
+    assert stub.tokens == ["good-form"]
+    assert ContactMessage.query.count() == 1
+
+
+def test_token_is_not_replayable_after_submit(app, client, stub):
+    data = {"name": "N", "email": "n@example.com", "subject": "Hi", "message": "hello", "recaptcha_token": "good-once"}
+    assert client.post("/contact", data=data).status_code == 302
+    assert client.post("/contact", data=data).status_code == 400  # cache entry gone, Google refuses the reuse
+    assert ContactMessage.query.count() == 1
+
+
+def test_cached_token_is_scoped_to_the_form(app, client, stub):
+    data = {"name": "N", "email": "n@example.com", "recaptcha_token": "good-scoped"}
+    assert client.post("/contact", data={**data, "subject": "Hi"}).status_code == 400  # verified, then cached
+    assert client.post("/tour", data=data).status_code == 400  # another form re-verifies
+    assert stub.tokens == ["good-scoped", "good-scoped"]
+
+
+def test_breaker_opens_on_slow_verifier(app, stub):
+    assert not recaptcha.verify("slow-1")
+    assert not recaptcha.verify("slow-2")
+    t0 = time.perf_counter()
+    assert not recaptcha.verify("good-3")  # circuit open: fail closed without calling out
+    assert time.perf_counter() - t0 < 0.1
+    app.config["RECAPTCHA_FAIL_OPEN"] = True
+    assert recaptcha.verify("good-4")
+    assert stub.tokens == ["slow-1", "slow-2"]
+
+    recaptcha.breaker.open_until = 0  # cooldown over: half-open, next call goes through
+    assert recaptcha.verify("good-5")
+    assert stub.tokens[-1] == "good-5"
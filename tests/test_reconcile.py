@@ -0,0 +1,73 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.cli import reconcile_deposits_cmd
+from app.extensions import db
+from app.models import ActivityLog, DepositPayment
+from app.utils.reconcile import DepositReconciler
+
+OLD = datetime.now(timezone.utc) - timedelta(hours=2)
+
+
+def _deposit(session_id, status="pending", created_at=OLD):
+    return DepositPayment(full_name="P", email="p@example.com", stripe_session_id=session_id,
+                          amount_cents=100000, status=status, created_at=created_at)
+
+
+def test_reconcile_settles_missed_payments(app, stripe_stub, tmp_path, monkeypatch):
+    sent = []
+    monkeypatch.setattr("app.utils.mailer.send_email", lambda to_email, subject, body: sent.append((to_email, subject)))
+    stripe_stub.add_session("cs_paid", status="complete", payment_status="paid", payment_intent="pi_1")
+    stripe_stub.add_session("cs_expired", status="expired")
+    stripe_stub.add_session("cs_open")
+    stripe_stub.add_session("cs_fresh", status="complete", payment_status="paid")
+    stripe_stub.add_session("cs_done", status="complete", payment_status="paid")
+    db.session.add_all([
+        _deposit("cs_paid"), _deposit(None),  # no session id: nothing to look up
+        _deposit("cs_expired"), _deposit("cs_open"), _deposit("cs_missing"),
+        _deposit("cs_fresh", created_at=datetime.now(timezone.utc)),  # inside the grace period
+        _deposit("cs_done", status="paid"),
+    ])
+    db.session.commit()
+
+    report_path = tmp_path / "report.json"
+    result = app.test_cli_runner().invoke(
+        reconcile_deposits_cmd, ["--batch", "2", "--concurrency", "3", "--report", str(report_path)]
+    )
+    assert result.exit_code == 1  # cs_missing could not be looked up
+    assert "4 pending deposit(s) checked: 1 paid, 1 expired, 1 still open, 1 error(s)" in result.output
+
+    report = json.loads(report_path.read_text())
+    assert report["updated"] == 2
+    assert [e["id"] for e in report["errors"]] == [DepositPayment.query.filter_by(stripe_session_id="cs_missing").one().id]
+
+    db.session.expire_all()
+    by_session = {d.stripe_session_id: (d.status, d.stripe_payment_intent) for d in DepositPayment.query}
+    assert by_session["cs_paid"] == ("paid", "pi_1")
+    assert by_session["cs_expired"] == ("expired", None)
+    assert by_session["cs_open"][0] == by_session["cs_fresh"][0] == "pending"
+    assert ActivityLog.query.filter_by(category="payment").count() == 2
+    assert [to for to, _ in sent] == [app.config.get("NOTIFY_EMAIL"), "p@example.com"]  # only cs_paid was newly paid
+
+    gets = [path for method, path in stripe_stub.requests if method == "GET"]
+    assert sorted(p.rsplit("/", 1)[1] for p in gets) == ["cs_expired", "cs_missing", "cs_open", "cs_paid"]
+    assert stripe_stub.connections <= 3  # pooled: at most one connection per lookup thread
+
+
+def test_reconcile_requires_stripe_key(app):
+    result = app.test_cli_runner().invoke(reconcile_deposits_cmd, [])
+    assert result.exit_code != 0
+    assert "STRIPE_SECRET_KEY" in result.output
+
+
+def test_rows_settled_meanwhile_are_not_logged_or_notified(app, monkeypatch):
+    sent = []
+    monkeypatch.setattr("app.utils.mailer.send_email", lambda **kw: sent.append(kw))
+    raced, missed = _deposit("cs_raced", status="paid"), _deposit("cs_missed")  # the webhook settled cs_raced first
+    db.session.add_all([raced, missed])
+    db.session.commit()
+
+    changes = [{"id": d.id, "status": "paid", "payment_intent": None} for d in (raced, missed)]
+    assert DepositReconciler(client=None)._apply(changes) == 1
+    assert [a.resource_id for a in ActivityLog.query.filter_by(action="deposit_paid")] == [missed.id]
+    assert len(sent) == 2 and sent[1]["to_email"] == "p@example.com"
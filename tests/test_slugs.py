@@ -0,0 +1,75 @@
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Opening, Story
+from app.utils import save_with_unique_slug, unique_slug
+
+
+def _story(slug, title="My story"):
+    return Story(title=title, slug=slug, body="x" * 60, status="pending")
+
+
+def test_unique_slug_picks_next_suffix_in_one_query(app):
+    db.session.add_all([_story("my-story"), _story("my-story-2"), _story("my-story-3"), _story("my-story-time")])
+    db.session.commit()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        assert unique_slug(Story, "my-story") == "my-story-4"
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert len(statements) == 1
+    assert unique_slug(Story, "fresh") == "fresh"
+
+
+def test_unique_slug_shared_across_models_and_excludes_self(app):
+    row = Opening(title="Room", slug="room", beds_available=1)
+    db.session.add(row)
+    db.session.commit()
+    assert unique_slug(Opening, "room") == "room-2"
+    assert unique_slug(Opening, "room", exclude_id=row.id) == "room"
+    assert unique_slug(Story, "room") == "room"
+
+
+def test_save_retries_after_integrity_error(app, monkeypatch):
+    db.session.add(_story("my-story"))
+    db.session.commit()
+
+    import app.utils as utils
+
+    real = utils.unique_slug
+    calls = []
+
+    def stale_first(model, base, exclude_id=None):
+        calls.append(base)
+        # Simulate a concurrent submission winning the race for the first pick.
+        return "my-story" if len(calls) == 1 else real(model, base, exclude_id)
+
+    monkeypatch.setattr(utils, "unique_slug", stale_first)
+    story = save_with_unique_slug(_story(None), "my-story")
+    assert story.slug == "my-story-2"
+    assert len(calls) == 2
+    assert Story.query.count() == 2
+
+
+def test_story_submit_allocates_suffix(client):
+    body = "This is a long enough story body for the validator to accept it. " * 2
+    for _ in range(3):
+        assert client.post("/stories/submit", data={"title": "My story", "body": body}).status_code == 302
+    assert sorted(s.slug for s in Story.query) == ["my-story", "my-story-2", "my-story-3"]
+
+
+def test_opening_edit_keeps_slug_and_fields(admin_client):
+    form = {"title": "Sunny room", "slug": "sunny-room", "beds_available": "2", "status": "published"}
+    assert admin_client.post("/admin/openings/new", data=form).status_code == 302
+    assert admin_client.post("/admin/openings/new", data=form).status_code == 302
+    first, second = Opening.query.order_by(Opening.id).all()
+    assert (first.slug, second.slug) == ("sunny-room", "sunny-room-2")
+
+    edit = dict(form, title="Renamed", slug="sunny-room")
+    assert admin_client.post(f"/admin/openings/{second.id}/edit", data=edit).status_code == 302
+    db.session.expire_all()
+    row = db.session.get(Opening, second.id)
+    assert (row.title, row.slug) == ("Renamed", "sunny-room-2")
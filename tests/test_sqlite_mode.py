@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.extensions import db
+from app.models import ActivityLog
+from app.utils import log_activity
+from app.utils.sqlite_mode import is_sqlite_file
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'prod.db'}")
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    yield app
+    app.extensions["sqlite_writer"].stop()
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_is_sqlite_file():
+    assert is_sqlite_file("sqlite:///local.db")
+    assert is_sqlite_file("sqlite:////var/data/app.db")
+    assert not is_sqlite_file("sqlite://")
+    assert not is_sqlite_file("sqlite:///:memory:")
+    assert not is_sqlite_file("postgresql+psycopg://u@h/db")
+
+
+def test_pragmas_applied(file_app):
+    with file_app.app_context():
+        conn = db.session.connection()
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_activity_writes_go_through_writer(file_app):
+    writer = file_app.extensions["sqlite_writer"]
+
+    def hammer():
+        for _ in range(25):
+            with file_app.test_request_context("/x"):
+                log_activity(action="page_view:/x", category="page_view")
+
+    threads = [threading.Thread(target=hammer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.flush(timeout=10)
+
+    with file_app.app_context():
+        assert ActivityLog.query.count() == 100
+        assert ActivityLog.query.filter_by(path="/x", method="GET").count() == 100
+
+
+def test_worker_exit_drains_the_queue(file_app):
+    from app.utils import prefork
+
+    with file_app.test_request_context("/x"):
+        for _ in range(50):
+            log_activity(action="page_view:/x", category="page_view")
+    prefork.before_exit(file_app)  # gunicorn worker_exit: no flush() beforehand
+    with file_app.app_context():
+        assert ActivityLog.query.count() == 50
+
+
+def test_in_memory_has_no_writer(app):
+    assert "sqlite_writer" not in app.extensions
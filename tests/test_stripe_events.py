@@ -0,0 +1,126 @@
+import hashlib
+import hmac
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.cli import stripe_replay_cmd
+from app.extensions import db
+from app.models import ActivityLog, DepositPayment, StripeEvent
+
+FIXTURES = Path(__file__).parent / "fixtures" / "stripe"
+SECRET = "whsec_test_secret"
+
+
+def _signed(name: str) -> tuple[str, dict]:
+    """Fixture payload plus a Stripe-Signature header computed the way Stripe does."""
+    payload = (FIXTURES / f"{name}.json").read_text()
+    ts = int(time.time())
+    sig = hmac.new(SECRET.encode(), f"{ts}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return payload, {"Stripe-Signature": f"t={ts},v1={sig}", "Content-Type": "application/json"}
+
+
+def _deliver(client, name: str):
+    payload, headers = _signed(name)
+    return client.post("/stripe/webhook", data=payload, headers=headers)
+
+
+@pytest.fixture
+def deposits(app):
+    app.config.update(STRIPE_SECRET_KEY="sk_test_x", STRIPE_WEBHOOK_SECRET=SECRET)
+    rows = [
+        DepositPayment(full_name="Pat Doe", email="pat@example.com", stripe_session_id="cs_test_deposit1", amount_cents=100000),
+        DepositPayment(full_name="Sam Roe", email="sam@example.com", stripe_session_id="cs_test_deposit2", amount_cents=100000),
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def test_redelivery_is_recorded_once(app, client, deposits):
+    first = _deliver(client, "checkout_session_completed")
+    again = _deliver(client, "checkout_session_completed")
+    assert first.get_json() == {"status": "ok"}
+    assert again.status_code == 200 and again.get_json() == {"status": "duplicate"}
+
+    event = StripeEvent.query.one()
+    assert (event.event_id, event.status, event.attempts) == ("evt_1completed", "processed", 1)
+    db.session.refresh(deposits[0])
+    assert (deposits[0].status, deposits[0].stripe_payment_intent) == ("paid", "pi_test_deposit1")
+    assert ActivityLog.query.filter_by(action="deposit_paid").count() == 1
+
+
+def test_payment_after_local_expiry_is_applied(app, client, deposits):
+    deposits[0].status = "expired"  # the admin bulk action expires rows locally only
+    db.session.commit()
+    _deliver(client, "checkout_session_completed")
+
+    db.session.refresh(deposits[0])
+    assert deposits[0].status == "paid"
+    assert "expired -> paid" in ActivityLog.query.filter_by(action="deposit_paid").one().details
+
+
+def test_bad_signature_is_rejected(app, client, deposits):
+    payload, headers = _signed("checkout_session_completed")
+    resp = client.post("/stripe/webhook", data=payload.replace("paid", "unpaid"), headers=headers)
+    assert resp.status_code == 400
+    assert StripeEvent.query.count() == 0
+
+
+def test_events_apply_in_stripe_order(app, client, deposits, monkeypatch):
+    processor = app.extensions["stripe_events"]
+    monkeypatch.setattr(processor, "notify", lambda: None)  # queue only, as if the thread were busy
+    for name in ("charge_refunded", "checkout_session_expired", "customer_created", "checkout_session_completed"):
+        assert _deliver(client, name).status_code == 200
+    assert {e.status for e in StripeEvent.query} == {"pending"}
+
+    counts = processor.process_pending()
+    assert counts == {"processed": 3, "ignored": 1}
+    db.session.expire_all()
+    assert [d.status for d in DepositPayment.query.order_by(DepositPayment.id)] == ["refunded", "expired"]
+
+
+def test_replay_is_idempotent_and_recovers(app, client, deposits):
+    for name in ("checkout_session_completed", "charge_refunded"):
+        _deliver(client, name)
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(stripe_replay_cmd, ["--all"])
+    assert result.exit_code == 0
+    assert "2 event(s) replayed: 2 ignored" in result.output
+    db.session.expire_all()
+    assert db.session.get(DepositPayment, deposits[0].id).status == "refunded"
+
+    # Lost update (e.g. restored backup): replaying the stored events rebuilds the state.
+    deposits[0].status = "pending"
+    db.session.commit()
+    result = runner.invoke(stripe_replay_cmd, ["--all"])
+    assert "2 processed" in result.output
+    db.session.expire_all()
+    assert db.session.get(DepositPayment, deposits[0].id).status == "refunded"
+
+    # An event another worker is applying right now is left alone, even when named explicitly.
+    StripeEvent.query.filter_by(event_id="evt_1refunded").update({"status": "processing", "claimed_at": datetime.utcnow()})
+    db.session.commit()
+    result = runner.invoke(stripe_replay_cmd, ["evt_1refunded"])
+    assert "0 event(s) replayed: nothing to do" in result.output
+    assert StripeEvent.query.filter_by(event_id="evt_1refunded").one().status == "processing"
+
+
+def test_stale_claims_are_released(app, client, deposits):
+    processor = app.extensions["stripe_events"]
+    _deliver(client, "checkout_session_completed")
+    _deliver(client, "charge_refunded")
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+    # The worker applying these died: one has attempts left, the other is out of them.
+    StripeEvent.query.filter_by(event_id="evt_1completed").update(
+        {"status": "processing", "claimed_at": long_ago, "attempts": processor.max_attempts})
+    StripeEvent.query.filter_by(event_id="evt_1refunded").update({"status": "processing", "claimed_at": long_ago})
+    db.session.commit()
+
+    assert processor.process_pending() == {"ignored": 1}
+    statuses = {e.event_id: (e.status, e.error) for e in StripeEvent.query}
+    assert statuses["evt_1refunded"] == ("ignored", None)
+    assert statuses["evt_1completed"][0] == "failed" and "claim timed out" in statuses["evt_1completed"][1]
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+
+from sqlalchemy import func
+
+from app.cli import seed_synthetic_cmd
+from app.extensions import db
+from app.models import ActivityLog, Application, InterestSignup, Opening, Story, User
+from app.utils.synthetic import Generator, generate
+
+SMALL = {"users": 20, "activity": 3000, "applications": 200, "messages": 50, "tours": 50,
+         "interest": 50, "deposits": 20, "openings": 10, "stories": 30}
+
+
+def test_generate_fills_every_table(app):
+    counts = generate(SMALL, seed=7, end=date(2026, 1, 1), days=90, batch=500)
+    assert counts == SMALL
+    assert ActivityLog.query.count() == 3000 and Application.query.count() == 200
+    assert InterestSignup.query.count() == 50 and Opening.query.count() == 10
+
+    lo, hi = db.session.query(func.min(ActivityLog.created_at), func.max(ActivityLog.created_at)).one()
+    assert datetime(2025, 10, 3) <= lo and hi < datetime(2026, 1, 1)
+    by_category = dict(db.session.query(ActivityLog.category, func.count()).group_by(ActivityLog.category))
+    assert max(by_category, key=by_category.get) == "page_view"
+    assert ActivityLog.query.filter(ActivityLog.user_id.is_not(None)).count() > 0
+    # Skewed toward the end date: the last month is busier than the first
+    assert (ActivityLog.query.filter(ActivityLog.created_at >= datetime(2025, 12, 2)).count()
+            > 2 * ActivityLog.query.filter(ActivityLog.created_at < datetime(2025, 11, 2)).count())
+    assert all(o.photos for o in Opening.query)
+    assert Story.query.filter(Story.status != "pending", Story.reviewed_by.is_(None)).count() == 0
+
+
+def test_same_seed_same_rows():
+    end = datetime(2026, 1, 1)
+    a, b, c = Generator(3, end, 30), Generator(3, end, 30), Generator(4, end, 30)
+    rows_a = [a.application(i) for i in range(50)]
+    assert rows_a == [b.application(i) for i in range(50)]
+    assert rows_a != [c.application(i) for i in range(50)]
+
+
+def test_cli_scale_and_overrides(app):
+    result = app.test_cli_runner().invoke(
+        seed_synthetic_cmd, ["--scale", "0.0001", "--set", "users=5", "--set", "stories=0", "--end", "2026-01-01"]
+    )
+    assert result.exit_code == 0, result.output
+    assert User.query.count() == 5 and ActivityLog.query.count() == 100 and Story.query.count() == 0
+
+    bad = app.test_cli_runner().invoke(seed_synthetic_cmd, ["--set", "widgets=3"])
+    assert bad.exit_code != 0
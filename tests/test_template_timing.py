@@ -0,0 +1,52 @@
+import pytest
+from flask import render_template_string
+
+from app.extensions import db
+from app.models import Story
+from app.utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_page_render_and_base_fragments_are_timed(client):
+    assert client.get("/faq").status_code == 200
+
+    hists = metrics.snapshot()["histograms"]
+    assert hists["template.render.faq.html"]["count"] == 1
+    for fragment in ("base.analytics", "base.header", "base.footer", "base.recaptcha"):
+        assert hists[f"template.fragment.{fragment}"]["count"] == 1
+    assert hists["template.request_ms"]["count"] == 1
+    assert hists["template.request_ms"]["sum_ms"] >= hists["template.fragment.base.footer"]["sum_ms"]
+
+
+def test_counted_filters(client, app):
+    db.session.add(Story(title="Home", slug="home", body="line one\nline two", status="approved"))
+    db.session.commit()
+
+    page = client.get("/stories/home")
+    assert b"line one<br>line two" in page.data
+    assert metrics.snapshot()["counters"]["template.filter.nl2br"] == 1
+
+
+def test_timed_tag_in_string_template(app):
+    with app.test_request_context():
+        html = render_template_string('{% timed "demo" %}<b>{{ x }}</b>{% endtimed %}', x="<i>")
+    assert html == "<b>&lt;i&gt;</b>"
+    hists = metrics.snapshot()["histograms"]
+    assert hists["template.fragment.demo"]["count"] == 1
+    assert hists["template.render.string"]["count"] == 1
+
+
+def test_disabled_tag_still_renders(app):
+    app.jinja_env.template_timing = False
+    try:
+        with app.test_request_context():
+            assert render_template_string('{% timed "demo" %}ok{% endtimed %}') == "ok"
+    finally:
+        app.jinja_env.template_timing = True
+    assert "template.fragment.demo" not in metrics.snapshot()["histograms"]
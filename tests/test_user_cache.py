@@ -0,0 +1,60 @@
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import User
+from app.utils.user_cache import UserSnapshot, invalidate_user, load_user_snapshot
+
+
+def _user_selects(engine, fn):
+    seen = []
+
+    def listener(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return seen
+
+
+def test_snapshot_cached_between_requests(app, admin_client):
+    invalidate_user()
+    admin_client.get("/")
+    selects = _user_selects(db.engine, lambda: admin_client.get("/"))
+    assert selects == []
+
+
+def test_snapshot_lazy_model_and_writes(app, admin_client):
+    user = User.query.filter_by(email="admin@example.com").first()
+    invalidate_user()
+    snap = load_user_snapshot(user.id)
+    assert isinstance(snap, UserSnapshot)
+    assert (snap.name, snap.is_admin, snap.email_confirmed) == ("Admin", True, True)
+    assert snap.__dict__["_model"] is None
+    assert snap.email == "admin@example.com"  # non-snapshot field loads the row
+    snap.name = "Renamed"
+    db.session.commit()
+    assert db.session.get(User, user.id).name == "Renamed"
+
+
+def test_account_update_invalidates(app, admin_client):
+    admin_client.get("/auth/account")
+    r = admin_client.post("/auth/account", data={"profile-name": "New Name", "profile-submit_profile": "1"})
+    assert r.status_code == 302
+    user = User.query.filter_by(email="admin@example.com").first()
+    assert load_user_snapshot(user.id).name == "New Name"
+
+
+def test_make_admin_invalidates(app):
+    user = User(name="U", email="u@example.com", username="u_user", email_confirmed=True)
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+    assert load_user_snapshot(user.id).is_admin is False
+
+    result = app.test_cli_runner().invoke(args=["make-admin", "u@example.com"])
+    assert result.exit_code == 0
+    assert load_user_snapshot(user.id).is_admin is True
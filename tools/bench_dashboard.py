@@ -0,0 +1,141 @@
+"""Benchmark the admin dashboard counts: eight separate COUNTs vs one UNION ALL.
+
+Usage:
+  python tools/bench_dashboard.py                      # 10k, 100k, 1M rows on a temp SQLite file
+  python tools/bench_dashboard.py --rows 10000 --repeat 50
+  DATABASE_URL=postgresql://... python tools/bench_dashboard.py --rows 100000
+
+Rows are spread across every counted table (applications get the full
+count, the smaller tables a tenth of it). Each database is created from
+scratch, so point DATABASE_URL at a throwaway database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _populate(db, rows: int) -> None:
+    from sqlalchemy import insert
+    from app.models import Application, ContactMessage, DepositPayment, InterestSignup, Story, TourRequest
+
+    rnd = random.Random(rows)
+    now = datetime.now(timezone.utc)
+    batch = 10_000
+
+    def _bulk(model, n, make):
+        for start in range(0, n, batch):
+            db.session.execute(insert(model), [make(i) for i in range(start, min(n, start + batch))])
+        db.session.commit()
+
+    _bulk(Application, rows, lambda i: {
+        "created_at": now, "updated_at": now, "full_name": f"Applicant {i}",
+        "email": f"a{i}@example.com", "status": rnd.choice(("new", "reviewed", "approved", "rejected")),
+    })
+    small = max(1, rows // 10)
+    _bulk(ContactMessage, small, lambda i: {
+        "created_at": now, "name": f"Sender {i}", "email": f"m{i}@example.com", "subject": "Hi", "message": "Hello",
+    })
+    _bulk(TourRequest, small, lambda i: {"created_at": now, "name": f"Visitor {i}", "email": f"t{i}@example.com"})
+    _bulk(InterestSignup, small, lambda i: {"created_at": now, "email": f"i{i}@example.com"})
+    _bulk(Story, small, lambda i: {
+        "created_at": now, "title": f"Story {i}", "slug": f"story-{i}", "body": "Body",
+        "status": rnd.choice(("pending", "approved", "rejected")),
+    })
+    _bulk(DepositPayment, small, lambda i: {
+        "created_at": now, "full_name": f"Payer {i}", "email": f"d{i}@example.com", "amount_cents": 100000,
+        "status": rnd.choice(("pending", "paid", "failed")),
+    })
+
+
+def _legacy_counts():
+    from app.models import Application, ContactMessage, DepositPayment, InterestSignup, Story, TourRequest
+
+    return {
+        "new": Application.query.filter_by(status="new").count(),
+        "total": Application.query.count(),
+        "pending_stories": Story.query.filter_by(status="pending").count(),
+        "messages": ContactMessage.query.count(),
+        "tours": TourRequest.query.count(),
+        "interest": InterestSignup.query.count(),
+        "deposits_paid": DepositPayment.query.filter_by(status="paid").count(),
+        "deposits_pending": DepositPayment.query.filter_by(status="pending").count(),
+    }
+
+
+def _time(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+
+def run(rows: int, repeat: int) -> dict:
+    from app import create_app
+    from app.extensions import db
+    from app.utils.dashboard_stats import fetch_dashboard_counts, get_dashboard_counts, invalidate_dashboard_counts
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        t0 = time.perf_counter()
+        _populate(db, rows)
+        load_s = time.perf_counter() - t0
+
+        assert _legacy_counts() == fetch_dashboard_counts()
+        invalidate_dashboard_counts()
+        get_dashboard_counts()
+        result = {
+            "rows": rows,
+            "load_s": round(load_s, 2),
+            "separate_counts": _time(_legacy_counts, repeat),
+            "union_all": _time(fetch_dashboard_counts, repeat),
+            "cached": _time(get_dashboard_counts, repeat),
+        }
+        db.session.remove()
+        db.drop_all()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10000,100000,1000000", help="comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmpdir = None
+    if not os.environ.get("DATABASE_URL"):
+        tmpdir = tempfile.mkdtemp(prefix="bench-dashboard-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    print(f"{'rows':>9}  {'separate p50':>12}  {'union p50':>10}  {'cached p50':>10}  (ms)")
+    for rows in (int(r) for r in args.rows.split(",")):
+        r = run(rows, args.repeat)
+        print(
+            f"{r['rows']:>9}  {r['separate_counts']['p50_ms']:>12.3f}  "
+            f"{r['union_all']['p50_ms']:>10.3f}  {r['cached']['p50_ms']:>10.3f}"
+        )
+
+    if tmpdir:
+        import shutil
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Rate-limit storage: per-check latency and cross-worker accuracy.
+
+Times FixedWindowRateLimiter.hit() against ``memory://`` and the shared
+``sqlite://`` storage, then forks --workers processes that each hit one
+limit --hits times and compares the count every worker ends up seeing
+with the number of hits actually made (memory:// only sees its own).
+
+Usage:
+  python tools/bench_ratelimit.py
+  python tools/bench_ratelimit.py --checks 20000 --workers 4 --hits 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import parse  # noqa: E402
+from limits.storage import storage_from_string  # noqa: E402
+from limits.strategies import FixedWindowRateLimiter  # noqa: E402
+
+import app.utils.ratelimit_storage  # noqa: E402,F401  registers sqlite://
+
+ITEM = parse("1000000/minute")
+
+
+def latency(uri: str, checks: int) -> dict:
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    samples = []
+    for i in range(checks):
+        t0 = time.perf_counter()
+        limiter.hit(ITEM, "bench", str(i % 100))
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+        "p99_us": round(samples[int(len(samples) * 0.99)] * 1e6, 1),
+    }
+
+
+def _hammer(uri: str, hits: int, seen) -> None:
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    for _ in range(hits):
+        limiter.hit(ITEM, "login", "10.0.0.1")
+    seen.put(ITEM.amount - limiter.get_window_stats(ITEM, "login", "10.0.0.1").remaining)
+
+
+def accuracy(uri: str, workers: int, hits: int) -> int:
+    """Highest count any worker reports for the shared limit once it is done."""
+    ctx = multiprocessing.get_context("fork")
+    seen = ctx.Queue()
+    procs = [ctx.Process(target=_hammer, args=(uri, hits, seen)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    counts = [seen.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return max(counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--hits", type=int, default=1000)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-ratelimit-")
+    uris = {
+        "memory": "memory://",
+        "sqlite": f"sqlite:///{os.path.join(tmpdir, 'latency.db')}",
+    }
+    expected = args.workers * args.hits
+
+    print(f"{'storage':<8} {'p50 us':>8} {'p99 us':>8} {'counted':>9} {'expected':>9}")
+    for name, uri in uris.items():
+        r = latency(uri, args.checks)
+        if name == "sqlite":
+            uri = f"sqlite:///{os.path.join(tmpdir, 'accuracy.db')}"  # not opened before the fork
+        counted = accuracy(uri, args.workers, args.hits)
+        print(f"{name:<8} {r['p50_us']:>8} {r['p99_us']:>8} {counted:>9} {expected:>9}")
+
+
+if __name__ == "__main__":
+    main()
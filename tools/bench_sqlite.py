@@ -0,0 +1,113 @@
+"""Mixed read/write throughput on SQLite: default settings vs production mode.
+
+Simulates gunicorn request threads against one SQLite file: each thread
+loops for --seconds, doing an activity-log write with probability
+--write-ratio and otherwise reading the 50 most recent log rows.
+
+Usage:
+  python tools/bench_sqlite.py
+  python tools/bench_sqlite.py --threads 8 --seconds 10 --write-ratio 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = {
+    "default": {"SQLITE_TUNED": "0", "SQLITE_WRITE_QUEUE": "0"},
+    "production": {"SQLITE_TUNED": "1", "SQLITE_WRITE_QUEUE": "1"},
+}
+
+
+def run(mode: str, threads: int, seconds: float, write_ratio: float) -> dict:
+    tmpdir = tempfile.mkdtemp(prefix=f"bench-sqlite-{mode}-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ.update(MODES[mode])
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import ActivityLog
+    from app.utils import log_activity
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    stats = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        local = {"reads": 0, "writes": 0, "errors": 0}
+        while time.perf_counter() < deadline:
+            with app.test_request_context("/bench"):
+                try:
+                    if rnd.random() < write_ratio:
+                        log_activity(action="page_view:/bench", category="page_view")
+                        local["writes"] += 1
+                    else:
+                        ActivityLog.query.order_by(ActivityLog.created_at.desc()).limit(50).all()
+                        local["reads"] += 1
+                except Exception:
+                    db.session.rollback()
+                    local["errors"] += 1
+                finally:
+                    db.session.remove()
+        with lock:
+            for k, v in local.items():
+                stats[k] += v
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    writer = app.extensions.get("sqlite_writer")
+    if writer is not None:
+        writer.flush()  # count queued writes as done only once they hit disk
+    elapsed = time.perf_counter() - t0
+
+    with app.app_context():
+        stored = ActivityLog.query.count()
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    if writer is not None:
+        writer.stop()
+
+    ops = stats["reads"] + stats["writes"]
+    return {
+        "mode": mode,
+        "ops_per_s": round(ops / elapsed, 1),
+        "reads": stats["reads"],
+        "writes": stats["writes"],
+        "stored": stored,
+        "errors": stats["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(f"{'mode':<11} {'ops/s':>9} {'reads':>8} {'writes':>8} {'stored':>8} {'errors':>7}")
+    for mode in MODES:
+        r = run(mode, args.threads, args.seconds, args.write_ratio)
+        print(f"{r['mode']:<11} {r['ops_per_s']:>9} {r['reads']:>8} {r['writes']:>8} {r['stored']:>8} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
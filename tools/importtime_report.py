@@ -0,0 +1,68 @@
+"""Import-time profile of app startup.
+
+Runs `python -X importtime` on `create_app()` in a fresh interpreter and
+prints the slowest imports as a table (cumulative and self time, ms).
+
+Usage:
+  python tools/importtime_report.py              # top 25 by cumulative time
+  python tools/importtime_report.py --top 50 --sort self
+  python tools/importtime_report.py --json > importtime.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNIPPET = "from app import create_app; create_app()"
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def profile(snippet: str = SNIPPET) -> list[dict]:
+    """Return one row per imported module: name, depth, self_ms, cumulative_ms."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = m.groups()
+        rows.append({
+            "module": name,
+            "depth": (len(indent) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cum_us) / 1000,
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative")
+    parser.add_argument("--json", action="store_true", help="emit all rows as JSON")
+    args = parser.parse_args()
+
+    rows = profile()
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        return
+
+    key = "cumulative_ms" if args.sort == "cumulative" else "self_ms"
+    top_level = sum(r["cumulative_ms"] for r in rows if r["depth"] == 0)
+    print(f"{'cumulative ms':>13}  {'self ms':>8}  module")
+    for r in sorted(rows, key=lambda r: r[key], reverse=True)[: args.top]:
+        print(f"{r['cumulative_ms']:>13.1f}  {r['self_ms']:>8.1f}  {r['module']}")
+    print(f"\n{len(rows)} modules, {top_level:.1f} ms total import time")
+
+
+if __name__ == "__main__":
+    main()
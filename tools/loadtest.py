@@ -0,0 +1,259 @@
+"""HTTP load test against a running server, with a JSON report per scenario.
+
+Concurrent virtual users (one keep-alive session each) replay a weighted
+mix of public pages, form POSTs (with real CSRF tokens) and, when admin
+credentials are given, activity-log pagination and search. The report has
+requests, throughput, p50/p95/p99 latency and error rate per scenario;
+pass an earlier report as --baseline to flag regressions (exit code 1).
+
+Start the server with rate limits off, or form POSTs will turn into 429s:
+
+  RATELIMIT_ENABLED=0 gunicorn -c gunicorn.conf.py wsgi:app
+
+Usage:
+  python tools/loadtest.py --base-url http://127.0.0.1:8000 --out before.json
+  python tools/loadtest.py --concurrency 16 --duration 60 \\
+      --admin-email admin@example.com --admin-password secret --baseline before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+STATIC_PAGES = ("/what-we-do", "/guide", "/faq", "/standards", "/resources", "/impact", "/veterans",
+                "/families", "/policies", "/programs", "/privacy", "/terms", "/stories", "/donate")
+SEARCH_TERMS = ("page_view", "login", "contact", "admin", "127.0.0.1", "deposit")
+CSRF_RE = re.compile(r'<input[^>]*name="csrf_token"[^>]*>')
+VALUE_RE = re.compile(r'value="([^"]+)"')
+
+# scenario -> relative weight in the mix
+PUBLIC_MIX = {"home": 30, "openings": 15, "static_pages": 25, "contact_post": 4, "apply_post": 3, "tour_post": 3}
+ADMIN_MIX = {"admin_activity_page": 8, "admin_activity_search": 4}
+
+
+def percentile(sorted_ms: list[float], q: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return round(sorted_ms[min(len(sorted_ms) - 1, max(0, int(round(q * len(sorted_ms))) - 1))], 2)
+
+
+class Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.rate_limited: dict[str, int] = {}
+
+    def record(self, scenario: str, ms: float, ok: bool, status: int | None) -> None:
+        with self._lock:
+            self.samples.setdefault(scenario, []).append(ms)
+            if not ok:
+                self.errors[scenario] = self.errors.get(scenario, 0) + 1
+            if status == 429:
+                self.rate_limited[scenario] = self.rate_limited.get(scenario, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        out = {}
+        for name, ms in sorted(self.samples.items()):
+            ms = sorted(ms)
+            errors = self.errors.get(name, 0)
+            out[name] = {
+                "requests": len(ms),
+                "rps": round(len(ms) / elapsed, 2),
+                "p50_ms": percentile(ms, 0.50),
+                "p95_ms": percentile(ms, 0.95),
+                "p99_ms": percentile(ms, 0.99),
+                "max_ms": round(ms[-1], 2),
+                "errors": errors,
+                "error_rate": round(errors / len(ms), 4),
+                "rate_limited": self.rate_limited.get(name, 0),
+            }
+        return out
+
+
+class VirtualUser:
+    def __init__(self, base_url: str, stats: Stats, rnd: random.Random, timeout: float) -> None:
+        self.base = base_url.rstrip("/")
+        self.stats = stats
+        self.rnd = rnd
+        self.timeout = timeout
+        self.http = requests.Session()
+
+    def request(self, scenario: str, method: str, path: str, ok_statuses=range(200, 400), **kwargs):
+        t0 = time.perf_counter()
+        try:
+            resp = self.http.request(method, self.base + path, timeout=self.timeout, allow_redirects=False, **kwargs)
+        except requests.RequestException:
+            self.stats.record(scenario, (time.perf_counter() - t0) * 1000, False, None)
+            return None
+        self.stats.record(scenario, (time.perf_counter() - t0) * 1000, resp.status_code in ok_statuses, resp.status_code)
+        return resp
+
+    def csrf_token(self, path: str) -> str | None:
+        resp = self.request("form_pages", "GET", path)
+        if resp is None:
+            return None
+        tag = CSRF_RE.search(resp.text)
+        match = VALUE_RE.search(tag.group(0)) if tag else None
+        return match.group(1) if match else None
+
+    def post_form(self, scenario: str, path: str, data: dict) -> None:
+        token = self.csrf_token(path)
+        n = self.rnd.randrange(1_000_000)
+        # A valid submission redirects; 400 means the form was rejected.
+        self.request(scenario, "POST", path, ok_statuses=(302, 303),
+                     data={**{k: v.format(n=n) for k, v in data.items()}, "csrf_token": token or ""})
+
+    def login(self, email: str, password: str) -> bool:
+        token = self.csrf_token("/auth/login")
+        resp = self.request("admin_login", "POST", "/auth/login", ok_statuses=(302, 303),
+                            data={"identifier": email, "password": password, "csrf_token": token or ""})
+        return resp is not None and resp.status_code in (302, 303) and "/auth/login" not in resp.headers.get("Location", "")
+
+    # ── scenarios ──
+    def home(self):
+        self.request("home", "GET", "/")
+
+    def openings(self):
+        self.request("openings", "GET", "/openings")
+
+    def static_pages(self):
+        self.request("static_pages", "GET", self.rnd.choice(STATIC_PAGES))
+
+    def contact_post(self):
+        self.post_form("contact_post", "/contact", {
+            "name": "Load Test", "email": "load{n}@example.com", "subject": "Load test {n}", "message": "Hello from the load test.",
+        })
+
+    def apply_post(self):
+        self.post_form("apply_post", "/apply", {
+            "full_name": "Load Test {n}", "email": "load{n}@example.com", "phone": "555-0100", "message": "Load test.",
+        })
+
+    def tour_post(self):
+        self.post_form("tour_post", "/tour", {
+            "name": "Load Test {n}", "email": "load{n}@example.com", "preferred_time": "Weekday mornings",
+        })
+
+    def admin_activity_page(self):
+        self.request("admin_activity_page", "GET", f"/admin/activity-log?page={self.rnd.randint(1, 20)}")
+
+    def admin_activity_search(self):
+        self.request("admin_activity_search", "GET", f"/admin/activity-log?q={self.rnd.choice(SEARCH_TERMS)}")
+
+
+def run(args) -> dict:
+    stats = Stats()
+    mix = dict(PUBLIC_MIX)
+    if args.admin_email:
+        mix.update(ADMIN_MIX)
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + args.warmup + args.duration
+    measure_from = time.perf_counter() + args.warmup
+    failures = []
+
+    def user(seed: int) -> None:
+        rnd = random.Random(seed)
+        vu = VirtualUser(args.base_url, stats if not args.warmup else Stats(), rnd, args.timeout)
+        if args.admin_email and not vu.login(args.admin_email, args.admin_password):
+            failures.append("admin login failed")
+            return
+        while time.perf_counter() < deadline:
+            if vu.stats is not stats and time.perf_counter() >= measure_from:
+                vu.stats = stats  # warm-up over: start counting
+            getattr(vu, rnd.choices(names, weights)[0])()
+
+    threads = [threading.Thread(target=user, args=(args.seed + i,), daemon=True) for i in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if failures:
+        raise SystemExit(f"{len(failures)} virtual user(s) could not log in as admin")
+
+    scenarios = stats.summary(args.duration)
+    total_requests = sum(s["requests"] for s in scenarios.values())
+    total_errors = sum(s["errors"] for s in scenarios.values())
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "meta": {
+            "base_url": args.base_url, "commit": commit or None, "concurrency": args.concurrency,
+            "duration_s": args.duration, "seed": args.seed, "admin": bool(args.admin_email),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "total": {
+            "requests": total_requests,
+            "rps": round(total_requests / args.duration, 2),
+            "errors": total_errors,
+            "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Scenarios whose p95 or error rate got worse than ``baseline`` beyond ``tolerance``."""
+    regressions = []
+    for name, now in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        if now["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {before['error_rate']:.2%} -> {now['error_rate']:.2%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds (after warm-up).")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--admin-email")
+    parser.add_argument("--admin-password")
+    parser.add_argument("--out", help="Write the JSON report here (default: stdout).")
+    parser.add_argument("--baseline", help="Earlier report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 slowdown vs baseline (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    print(f"{'scenario':<24} {'reqs':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err%':>7}", file=sys.stderr)
+    for name, s in report["scenarios"].items():
+        print(f"{name:<24} {s['requests']:>7} {s['rps']:>8} {s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8} "
+              f"{s['error_rate'] * 100:>6.1f}%", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
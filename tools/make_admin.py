@@ -9,6 +9,7 @@ import sys
 from wsgi import app
 from app.extensions import db
 from app.models import User
+from app.utils.user_cache import invalidate_user
 
 
 def main():
@@ -29,6 +30,7 @@ def main():
 
         user.is_admin = True
         db.session.commit()
+        invalidate_user(user.id)
         print(f"✅ {user.username} is now admin.")
 
 
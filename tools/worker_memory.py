@@ -0,0 +1,138 @@
+"""Memory per gunicorn worker with and without preload_app.
+
+Starts gunicorn from gunicorn.conf.py twice (GUNICORN_PRELOAD=0, then 1)
+against a throwaway SQLite database, sends a few requests so workers render
+real pages, then reads /proc/<pid>/smaps_rollup for every worker:
+
+  rss   resident set, counting shared pages in full
+  pss   proportional share (shared pages split between processes)
+  uss   private pages only: what each extra worker really costs
+
+Linux only.
+
+Usage:
+  python tools/worker_memory.py
+  python tools/worker_memory.py --workers 4 --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATHS = ("/", "/openings", "/contact", "/apply", "/tour", "/stories", "/faq", "/sitemap.xml")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _children(pid: int) -> list[int]:
+    kids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            kids.append(int(entry))
+    return kids
+
+
+def _smaps(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss_mb": fields.get("Rss", 0) / 1024,
+        "pss_mb": fields.get("Pss", 0) / 1024,
+        "uss_mb": (fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) / 1024,
+    }
+
+
+def prepare_db(path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("RATELIMIT_STORAGE_URI", "memory://")
+    from app import create_app
+    from app.extensions import db
+    from app.seed import seed_content
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed_content()
+        db.session.remove()
+        db.engine.dispose()
+
+
+def measure(preload: bool, workers: int, requests: int, db_path: str) -> dict:
+    port = _free_port()
+    env = dict(os.environ, GUNICORN_PRELOAD="1" if preload else "0", WEB_CONCURRENCY=str(workers),
+               GUNICORN_THREADS="2", PORT=str(port), DATABASE_URL=f"sqlite:///{db_path}",
+               RATELIMIT_STORAGE_URI="memory://")
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}", "wsgi:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health/live", timeout=2).read()
+                if len(_children(master.pid)) >= workers:
+                    break
+            except OSError:
+                pass
+            time.sleep(0.2)
+        else:
+            raise SystemExit("gunicorn did not come up")
+        for i in range(requests):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}{PATHS[i % len(PATHS)]}", timeout=10).read()
+            except OSError:
+                pass
+        time.sleep(0.5)
+        samples = [_smaps(pid) for pid in _children(master.pid)]
+        master_mem = _smaps(master.pid)
+    finally:
+        master.terminate()
+        master.wait(15)
+    avg = {k: round(sum(s[k] for s in samples) / len(samples), 1) for k in samples[0]}
+    return {"preload": preload, "workers": len(samples), "master_rss_mb": round(master_mem["rss_mb"], 1),
+            **avg, "total_pss_mb": round(sum(s["pss_mb"] for s in samples) + master_mem["pss_mb"], 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="worker-memory-"), "bench.db")
+    prepare_db(db_path)
+
+    print(f"{'preload':<8} {'workers':>7} {'rss MB':>8} {'pss MB':>8} {'uss MB':>8} {'total pss':>10}")
+    for preload in (False, True):
+        r = measure(preload, args.workers, args.requests, db_path)
+        print(f"{str(r['preload']):<8} {r['workers']:>7} {r['rss_mb']:>8} {r['pss_mb']:>8} {r['uss_mb']:>8} {r['total_pss_mb']:>10}")
+
+
+if __name__ == "__main__":
+    main()